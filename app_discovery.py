@@ -0,0 +1,242 @@
+"""
+Start Menu Shortcut Creator - Application Discovery
+This module scans application folders (e.g. Program Files) and proposes one
+Start Menu shortcut per product, skipping helpers, installers, updaters and
+uninstallers.
+
+Proposals use the same keys as ShortcutCreator.create_shortcuts specs, so
+they can be passed straight to batch creation.
+"""
+import os
+import re
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pe_file import PEFile, PEFormatError, read_exe_info, sanitize_file_name
+
+# File name patterns of executables that are never the main application
+SKIP_NAME_PATTERNS = re.compile(
+    r"^(unins\d*|uninst.*|uninstall.*|setup.*|install.*|.*installer.*|update.*|.*updater.*|"
+    r".*crash.*|.*helper.*|.*_service|elevation_service|maintenanceservice.*|"
+    r"vc_?redist.*|dotnet.*|dxsetup|.*report.*|.*diag.*|.*repair.*|.*migrat.*)\.exe$",
+    re.IGNORECASE
+)
+
+# Words in the version FileDescription that mark support tools
+SKIP_DESCRIPTION_WORDS = ("uninstall", "setup", "installer", "updater", "update service",
+                          "crash", "helper", "reporter", "redistributable")
+
+
+def is_support_executable(file_name, description=""):
+    """Check whether an executable looks like an installer, updater or helper."""
+    if SKIP_NAME_PATTERNS.match(file_name):
+        return True
+    description = description.lower()
+    return any(word in description for word in SKIP_DESCRIPTION_WORDS)
+
+
+def _normalize(text):
+    """Lower-case a name and drop everything but letters and digits."""
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def score_candidate(exe_path, product_folder, exe_info, verdict, has_icon, file_size):
+    """
+    Score how likely an executable is the main program of its product.
+
+    Returns:
+        (score, reasons) tuple
+    """
+    score = 0
+    reasons = []
+    stem = _normalize(os.path.splitext(os.path.basename(exe_path))[0])
+    folder_name = _normalize(os.path.basename(product_folder))
+    product_name = _normalize(exe_info.get("product_name", ""))
+
+    if verdict["subsystem"] == "gui":
+        score += 40
+        reasons.append("GUI application")
+    if has_icon:
+        score += 20
+        reasons.append("has an icon")
+    if exe_info.get("product_name"):
+        score += 10
+        reasons.append("has version information")
+    if stem and (stem in folder_name or folder_name in stem):
+        score += 15
+        reasons.append("name matches folder")
+    if stem and product_name and (stem in product_name or product_name in stem):
+        score += 15
+        reasons.append("name matches product")
+
+    # Main executables sit close to the product folder and are rarely tiny
+    relative_dir = os.path.relpath(os.path.dirname(exe_path), product_folder)
+    depth = 0 if relative_dir == "." else relative_dir.count(os.sep) + 1
+    score -= 5 * depth
+    if file_size > 1024 * 1024:
+        score += 5
+
+    return score, reasons
+
+
+def analyze_executable(exe_path, product_folder, metadata_cache=None):
+    """
+    Validate and inspect one executable.
+
+    The file is opened and its headers parsed once, for validation, version
+    information and the icon check.
+
+    Returns:
+        Candidate dictionary, or None if the file is invalid or a support tool
+    """
+    file_name = os.path.basename(exe_path)
+    if SKIP_NAME_PATTERNS.match(file_name):
+        return None
+
+    try:
+        pe = PEFile(exe_path)
+    except (OSError, ValueError, PEFormatError):
+        return None
+    with pe:
+        verdict = pe.validate()
+        if not verdict["valid"]:
+            return None
+
+        if metadata_cache is not None:
+            exe_info = metadata_cache.get_or_compute(exe_path, "exe_info", lambda path: read_exe_info(path, pe))
+        else:
+            exe_info = read_exe_info(exe_path, pe)
+        if is_support_executable(file_name, exe_info.get("description", "")):
+            return None
+
+        try:
+            has_icon = bool(pe.get_icon_groups())
+        except PEFormatError:
+            return None
+        file_size = pe.size
+
+    score, reasons = score_candidate(exe_path, product_folder, exe_info, verdict, has_icon, file_size)
+    # Cached exe info may predate sanitized suggested names
+    shortcut_name = sanitize_file_name(exe_info.get("suggested_name") or "") or os.path.splitext(file_name)[0]
+    return {
+        "exe_path": exe_path,
+        "shortcut_name": shortcut_name,
+        "product_name": exe_info.get("product_name", ""),
+        "company": exe_info.get("company", ""),
+        "version": exe_info.get("version", ""),
+        "score": score,
+        "reasons": reasons,
+    }
+
+
+def analyze_product_folder(product_folder, max_depth=3, max_per_product=1, metadata_cache=None):
+    """
+    Propose shortcuts for the products found in one folder.
+
+    Executables are grouped by version ProductName (or the folder name when
+    they have none) and the best-scoring executable of each group is kept.
+
+    Returns:
+        List of proposal dictionaries, best first
+    """
+    groups = {}
+    base_depth = product_folder.rstrip(os.sep).count(os.sep)
+    for root, dirs, files in os.walk(product_folder):
+        if root.rstrip(os.sep).count(os.sep) - base_depth >= max_depth:
+            dirs[:] = []
+        for file in files:
+            if not file.lower().endswith(".exe"):
+                continue
+            candidate = analyze_executable(os.path.join(root, file), product_folder, metadata_cache)
+            if candidate is None:
+                continue
+            key = _normalize(candidate["product_name"]) or _normalize(os.path.basename(product_folder))
+            groups.setdefault(key, []).append(candidate)
+
+    proposals = []
+    for candidates in groups.values():
+        candidates.sort(key=lambda candidate: candidate["score"], reverse=True)
+        proposals.extend(candidates[:max_per_product])
+    proposals.sort(key=lambda proposal: proposal["score"], reverse=True)
+    return proposals
+
+
+def _product_folders(root):
+    """List the folders of a root that are treated as separate products."""
+    folders = []
+    loose_exes = False
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(entry.path)
+                elif entry.name.lower().endswith(".exe"):
+                    loose_exes = True
+    except OSError:
+        pass
+    return folders, loose_exes
+
+
+def discover_applications(roots, max_workers=8, max_depth=3, min_score=0, metadata_cache=None):
+    """
+    Walk application roots in parallel and stream shortcut proposals.
+
+    Each first-level folder of a root (e.g. each folder in Program Files)
+    is analyzed as one product folder on a worker thread. Proposals are
+    yielded per folder as soon as it is done, best first within a folder.
+
+    Args:
+        roots: Iterable of directories to scan
+        max_workers: Number of worker threads
+        max_depth: How many folder levels below a product folder to search
+        min_score: Proposals scoring below this are dropped
+        metadata_cache: Optional MetadataCache for version information
+
+    Yields:
+        Proposal dictionaries with exe_path, shortcut_name, product_name,
+        company, version, score and reasons
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for root in roots:
+            folders, loose_exes = _product_folders(root)
+            for folder in folders:
+                futures.append(executor.submit(analyze_product_folder, folder, max_depth, 1, metadata_cache))
+            if loose_exes:
+                # Executables lying directly in the root; subfolders are covered above
+                futures.append(executor.submit(analyze_product_folder, root, 0, 1, metadata_cache))
+
+        for future in as_completed(futures):
+            for proposal in future.result():
+                if proposal["score"] >= min_score:
+                    yield proposal
+
+
+def main():
+    """Command line entry point: list (and optionally create) proposed shortcuts."""
+    parser = argparse.ArgumentParser(description="Propose Start Menu shortcuts for installed applications")
+    parser.add_argument("roots", nargs="+", help="Folders to scan, e.g. \"C:\\Program Files\"")
+    parser.add_argument("--min-score", type=int, default=30, help="Drop proposals below this score")
+    parser.add_argument("--folder", help="Start Menu subfolder for created shortcuts")
+    parser.add_argument("--create", action="store_true", help="Create the proposed shortcuts")
+    args = parser.parse_args()
+
+    proposals = []
+    for proposal in discover_applications(args.roots, min_score=args.min_score):
+        proposals.append(proposal)
+        print(f"[{proposal['score']:>3}] {proposal['shortcut_name']} -> {proposal['exe_path']}")
+    print(f"\n{len(proposals)} application(s) found")
+
+    if args.create and proposals:
+        if sys.platform == "win32":
+            from shortcut_creator import ShortcutCreator
+        else:
+            from shortcut_creator_demo import ShortcutCreator
+        for proposal in proposals:
+            proposal["folder"] = args.folder
+        success_count, failed_count, results = ShortcutCreator().create_shortcuts(proposals)
+        print(f"Created {success_count} shortcut(s), {failed_count} failed")
+
+
+if __name__ == "__main__":
+    main()
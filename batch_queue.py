@@ -0,0 +1,300 @@
+"""
+Start Menu Shortcut Creator - Batch Shortcut Queue
+This module holds the executables of a multi-file or folder drop in a Qt list
+model. Dropped folders are scanned, and every executable is validated and
+its metadata and icon extracted on a worker pool, so the GUI stays
+responsive while 40 installers (or a whole folder) are being inspected. The
+list view bound to the model shows each item's progress.
+
+Creating the queue is one ShortcutCreator.create_shortcuts batch, also run
+off the GUI thread.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+from app_discovery import is_support_executable
+from pe_file import sanitize_file_name
+
+# Item states
+QUEUED = "queued"
+READY = "ready"
+INVALID = "invalid"
+CREATING = "creating"
+CREATED = "created"
+FAILED = "failed"
+
+STATUS_TEXT = {
+    QUEUED: "Checking…",
+    READY: "Ready",
+    INVALID: "Not a valid executable",
+    CREATING: "Creating…",
+    CREATED: "Created",
+    FAILED: "Failed",
+}
+
+ERROR_COLOR = QColor("#D83B01")
+SUCCESS_COLOR = QColor("#107C10")
+
+
+def find_executables(folder, max_depth=3):
+    """
+    List the executables in a dropped folder, skipping installers, updaters
+    and other support tools.
+
+    Args:
+        folder: Folder to walk
+        max_depth: How many folder levels below folder to search
+
+    Returns:
+        Sorted list of executable paths
+    """
+    executables = []
+    base_depth = folder.rstrip(os.sep).count(os.sep)
+    for root, dirs, files in os.walk(folder):
+        if root.rstrip(os.sep).count(os.sep) - base_depth >= max_depth:
+            dirs[:] = []
+        for file in files:
+            if file.lower().endswith(".exe") and not is_support_executable(file):
+                executables.append(os.path.join(root, file))
+    return sorted(executables)
+
+
+class BatchQueueModel(QAbstractListModel):
+    """Queue of executables waiting to become shortcuts."""
+    # checked, total, ready
+    progressChanged = pyqtSignal(int, int, int)
+    # success_count, failed_count
+    batchFinished = pyqtSignal(int, int)
+
+    # Internal: worker results delivered on the GUI thread
+    _folderScanned = pyqtSignal(int, object)
+    _itemInspected = pyqtSignal(int, str, object)
+    _batchCreated = pyqtSignal(int, object, object)
+
+    def __init__(self, shortcut_creator, icon_extractor=None, pixmap_cache=None, icon_size=32,
+                 max_workers=4, parent=None):
+        """
+        Initialize an empty queue.
+
+        Args:
+            shortcut_creator: ShortcutCreator validating executables and creating shortcuts
+            icon_extractor: IconExtractor for the item icons (no icons if None)
+            pixmap_cache: PixmapCache decoding the icon files
+            icon_size: Icon size shown in the list
+            max_workers: Number of worker threads
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.shortcut_creator = shortcut_creator
+        self.icon_extractor = icon_extractor
+        self.pixmap_cache = pixmap_cache
+        self.icon_size = icon_size
+        self.device_pixel_ratio = 1.0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = set()
+        self._items = []
+        self._rows = {}
+        # Results of jobs started before clear() carry an older generation
+        self._generation = 0
+        self._folderScanned.connect(self._on_folder_scanned)
+        self._itemInspected.connect(self._on_item_inspected)
+        self._batchCreated.connect(self._on_batch_created)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{item['name']}  —  {item['message'] or STATUS_TEXT[item['state']]}"
+        if role == Qt.DecorationRole and item["icon_path"] and self.pixmap_cache is not None:
+            pixmap = self.pixmap_cache.load(item["icon_path"], self.icon_size, self.device_pixel_ratio)
+            return None if pixmap.isNull() else pixmap
+        if role == Qt.ForegroundRole:
+            if item["state"] in (INVALID, FAILED):
+                return ERROR_COLOR
+            if item["state"] == CREATED:
+                return SUCCESS_COLOR
+        if role == Qt.ToolTipRole:
+            return item["path"]
+        return None
+
+    def items(self):
+        """Return the queued items (dicts with path, name, state, exe_info, icon_path, message)."""
+        return list(self._items)
+
+    def add_paths(self, paths):
+        """
+        Queue dropped files and folders.
+
+        Files are queued at once; folders are scanned on the worker pool.
+        Paths already in the queue are ignored.
+        """
+        for path in paths:
+            if os.path.isdir(path):
+                self._submit(self._scan_folder, self._generation, path)
+            else:
+                self._add_files([path])
+
+    def _add_files(self, paths):
+        """Append new items and start inspecting them."""
+        new_paths = []
+        for path in paths:
+            key = os.path.normcase(os.path.abspath(path))
+            if key not in self._rows:
+                self._rows[key] = len(self._items) + len(new_paths)
+                new_paths.append(path)
+        if not new_paths:
+            return
+        first = len(self._items)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+        for path in new_paths:
+            self._items.append({
+                "path": path,
+                "name": os.path.splitext(os.path.basename(path))[0],
+                "state": QUEUED,
+                "exe_info": {},
+                "icon_path": None,
+                "message": "",
+            })
+        self.endInsertRows()
+        for path in new_paths:
+            self._submit(self._inspect, self._generation, path)
+        self._emit_progress()
+
+    def _submit(self, function, *args):
+        """Run a job on the worker pool, remembering it until it is done."""
+        future = self._executor.submit(function, *args)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+    def _scan_folder(self, generation, folder):
+        """Worker: list the executables of a dropped folder."""
+        try:
+            executables = find_executables(folder)
+        except OSError as e:
+            print(f"Error scanning {folder}: {e}")
+            executables = []
+        self._emit(self._folderScanned, generation, executables)
+
+    def _on_folder_scanned(self, generation, executables):
+        if generation == self._generation:
+            self._add_files(executables)
+
+    def _inspect(self, generation, path):
+        """Worker: validate an executable and read its metadata and icon."""
+        result = {"valid": False, "exe_info": {}, "icon_path": None}
+        try:
+            result["valid"] = self.shortcut_creator.is_valid_exe(path)
+            if result["valid"]:
+                result["exe_info"] = self.shortcut_creator.get_exe_info(path)
+                if self.icon_extractor is not None:
+                    icons = self.icon_extractor.get_all_icons(path, (self.icon_size,))
+                    result["icon_path"] = icons.get(self.icon_size)
+        except Exception as e:
+            print(f"Error inspecting {path}: {e}")
+        self._emit(self._itemInspected, generation, path, result)
+
+    def _on_item_inspected(self, generation, path, result):
+        if generation != self._generation:
+            return
+        row = self._rows.get(os.path.normcase(os.path.abspath(path)))
+        if row is None:
+            return
+        item = self._items[row]
+        item["state"] = READY if result["valid"] else INVALID
+        item["exe_info"] = result["exe_info"]
+        item["icon_path"] = result["icon_path"]
+        # The name becomes a file name; product names may hold characters Windows forbids there
+        suggested_name = sanitize_file_name(result["exe_info"].get("suggested_name") or "")
+        if suggested_name:
+            item["name"] = suggested_name
+        self.dataChanged.emit(self.index(row), self.index(row))
+        self._emit_progress()
+
+    def _emit(self, signal, *args):
+        """Emit a worker result unless the model was deleted meanwhile."""
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass
+
+    def _emit_progress(self):
+        checked = sum(1 for item in self._items if item["state"] != QUEUED)
+        ready = sum(1 for item in self._items if item["state"] == READY)
+        self.progressChanged.emit(checked, len(self._items), ready)
+
+    def is_busy(self):
+        """Check whether items are still being inspected or created."""
+        return any(item["state"] in (QUEUED, CREATING) for item in self._items)
+
+    def create_all(self, for_all_users=False, folder=None, max_workers=4):
+        """
+        Create shortcuts for every ready item in one batch on the worker pool.
+
+        batchFinished is emitted when the batch is done.
+
+        Returns:
+            Number of shortcuts in the batch
+        """
+        rows = [row for row, item in enumerate(self._items) if item["state"] == READY]
+        specs = []
+        used_names = set()
+        for row in rows:
+            item = self._items[row]
+            item["state"] = CREATING
+            # Products sharing a name (e.g. 32 and 64-bit builds) must not overwrite each other
+            name = item["name"]
+            number = 2
+            while name.lower() in used_names:
+                name = f"{item['name']} ({number})"
+                number += 1
+            used_names.add(name.lower())
+            item["name"] = name
+            specs.append({
+                "exe_path": item["path"],
+                "shortcut_name": name,
+                "for_all_users": for_all_users,
+                "folder": folder,
+            })
+            self.dataChanged.emit(self.index(row), self.index(row))
+        if specs:
+            self._submit(self._create, self._generation, rows, specs, max_workers)
+        return len(specs)
+
+    def _create(self, generation, rows, specs, max_workers):
+        """Worker: run the batch through ShortcutCreator.create_shortcuts."""
+        try:
+            _, _, results = self.shortcut_creator.create_shortcuts(specs, max_workers=max_workers)
+        except Exception as e:
+            results = [{"success": False, "message": str(e)} for _ in specs]
+        self._emit(self._batchCreated, generation, rows, results)
+
+    def _on_batch_created(self, generation, rows, results):
+        if generation != self._generation:
+            return
+        for row, result in zip(rows, results):
+            item = self._items[row]
+            item["state"] = CREATED if result["success"] else FAILED
+            item["message"] = "" if result["success"] else result["message"]
+            self.dataChanged.emit(self.index(row), self.index(row))
+        success_count = sum(1 for result in results if result["success"])
+        self.batchFinished.emit(success_count, len(results) - success_count)
+
+    def clear(self):
+        """Empty the queue; jobs still running are ignored when they finish."""
+        self._generation += 1
+        self.beginResetModel()
+        self._items = []
+        self._rows = {}
+        self.endResetModel()
+        self._emit_progress()
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker pool without waiting."""
+        for future in list(self._futures):
+            future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,254 @@
+"""
+Start Menu Shortcut Creator - Size-Optimized ICO Writer
+This module writes .ico files entry by entry instead of relying on Pillow's
+ICO encoder, picking the smallest lossless encoding for every size:
+
+- Large entries (256 px, and optionally 128 px) are stored as optimized
+  32-bit RGBA PNG. PNG entries stay RGBA because palettized ones are not
+  read correctly by every consumer (Pillow drops their tRNS chunk).
+- Every other entry is a classic BMP entry, because older shells and icon
+  consumers do not read PNG entries at small sizes: a palettized BMP (1, 4
+  or 8 bpp with an AND mask) when that is lossless, i.e. alpha is fully on
+  or off and there are at most 256 colors, otherwise a 32-bit BGRA BMP.
+
+write_ico reports each entry's size next to what Pillow's default ICO
+encoder (one unoptimized PNG per entry) would have produced. NumPy, when
+available, speeds up the BMP encoders.
+"""
+import io
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ICONDIR header and ICONDIRENTRY records
+ICON_DIR = struct.Struct("<HHH")
+ICON_DIR_ENTRY = struct.Struct("<BBBBHHII")
+
+# BITMAPINFOHEADER of a BMP icon entry
+BITMAP_INFO_HEADER = struct.Struct("<IiiHHIIiiII")
+
+# Entry sizes stored as PNG by default
+DEFAULT_PNG_SIZES = (256,)
+
+
+def _png_bytes(img, **options):
+    """Encode an image as PNG."""
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", **options)
+    return buffer.getvalue()
+
+
+def encode_png(img):
+    """Encode an RGBA image as an optimized 32-bit PNG."""
+    return _png_bytes(img, optimize=True)
+
+
+def _row_stride(width, bit_count):
+    """Bytes per bitmap row, padded to a multiple of 4."""
+    return ((width * bit_count + 31) // 32) * 4
+
+
+def _pack_rows(rows, width, bit_count):
+    """Pack rows of small integers into bottom-up, 4-byte aligned bitmap rows."""
+    stride = _row_stride(width, bit_count)
+    per_byte = 8 // bit_count
+    packed = bytearray()
+    for row in reversed(rows):
+        line = bytearray(stride)
+        for x, value in enumerate(row):
+            line[x // per_byte] |= value << (8 - bit_count * (x % per_byte + 1))
+        packed += line
+    return bytes(packed)
+
+
+def _pack_rows_np(values, bit_count):
+    """Pack a 2-D array of small integers into bottom-up, 4-byte aligned bitmap rows."""
+    height, width = values.shape
+    if bit_count == 8:
+        packed = values
+    elif bit_count == 4:
+        if width % 2:
+            values = np.pad(values, ((0, 0), (0, 1)))
+        packed = (values[:, 0::2] << 4) | values[:, 1::2]
+    else:
+        packed = np.packbits(values, axis=1)
+    rows = np.zeros((height, _row_stride(width, bit_count)), dtype=np.uint8)
+    rows[:, :packed.shape[1]] = packed
+    return rows[::-1].tobytes()
+
+
+def _bmp_entry(width, height, bit_count, palette_data, palette_count, xor_data, and_data):
+    """Assemble a BMP icon entry from its parts."""
+    header = BITMAP_INFO_HEADER.pack(BITMAP_INFO_HEADER.size, width, height * 2, 1, bit_count, 0,
+                                     len(xor_data) + len(and_data), 0, 0, palette_count, 0)
+    return header + palette_data + xor_data + and_data
+
+
+def encode_palette_bmp(img):
+    """
+    Encode an RGBA image as a palettized BMP icon entry if that is lossless.
+
+    Lossless requires every pixel to be fully opaque or fully transparent
+    (transparency goes into the AND mask) and at most 256 opaque colors
+    (plus black, which transparent pixels must carry).
+
+    Returns:
+        BMP entry bytes (header, palette, pixels, AND mask), or None
+    """
+    if np is None:
+        return _encode_palette_bmp_python(img)
+    width, height = img.size
+    pixels = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(height, width, 4)
+    alpha = pixels[..., 3]
+    if not ((alpha == 0) | (alpha == 255)).all():
+        return None
+    opaque = alpha == 255
+    rgb = pixels[..., :3].astype(np.uint32)
+    colors = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+    # Sorted like the palette of the pure-Python encoder
+    palette = np.unique(colors[opaque])
+    if not opaque.all():
+        # Transparent pixels are drawn as black XOR screen, i.e. unchanged
+        palette = np.union1d(palette, np.zeros(1, dtype=np.uint32))
+    if len(palette) > 256:
+        return None
+
+    bit_count = 1 if len(palette) <= 2 else 4 if len(palette) <= 16 else 8
+    indices = np.searchsorted(palette, np.where(opaque, colors, 0)).astype(np.uint8)
+    xor_data = _pack_rows_np(indices, bit_count)
+    and_data = _pack_rows_np((~opaque).astype(np.uint8), 1)
+    palette_data = np.zeros((len(palette), 4), dtype=np.uint8)
+    palette_data[:, 0] = palette & 0xFF
+    palette_data[:, 1] = (palette >> 8) & 0xFF
+    palette_data[:, 2] = palette >> 16
+    return _bmp_entry(width, height, bit_count, palette_data.tobytes(), len(palette), xor_data, and_data)
+
+
+def _encode_palette_bmp_python(img):
+    """encode_palette_bmp without NumPy."""
+    width, height = img.size
+    data = img.tobytes()
+    pixels = [tuple(data[i:i + 4]) for i in range(0, len(data), 4)]
+    if any(pixel[3] not in (0, 255) for pixel in pixels):
+        return None
+    opaque = {pixel[:3] for pixel in pixels if pixel[3] == 255}
+    if len(opaque) < len(pixels):
+        # Transparent pixels are drawn as black XOR screen, i.e. unchanged
+        opaque.add((0, 0, 0))
+    if len(opaque) > 256:
+        return None
+
+    palette = sorted(opaque)
+    bit_count = 1 if len(palette) <= 2 else 4 if len(palette) <= 16 else 8
+    index = {color: i for i, color in enumerate(palette)}
+    black = index.get((0, 0, 0), 0)
+    color_rows = []
+    mask_rows = []
+    for y in range(height):
+        row = pixels[y * width:(y + 1) * width]
+        color_rows.append([index[pixel[:3]] if pixel[3] else black for pixel in row])
+        mask_rows.append([0 if pixel[3] else 1 for pixel in row])
+
+    xor_data = _pack_rows(color_rows, width, bit_count)
+    and_data = _pack_rows(mask_rows, width, 1)
+    palette_data = b"".join(struct.pack("<BBBB", b, g, r, 0) for r, g, b in palette)
+    return _bmp_entry(width, height, bit_count, palette_data, len(palette), xor_data, and_data)
+
+
+def encode_bmp32(img):
+    """
+    Encode an RGBA image as a 32-bit BGRA BMP icon entry.
+
+    Fully transparent pixels are also set in the AND mask, for consumers
+    that ignore the alpha channel.
+    """
+    width, height = img.size
+    data = img.tobytes()
+    if np is not None:
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+        xor_data = np.ascontiguousarray(pixels[::-1, :, [2, 1, 0, 3]]).tobytes()
+        and_data = _pack_rows_np((pixels[..., 3] == 0).astype(np.uint8), 1)
+    else:
+        rows = [data[y * width * 4:(y + 1) * width * 4] for y in range(height)]
+        xor_data = b"".join(bytes(row[i + c] for i in range(0, len(row), 4) for c in (2, 1, 0, 3))
+                            for row in reversed(rows))
+        and_data = _pack_rows([[1 if row[i + 3] == 0 else 0 for i in range(0, len(row), 4)] for row in rows],
+                              width, 1)
+    return _bmp_entry(width, height, 32, b"", 0, xor_data, and_data)
+
+
+def encode_entry(img, png_sizes=DEFAULT_PNG_SIZES):
+    """
+    Pick the encoding of one icon image.
+
+    Sizes in png_sizes are stored as PNG. Every other size is a BMP entry:
+    palettized when that is lossless, 32-bit otherwise.
+
+    Args:
+        img: Square image
+        png_sizes: Sizes stored as PNG
+
+    Returns:
+        (format name, entry bytes, bit count, palette size)
+    """
+    img = img.convert("RGBA")
+    if img.width in png_sizes:
+        return ("png", encode_png(img), 32, 0)
+    palette_bmp = encode_palette_bmp(img)
+    if palette_bmp is not None:
+        bit_count = struct.unpack_from("<H", palette_bmp, 14)[0]
+        colors = struct.unpack_from("<I", palette_bmp, 32)[0]
+        return (f"bmp{bit_count}", palette_bmp, bit_count, colors)
+    return ("bmp32", encode_bmp32(img), 32, 0)
+
+
+def write_ico(images, path=None, png_sizes=DEFAULT_PNG_SIZES):
+    """
+    Build an ICO file from square images of different sizes.
+
+    Args:
+        images: Iterable of PIL images, one per size
+        path: Optional file to write the ICO to
+        png_sizes: Sizes stored as PNG (e.g. (128, 256)); the others are BMP
+
+    Returns:
+        (ico_bytes, report) where report has one dictionary per entry with
+        size, format, bytes, baseline_bytes and saved
+    """
+    images = sorted(images, key=lambda img: img.width)
+    entries = []
+    report = []
+    for img in images:
+        format_name, data, bit_count, colors = encode_entry(img, png_sizes)
+        baseline = len(_png_bytes(img.convert("RGBA")))
+        entries.append((img.width, img.height, data, bit_count, colors))
+        report.append({"size": img.width, "format": format_name, "bytes": len(data),
+                       "baseline_bytes": baseline, "saved": baseline - len(data)})
+
+    offset = ICON_DIR.size + ICON_DIR_ENTRY.size * len(entries)
+    directory = ICON_DIR.pack(0, 1, len(entries))
+    for width, height, data, bit_count, colors in entries:
+        directory += ICON_DIR_ENTRY.pack(width % 256, height % 256, colors if colors < 256 else 0, 0,
+                                         1, bit_count, len(data), offset)
+        offset += len(data)
+    ico_data = directory + b"".join(entry[2] for entry in entries)
+
+    if path is not None:
+        with open(path, "wb") as f:
+            f.write(ico_data)
+    return ico_data, report
+
+
+def format_report(report):
+    """Format a write_ico report as text lines."""
+    lines = [f"{'size':>6} {'format':<7} {'bytes':>8} {'default':>8} {'saved':>8}"]
+    for entry in report:
+        lines.append(f"{entry['size']:>6} {entry['format']:<7} {entry['bytes']:>8} "
+                     f"{entry['baseline_bytes']:>8} {entry['saved']:>8}")
+    total = sum(entry["bytes"] for entry in report)
+    baseline = sum(entry["baseline_bytes"] for entry in report)
+    lines.append(f"{'total':>6} {'':<7} {total:>8} {baseline:>8} {baseline - total:>8}")
+    return lines
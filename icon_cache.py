@@ -0,0 +1,311 @@
+"""
+Start Menu Shortcut Creator - Icon Cache
+This module stores extracted icons under content-addressed keys derived from
+the executable's full path, icon size, file size and mtime (and optionally a
+content hash), with LRU eviction to a byte budget.
+
+An index file records every entry in least-recently-used order, so entries
+are found and evicted without ever listing the cache directory. It also
+records aliases: keys that share another key's icon file (e.g. executables
+with identical icon resources), so each distinct icon is stored once.
+
+Lookups and inserts are written to the index in batches, on eviction and on
+flush; if the index is lost, it is rebuilt from the icon files on disk.
+"""
+import os
+import re
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from metadata_cache import hash_file
+
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+# Default byte budget of the icon cache
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Number of lookups or inserts after which the index is written
+FLUSH_EVERY = 64
+
+# File names of cached icons: the key and the image format
+ICON_FILE_PATTERN = re.compile(r"^([0-9a-f]{40})\.(png|ico|bmp|svg)$")
+
+
+def make_icon_key(exe_path, size, use_content_hash=False):
+    """
+    Build the cache key of an executable's icon at one size.
+
+    Args:
+        exe_path: Path to the executable
+        size: Icon size in pixels
+        use_content_hash: If True, include a hash of the file contents
+
+    Returns:
+        Hex key string, or None if the executable cannot be stat'ed
+    """
+    try:
+        stat = os.stat(exe_path)
+    except OSError:
+        return None
+    parts = [os.path.normcase(os.path.abspath(exe_path)), str(size), str(stat.st_size), str(stat.st_mtime_ns)]
+    if use_content_hash:
+        parts.append(hash_file(exe_path))
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class IconCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, use_content_hash=False):
+        """
+        Open (or create) an icon cache directory.
+
+        Args:
+            directory: Cache directory (default: icon_cache in the temp directory)
+            max_bytes: Byte budget; least recently used icons are evicted beyond it
+            use_content_hash: If True, keys also include a hash of the executable
+        """
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "icon_cache")
+        self.max_bytes = max_bytes
+        self.use_content_hash = use_content_hash
+        self.index_path = os.path.join(self.directory, INDEX_NAME)
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._aliases = {}
+        self._lock = threading.Lock()
+        self._unsaved_changes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Load the LRU index, rebuilding it if it is missing or unreadable."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                raise ValueError("Unsupported index version")
+        except (OSError, ValueError):
+            self._rebuild_index()
+            return
+
+        for key, file_name, size in index.get("entries", []):
+            self._entries[key] = (file_name, size)
+            self.total_bytes += size
+        self._aliases = dict(index.get("aliases", {}))
+
+    def _rebuild_index(self):
+        """
+        Index the icon files found in the cache directory, oldest first.
+
+        Only runs when the index is missing or unreadable. Aliases cannot be
+        recovered and are linked again as icons are extracted; files that are
+        not named after a key (e.g. the old <basename>_<size>.png scheme) are
+        left alone.
+        """
+        found = []
+        try:
+            for file_name in os.listdir(self.directory):
+                match = ICON_FILE_PATTERN.match(file_name)
+                if match is None:
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.directory, file_name))
+                except OSError:
+                    continue
+                found.append((stat.st_mtime_ns, match.group(1), file_name, stat.st_size))
+        except OSError:
+            pass
+
+        for _, key, file_name, size in sorted(found):
+            self._entries[key] = (file_name, size)
+            self.total_bytes += size
+        with self._lock:
+            self._evict()
+            self._save_index()
+
+    def _save_index(self):
+        """Write the index atomically. Must be called with the lock held."""
+        # Aliases of evicted icons are dropped here
+        self._aliases = {alias: target for alias, target in self._aliases.items() if target in self._entries}
+        index = {
+            "version": INDEX_VERSION,
+            "entries": [[key, file_name, size] for key, (file_name, size) in self._entries.items()],
+            "aliases": self._aliases,
+        }
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(temp_path, self.index_path)
+        self._unsaved_changes = 0
+
+    def _index_changed(self, count=1):
+        """Note index changes, writing the index every FLUSH_EVERY of them. Lock must be held."""
+        self._unsaved_changes += count
+        if self._unsaved_changes >= FLUSH_EVERY:
+            self._save_index()
+
+    def make_key(self, exe_path, size):
+        """Build the cache key of an executable's icon at one size."""
+        return make_icon_key(exe_path, size, self.use_content_hash)
+
+    def _resolve(self, key):
+        """Follow an alias to the key that owns the icon. Lock must be held."""
+        if key in self._entries:
+            return key
+        return self._aliases.get(key, key)
+
+    def get_path(self, key):
+        """
+        Look up a cached icon file and mark it as recently used.
+
+        Returns:
+            Path to the icon file, or None on a miss
+        """
+        if key is None:
+            return None
+        with self._lock:
+            key = self._resolve(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            path = os.path.join(self.directory, entry[0])
+            if not os.path.exists(path):
+                # Removed behind our back; forget it
+                del self._entries[key]
+                self.total_bytes -= entry[1]
+                self._save_index()
+                return None
+            self._entries.move_to_end(key)
+            self._index_changed()
+            return path
+
+    def get_bytes(self, key):
+        """Return the cached icon data, or None on a miss."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def keys(self):
+        """Return every cached key, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def contains(self, key):
+        """Check whether a key is cached without touching its LRU position."""
+        with self._lock:
+            return self._resolve(key) in self._entries
+
+    def link(self, key, target_key):
+        """Make key an alias of an icon already cached under target_key."""
+        self.link_many({key: target_key})
+
+    def link_many(self, links):
+        """
+        Make several keys aliases of cached icons with a single index update.
+
+        Args:
+            links: Dictionary of alias key -> key of a cached icon; links to
+                keys that are not cached are ignored
+        """
+        with self._lock:
+            for key, target_key in links.items():
+                target_key = self._resolve(target_key)
+                if key != target_key and target_key in self._entries:
+                    self._aliases[key] = target_key
+            self._save_index()
+
+    def put(self, key, data, extension="png"):
+        """
+        Store icon data and evict least recently used icons over budget.
+
+        Args:
+            key: Cache key (see make_key)
+            data: Encoded image bytes
+            extension: File extension of the stored file
+
+        Returns:
+            Path to the stored icon file
+        """
+        return self.put_many({key: data}, extension)[key]
+
+    def put_many(self, items, extension="png"):
+        """
+        Store several icons.
+
+        The index is written when icons are evicted, every FLUSH_EVERY
+        changes and on flush, not on every insert.
+
+        Args:
+            items: Dictionary of cache key -> encoded image bytes
+            extension: File extension of the stored files
+
+        Returns:
+            Dictionary of cache key -> path of the stored icon file
+        """
+        paths = {}
+        for key, data in items.items():
+            file_name = f"{key}.{extension}"
+            path = os.path.join(self.directory, file_name)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            paths[key] = path
+
+        with self._lock:
+            for key, data in items.items():
+                self._aliases.pop(key, None)
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.total_bytes -= previous[1]
+                self._entries[key] = (os.path.basename(paths[key]), len(data))
+                self.total_bytes += len(data)
+            if self._evict():
+                self._save_index()
+            else:
+                self._index_changed(len(items))
+        return paths
+
+    def _evict(self):
+        """
+        Remove least recently used icons until within budget. Lock must be held.
+
+        Returns:
+            True if any icon was removed
+        """
+        evicted = False
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, (file_name, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            evicted = True
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+        return evicted
+
+    def flush(self):
+        """Persist pending index changes (LRU order and inserts)."""
+        with self._lock:
+            if self._unsaved_changes:
+                self._save_index()
+
+    def clear(self):
+        """Remove every cached icon."""
+        with self._lock:
+            for file_name, _ in self._entries.values():
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._aliases.clear()
+            self.total_bytes = 0
+            self._save_index()
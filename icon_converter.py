@@ -1,71 +1,356 @@
 """
 SVG to ICO Converter for Start Menu Shortcut Creator
 This utility helps convert SVG icons to ICO format for Windows applications
+
+Rendering happens in memory: the SVG is read once and every size is
+rasterized in parallel, without temporary files. A whole folder of SVGs can
+be converted over a process pool.
+
+Builds are incremental: a manifest maps each output ICO to the hash of its
+source SVG, the conversion parameters and the hash of the ICO produced, and
+outputs whose recorded inputs are unchanged are not converted again.
+
+ICO files are written by ico_writer, which stores 256 px (and optionally
+128 px) entries as optimized PNG and the other sizes as classic BMP entries,
+palettized when that is lossless, and reports each entry's size against
+Pillow's encoder.
 """
 import os
+import io
 import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from PIL import Image
-import cairosvg
+from metadata_cache import hash_file
+from ico_writer import DEFAULT_PNG_SIZES, write_ico, format_report
+
+try:
+    import cairosvg
+except ImportError:
+    cairosvg = None
+
+ICO_SIZES = (16, 32, 48, 64, 128, 256)
+
+# Bump when a change to this module changes the ICO files it produces
+CONVERTER_VERSION = 4
+
+MANIFEST_NAME = "icon_manifest.json"
+
+# Qt needs an application object (for fonts) to render SVGs with text
+_qt_application = None
+
+def _ensure_qt_application():
+    """Create a QGuiApplication for the Qt renderer if none exists (main thread only)."""
+    global _qt_application
+    if cairosvg is None:
+        from PyQt5.QtGui import QGuiApplication
+        if QGuiApplication.instance() is None:
+            # Rendering needs no display; without one (CI, build boxes, worker
+            # processes) the default platform plugin aborts the process
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            _qt_application = QGuiApplication(sys.argv[:1])
+
+def rasterize_svg(svg_data, size):
+    """
+    Render SVG data to a size x size RGBA image in memory.
+
+    Uses cairosvg when it is installed and Qt's SVG renderer otherwise.
+
+    Args:
+        svg_data: SVG file contents (bytes)
+        size: Output width and height in pixels
+
+    Returns:
+        PIL Image in RGBA mode
+    """
+    if cairosvg is not None:
+        png_data = cairosvg.svg2png(bytestring=svg_data, output_width=size, output_height=size)
+        return Image.open(io.BytesIO(png_data)).convert('RGBA')
+
+    from PyQt5.QtCore import Qt, QByteArray, QBuffer, QIODevice
+    from PyQt5.QtGui import QImage, QPainter
+    from PyQt5.QtSvg import QSvgRenderer
+    renderer = QSvgRenderer(QByteArray(svg_data))
+    if not renderer.isValid():
+        raise ValueError("Invalid SVG data")
+    image = QImage(size, size, QImage.Format_ARGB32)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    renderer.render(painter)
+    painter.end()
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return Image.open(io.BytesIO(bytes(buffer.data()))).convert('RGBA')
+
+def render_svg_sizes(svg_data, sizes=ICO_SIZES, max_workers=None):
+    """
+    Render SVG data at several sizes in parallel.
+
+    Args:
+        svg_data: SVG file contents (bytes)
+        sizes: Icon sizes to render
+        max_workers: Number of threads (default: one per size)
+
+    Returns:
+        List of PIL Images in the order of sizes
+    """
+    sizes = list(sizes)
+    _ensure_qt_application()
+    if max_workers == 1 or len(sizes) == 1:
+        return [rasterize_svg(svg_data, size) for size in sizes]
+    with ThreadPoolExecutor(max_workers=max_workers or len(sizes)) as executor:
+        return list(executor.map(lambda size: rasterize_svg(svg_data, size), sizes))
 
-def convert_svg_to_ico(svg_path, ico_path, sizes=(16, 32, 48, 64, 128, 256)):
+def convert_svg_to_ico(svg_path, ico_path, sizes=ICO_SIZES, max_workers=None, png_sizes=DEFAULT_PNG_SIZES):
     """
     Convert an SVG file to an ICO file with multiple sizes
-    
+
     Args:
         svg_path: Path to SVG file
         ico_path: Path for output ICO file
         sizes: Tuple of icon sizes to include
+        max_workers: Number of threads rendering sizes (default: one per size)
+        png_sizes: Sizes stored as PNG (see ico_writer)
+
+    Returns:
+        Per-entry size report (see ico_writer.write_ico)
     """
-    # Create temporary PNG files at different sizes
-    temp_pngs = []
-    
-    for size in sizes:
-        png_path = f"temp_icon_{size}.png"
-        cairosvg.svg2png(url=svg_path, write_to=png_path, output_width=size, output_height=size)
-        temp_pngs.append((png_path, size))
-    
-    # Open all temporary PNGs
-    imgs = []
-    for png_path, size in temp_pngs:
-        img = Image.open(png_path)
-        imgs.append(img)
-    
-    # Save ICO file with all sizes
-    imgs[0].save(ico_path, format='ICO', sizes=[(img.width, img.height) for img in imgs], 
-                 append_images=imgs[1:])
-    
-    # Clean up temporary files
-    for png_path, _ in temp_pngs:
-        os.remove(png_path)
-    
+    with open(svg_path, "rb") as f:
+        svg_data = f.read()
+    imgs = render_svg_sizes(svg_data, sizes, max_workers)
+
+    # Save ICO file with all sizes; replace the old file only when complete
+    ico_data, entries = write_ico(imgs, png_sizes=png_sizes)
+    temp_path = f"{ico_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(ico_data)
+    os.replace(temp_path, ico_path)
+
     print(f"Successfully converted {svg_path} to {ico_path}")
+    return entries
+
+def _convert_for_batch(svg_path, ico_path, sizes, png_sizes, max_workers=1):
+    """Worker process: convert one SVG, rendering its sizes sequentially."""
+    try:
+        entries = convert_svg_to_ico(svg_path, ico_path, sizes, max_workers=max_workers, png_sizes=png_sizes)
+        return svg_path, ico_path, None, entries
+    except Exception as e:
+        return svg_path, ico_path, str(e), None
+
+def conversion_params(sizes, png_sizes=DEFAULT_PNG_SIZES):
+    """Describe everything besides the source that determines an ICO's contents."""
+    return {
+        "sizes": sorted(sizes),
+        "png_sizes": sorted(png_sizes),
+        "renderer": "cairosvg" if cairosvg is not None else "qt",
+        "converter_version": CONVERTER_VERSION,
+    }
+
+class BuildManifest:
+    def __init__(self, path):
+        """
+        Load (or start) a build manifest.
+
+        Args:
+            path: Manifest JSON file
+        """
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("outputs", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _key(self, ico_path):
+        """Store outputs relative to the manifest so the tree can move."""
+        return os.path.relpath(os.path.abspath(ico_path), os.path.dirname(os.path.abspath(self.path)))
+
+    def _hash(self, path, recorded):
+        """
+        Hash a file, trusting the recorded hash while size and mtime are unchanged.
+
+        Returns:
+            (hash, [size, mtime_ns]) or (None, None) if the file is missing
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, None
+        file_stat = [stat.st_size, stat.st_mtime_ns]
+        if recorded and recorded.get("stat") == file_stat:
+            return recorded["hash"], file_stat
+        return hash_file(path), file_stat
+
+    def is_current(self, svg_path, ico_path, params):
+        """Check whether an output was built from this source with these parameters."""
+        entry = self.entries.get(self._key(ico_path))
+        if entry is None or entry["params"] != params:
+            return False
+        source_hash, _ = self._hash(svg_path, entry["source"])
+        output_hash, _ = self._hash(ico_path, entry["output"])
+        return source_hash == entry["source"]["hash"] and output_hash == entry["output"]["hash"]
+
+    def record(self, svg_path, ico_path, params):
+        """Remember the source and output of a finished conversion."""
+        source_hash, source_stat = self._hash(svg_path, None)
+        output_hash, output_stat = self._hash(ico_path, None)
+        self.entries[self._key(ico_path)] = {
+            "source_path": os.path.relpath(os.path.abspath(svg_path), os.path.dirname(os.path.abspath(self.path))),
+            "source": {"hash": source_hash, "stat": source_stat},
+            "output": {"hash": output_hash, "stat": output_stat},
+            "params": params,
+        }
+
+    def save(self):
+        """Write the manifest atomically."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "outputs": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+def build_icons(jobs, sizes=ICO_SIZES, manifest_path=None, max_workers=None, force=False,
+                png_sizes=DEFAULT_PNG_SIZES):
+    """
+    Convert SVGs to ICOs, rebuilding only outputs whose source or parameters changed.
+
+    Args:
+        jobs: List of (svg_path, ico_path)
+        sizes: Icon sizes to include
+        manifest_path: Build manifest (default: icon_manifest.json next to the first output)
+        max_workers: Number of worker processes (default: CPU count)
+        force: If True, rebuild everything
+        png_sizes: Sizes stored as PNG (see ico_writer)
+
+    Returns:
+        Report dictionary with rebuilt and up_to_date lists of (svg_path, ico_path),
+        failed list of (svg_path, ico_path, error), entries mapping each rebuilt
+        ico_path to its per-entry size report, and seconds
+    """
+    started = time.perf_counter()
+    report = {"rebuilt": [], "up_to_date": [], "failed": [], "entries": {}, "seconds": 0.0}
+    if not jobs:
+        return report
+    if manifest_path is None:
+        manifest_path = os.path.join(os.path.dirname(os.path.abspath(jobs[0][1])), MANIFEST_NAME)
+    manifest = BuildManifest(manifest_path)
+    params = conversion_params(sizes, png_sizes)
+
+    stale = []
+    for svg_path, ico_path in jobs:
+        if not force and manifest.is_current(svg_path, ico_path, params):
+            report["up_to_date"].append((svg_path, ico_path))
+        else:
+            stale.append((svg_path, ico_path))
+
+    if len(stale) == 1:
+        results = [_convert_for_batch(stale[0][0], stale[0][1], tuple(sizes), tuple(png_sizes), None)]
+    elif stale:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_convert_for_batch, svg_path, ico_path, tuple(sizes), tuple(png_sizes)):
+                       (svg_path, ico_path) for svg_path, ico_path in stale}
+            results = []
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # A worker process died (e.g. BrokenProcessPool); report the file, keep the others
+                    svg_path, ico_path = futures[future]
+                    results.append((svg_path, ico_path, f"Worker failed: {e!r}", None))
+    else:
+        results = []
+
+    for svg_path, ico_path, error, entries in sorted(results, key=lambda result: result[:2]):
+        if error:
+            report["failed"].append((svg_path, ico_path, error))
+        else:
+            manifest.record(svg_path, ico_path, params)
+            report["rebuilt"].append((svg_path, ico_path))
+            report["entries"][ico_path] = entries
+    if results:
+        manifest.save()
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+def convert_folder(svg_folder, output_folder=None, sizes=ICO_SIZES, max_workers=None, force=False,
+                   manifest_path=None, png_sizes=DEFAULT_PNG_SIZES):
+    """
+    Convert every changed SVG in a folder to ICO over a process pool.
+
+    Args:
+        svg_folder: Folder containing SVG files
+        output_folder: Folder for the ICO files and the build manifest
+            (default: next to the SVGs)
+        sizes: Icon sizes to include
+        max_workers: Number of worker processes (default: CPU count)
+        force: If True, rebuild every ICO
+        manifest_path: Build manifest (default: icon_manifest.json in the output folder)
+        png_sizes: Sizes stored as PNG (see ico_writer)
+
+    Returns:
+        Report dictionary (see build_icons)
+    """
+    output_folder = output_folder or svg_folder
+    os.makedirs(output_folder, exist_ok=True)
+    jobs = []
+    for name in sorted(os.listdir(svg_folder)):
+        if name.lower().endswith('.svg'):
+            ico_name = os.path.splitext(name)[0] + '.ico'
+            jobs.append((os.path.join(svg_folder, name), os.path.join(output_folder, ico_name)))
+    return build_icons(jobs, sizes, manifest_path or os.path.join(output_folder, MANIFEST_NAME),
+                       max_workers, force, png_sizes)
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Convert SVG icons to ICO files")
+    parser.add_argument("svg", nargs="?", default="assets/app_icon.svg", help="SVG file or folder of SVG files")
+    parser.add_argument("ico", nargs="?", help="Output ICO file (or folder, for a folder of SVGs)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(ICO_SIZES), help="Icon sizes")
+    parser.add_argument("--workers", type=int, help="Worker processes for a folder")
+    parser.add_argument("--manifest", help=f"Build manifest (default: {MANIFEST_NAME} next to the output)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if nothing changed")
+    parser.add_argument("--png-128", action="store_true", help="Also store 128 px entries as PNG")
+    parser.add_argument("--report", action="store_true", help="Print the size of every ICO entry")
+    args = parser.parse_args()
+    png_sizes = (128, 256) if args.png_128 else DEFAULT_PNG_SIZES
+
     print("SVG to ICO Converter for Start Menu Shortcut Creator")
     print("====================================================")
-    
-    svg_path = "assets/app_icon.svg"
-    ico_path = "assets/app_icon.ico"
-    
-    if not os.path.exists(svg_path):
-        print(f"Error: SVG file not found at {svg_path}")
-        return
-    
-    print(f"Converting {svg_path} to {ico_path}...")
-    
-    try:
-        # On Windows, this would work:
-        # convert_svg_to_ico(svg_path, ico_path)
-        # But in Replit environment, we'd need cairosvg and Pillow
-        
-        print("NOTE: This conversion requires libraries that may not be available in Replit.")
-        print("When running on Windows, install the necessary libraries:")
-        print("pip install cairosvg pillow")
-        print("\nThen run this script to generate the ICO file.")
-        
-    except Exception as e:
-        print(f"Error during conversion: {e}")
+
+    if cairosvg is None:
+        print("NOTE: cairosvg is not installed; using Qt's SVG renderer.")
+        print("For the reference rendering, install: pip install cairosvg pillow\n")
+
+    if os.path.isdir(args.svg):
+        report = convert_folder(args.svg, args.ico, args.sizes, args.workers, args.force, args.manifest,
+                                png_sizes)
+    elif os.path.exists(args.svg):
+        jobs = [(args.svg, args.ico or os.path.splitext(args.svg)[0] + ".ico")]
+        report = build_icons(jobs, args.sizes, args.manifest, args.workers, args.force, png_sizes)
+    else:
+        print(f"Error: SVG file not found at {args.svg}")
+        sys.exit(1)
+
+    saved = 0
+    for ico_path, entries in report["entries"].items():
+        saved += sum(entry["saved"] for entry in entries)
+        if args.report:
+            print(f"\n{ico_path}:")
+            for line in format_report(entries):
+                print(f"  {line}")
+    for svg_path, ico_path in report["up_to_date"]:
+        print(f"Up to date: {ico_path}")
+    for svg_path, ico_path, error in report["failed"]:
+        print(f"Error converting {svg_path}: {error}")
+    print(f"\nRebuilt {len(report['rebuilt'])}, up to date {len(report['up_to_date'])}, "
+          f"failed {len(report['failed'])} in {report['seconds'] * 1000:.0f} ms")
+    if report["rebuilt"]:
+        # Negative when BMP entries for small sizes outweigh the PNG savings
+        print(f"{abs(saved)} bytes {'smaller' if saved >= 0 else 'larger'} than Pillow's ICO encoder")
+    if report["failed"]:
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
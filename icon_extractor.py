@@ -4,9 +4,19 @@ This module provides functionality to extract icons from Windows executables
 """
 import os
 import sys
+import io
+import struct
+import hashlib
 import tempfile
 from pathlib import Path
 from PIL import Image, ImageQt
+from icon_cache import IconCache, DEFAULT_MAX_BYTES
+from icon_pack import IconPack
+from pe_file import PEFile, PEFormatError
+from dib_decoder import DIBFormatError, decode_dib, np
+
+# Icon cache storage backends: one PNG file per icon, or a single pack file
+CACHE_BACKENDS = {"files": IconCache, "pack": IconPack}
 
 # Demo mode constants for testing without Windows dependencies
 DEMO_ICONS = {
@@ -18,14 +28,220 @@ DEMO_ICONS = {
     "default": "assets/app_icon.svg"
 }
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Largest icon size stored in Windows icon resources
+MAX_ICON_SIZE = 256
+
+def png_dimensions(data):
+    """Return (width, height) of PNG bytes from the IHDR chunk, or None if not a PNG."""
+    if len(data) < 24 or data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", data[16:24])
+
+def select_icon_entry(entries, size):
+    """
+    Pick the icon group entry that best serves a requested size.
+    
+    Prefers an exact size, then the smallest larger image (scaled down),
+    then the largest smaller image (scaled up); ties go to the higher
+    color depth.
+    
+    Args:
+        entries: Entries returned by PEFile.read_icon_group
+        size: Requested size in pixels
+        
+    Returns:
+        The chosen entry, or None if there are no entries
+    """
+    if not entries:
+        return None
+    exact = [entry for entry in entries if entry["width"] == size]
+    if exact:
+        return max(exact, key=lambda entry: entry["bit_count"])
+    larger = [entry for entry in entries if entry["width"] > size]
+    if larger:
+        return min(larger, key=lambda entry: (entry["width"], -entry["bit_count"]))
+    return max(entries, key=lambda entry: (entry["width"], entry["bit_count"]))
+
+def decode_icon_image(data, entry):
+    """
+    Decode one RT_ICON image (PNG or BMP/DIB with AND mask) to an RGBA image.
+    
+    Args:
+        data: Raw RT_ICON bytes
+        entry: The matching icon group entry
+        
+    Returns:
+        PIL Image in RGBA mode
+    """
+    if data[:8] == PNG_SIGNATURE:
+        return Image.open(io.BytesIO(data)).convert('RGBA')
+    
+    if np is not None:
+        try:
+            return Image.fromarray(decode_dib(data), 'RGBA')
+        except DIBFormatError:
+            pass
+    
+    # Wrap the DIB in a one-image .ico file and let PIL decode palette,
+    # row order and transparency mask
+    width = entry["width"] if entry["width"] < 256 else 0
+    height = entry["height"] if entry["height"] < 256 else 0
+    ico = struct.pack("<HHH", 0, 1, 1) + struct.pack(
+        "<BBBBHHII", width, height, entry["color_count"], 0,
+        entry["planes"], entry["bit_count"], len(data), 22
+    ) + data
+    return Image.open(io.BytesIO(ico)).convert('RGBA')
+
+def read_icon_resources(exe_path, sizes, group_index=0):
+    """
+    Read the raw icon images that serve several sizes, without decoding them.
+    
+    The file is mapped and its icon group parsed once; an image serving
+    several sizes is read once.
+    
+    Args:
+        exe_path: Path to the executable
+        sizes: Iterable of desired icon sizes
+        group_index: Which icon group to use (0 is the exe's main icon)
+        
+    Returns:
+        Dictionary of size -> (group entry, raw RT_ICON bytes)
+    """
+    with PEFile(exe_path) as pe:
+        entries = pe.read_icon_group(group_index)
+        raw_images = {}
+        result = {}
+        for size in sizes:
+            entry = select_icon_entry(entries, size)
+            if entry is None:
+                continue
+            if entry["icon_id"] not in raw_images:
+                raw_images[entry["icon_id"]] = pe.read_icon_image(entry["icon_id"])
+            if raw_images[entry["icon_id"]] is not None:
+                result[size] = (entry, raw_images[entry["icon_id"]])
+    return result
+
+def icon_content_key(data, size):
+    """
+    Build the cache key of an icon image rendered at one size.
+    
+    The key depends only on the raw resource bytes, so executables that
+    share an icon (e.g. every binary of a product suite) share the entry.
+    """
+    digest = hashlib.sha1(b"icon-png|%d|" % size)
+    digest.update(data)
+    return digest.hexdigest()
+
+def is_native_png(data, size):
+    """Check whether raw icon bytes are a PNG of exactly size x size (stored as is)."""
+    return png_dimensions(data) == (size, size)
+
+def encode_icon_png(img, size):
+    """Scale a decoded icon to size x size if needed and encode it as PNG."""
+    if img.size != (size, size):
+        img = img.resize((size, size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def extract_icons_png(exe_path, sizes, group_index=0):
+    """
+    Extract several icon sizes from an executable's resources in one pass.
+    
+    Embedded PNG entries of exactly the requested size are returned
+    unchanged; other images are decoded at most once and scaled to every
+    size they serve.
+    
+    Args:
+        exe_path: Path to the executable
+        sizes: Iterable of desired icon sizes
+        group_index: Which icon group to use (0 is the exe's main icon)
+        
+    Returns:
+        Dictionary of size -> PNG bytes (empty if the exe has no icons)
+    """
+    rendered = render_icons(read_icon_resources(exe_path, sizes, group_index))
+    return {size: png_data for size, (_, png_data) in rendered.items()}
+
+def render_icons(resources, is_known=None):
+    """
+    Turn raw icon resources into PNG bytes keyed by content.
+    
+    Embedded PNG entries of exactly the requested size are used unchanged;
+    other images are decoded at most once and scaled to every size they
+    serve.
+    
+    Args:
+        resources: Dictionary returned by read_icon_resources
+        is_known: Optional callable taking a content key; images it accepts
+            (e.g. already cached) are not decoded
+        
+    Returns:
+        Dictionary of size -> (content key, PNG bytes or None if known)
+    """
+    decoded = {}
+    result = {}
+    for size, (entry, data) in resources.items():
+        content_key = icon_content_key(data, size)
+        if is_known is not None and is_known(content_key):
+            result[size] = (content_key, None)
+        elif is_native_png(data, size):
+            # Modern 256x256 (and other) PNG entries are stored byte for byte
+            result[size] = (content_key, data)
+        else:
+            if entry["icon_id"] not in decoded:
+                decoded[entry["icon_id"]] = decode_icon_image(data, entry)
+            result[size] = (content_key, encode_icon_png(decoded[entry["icon_id"]], size))
+    return result
+
+def extract_icon_png(exe_path, size, group_index=0):
+    """
+    Extract an icon from an executable's resources without any Windows API.
+    
+    Args:
+        exe_path: Path to the executable
+        size: Desired icon size
+        group_index: Which icon group to use (0 is the exe's main icon)
+        
+    Returns:
+        PNG bytes of a size x size icon, or None if the exe has no icons
+    """
+    return extract_icons_png(exe_path, (size,), group_index).get(size)
+
 class IconExtractor:
-    def __init__(self):
-        """Initialize the IconExtractor with necessary settings."""
+    def __init__(self, metadata_cache=None, cache_max_bytes=DEFAULT_MAX_BYTES, use_content_hash=False,
+                 cache_backend="files", svg_cache=None):
+        """
+        Initialize the IconExtractor with necessary settings.
+        
+        Args:
+            metadata_cache: Optional MetadataCache remembering which cached
+                icon belongs to which executable
+            cache_max_bytes: Byte budget of the on-disk icon cache
+            use_content_hash: If True, cache keys include a hash of the exe
+                contents, not only its path, size and mtime
+            cache_backend: "files" stores one PNG per icon, "pack" stores all
+                icons in one memory-mapped pack file
+            svg_cache: Optional SvgRasterCache used when a Qt icon is built
+                from an SVG (demo and default icons)
+        """
+        if cache_backend not in CACHE_BACKENDS:
+            raise ValueError(f"Unknown icon cache backend: {cache_backend}")
+
+        self.metadata_cache = metadata_cache
+        self.svg_cache = svg_cache
         self.temp_directory = tempfile.gettempdir()
         self.cache_directory = os.path.join(self.temp_directory, "icon_cache")
         
         # Create cache directory if it doesn't exist
         os.makedirs(self.cache_directory, exist_ok=True)
+        self.icon_cache = CACHE_BACKENDS[cache_backend](self.cache_directory, cache_max_bytes, use_content_hash)
+        # Icons rendered from resources, and icon lookups served by an image
+        # another executable already provided
+        self.rendered_icons = 0
+        self.shared_icons = 0
         
         # In demo mode, ensure demo icons directory exists
         if not self._is_windows():
@@ -50,14 +266,72 @@ class IconExtractor:
         if not exe_path or not os.path.exists(exe_path):
             return self._get_default_icon(size)
             
-        # Generate a unique cache filename based on exe_path and size
-        cache_name = f"{os.path.basename(exe_path)}_{size}.png"
-        cache_path = os.path.join(self.cache_directory, cache_name)
+        if self.metadata_cache is not None:
+            cached_icon = self.metadata_cache.get_icon(exe_path, size)
+            if cached_icon:
+                return cached_icon
+            
+        # Cache key from the full path, size and mtime of the exe and the icon size
+        cache_key = self.icon_cache.make_key(exe_path, size)
+        cache_path = self.icon_cache.get_path(cache_key)
         
         # If we already have this icon in cache, return it
-        if os.path.exists(cache_path):
+        if cache_path:
+            if self.metadata_cache is not None:
+                self.metadata_cache.set_icon(exe_path, size, cache_path)
             return cache_path
             
+        # Read the icon straight from the PE resources (works on any OS)
+        cache_path = self._extract_from_resources(exe_path, {size: cache_key}).get(size)
+        if cache_path:
+            if self.metadata_cache is not None:
+                self.metadata_cache.set_icon(exe_path, size, cache_path)
+            return cache_path
+        return self._extract_with_system(exe_path, size, cache_key)
+    
+    def _extract_from_resources(self, exe_path, cache_keys):
+        """
+        Extract icons from the PE resources into the cache, deduplicated by content.
+        
+        The raw icon images are hashed before decoding. An image already in
+        the cache (e.g. from another executable of the same product) is not
+        decoded or stored again; the executable's key is only linked to it.
+        
+        Args:
+            exe_path: Path to the executable
+            cache_keys: Dictionary of size -> the executable's cache key
+            
+        Returns:
+            Dictionary of size -> icon path for the sizes the resources provide
+        """
+        try:
+            resources = read_icon_resources(exe_path, cache_keys)
+            rendered = render_icons(resources, self.icon_cache.contains)
+        except (OSError, ValueError, PEFormatError):
+            return {}
+        
+        new_icons = {}
+        links = {}
+        for size, (content_key, png_data) in rendered.items():
+            links[cache_keys[size]] = content_key
+            if png_data is None:
+                self.shared_icons += 1
+            else:
+                new_icons[content_key] = png_data
+                self.rendered_icons += 1
+        if new_icons:
+            self.icon_cache.put_many(new_icons)
+        if links:
+            self.icon_cache.link_many(links)
+        paths = {}
+        for size in resources:
+            cache_path = self.icon_cache.get_path(cache_keys[size])
+            if cache_path:
+                paths[size] = cache_path
+        return paths
+    
+    def _extract_with_system(self, exe_path, size, cache_key):
+        """Extract an icon with the Windows API, or pick a demo icon elsewhere."""
         if self._is_windows():
             try:
                 # On Windows, use win32 API to extract icon
@@ -102,7 +376,12 @@ class IconExtractor:
                 hdc.DeleteDC()
                 
                 # Save the image to the cache directory
-                img.save(cache_path)
+                buffer = io.BytesIO()
+                img.save(buffer, format='PNG')
+                self.icon_cache.put(cache_key, buffer.getvalue())
+                cache_path = self.icon_cache.get_path(cache_key)
+                if self.metadata_cache is not None:
+                    self.metadata_cache.set_icon(exe_path, size, cache_path)
                 return cache_path
                 
             except Exception as e:
@@ -162,6 +441,8 @@ class IconExtractor:
         from PyQt5.QtGui import QIcon, QPixmap
         
         icon_path = self.extract_icon(exe_path, size)
+        if icon_path.lower().endswith('.svg') and self.svg_cache is not None:
+            return self.svg_cache.icon(icon_path, (size,))
         return QIcon(QPixmap(icon_path))
 
     def get_all_icons(self, exe_path, sizes=(16, 32, 48)):
@@ -175,10 +456,52 @@ class IconExtractor:
         Returns:
             Dictionary of size -> icon path
         """
+        return self.extract_icons(exe_path, sizes)
+    
+    def extract_icons(self, exe_path, sizes=(16, 32, 48)):
+        """
+        Extract several icon sizes with a single pass over the executable.
+        
+        Sizes already in the cache are served from it; the rest are decoded
+        from one parse of the icon group and written to the cache together.
+        Sizes the resources cannot provide fall back to the Windows API (or
+        a demo icon).
+        
+        Args:
+            exe_path: Path to the executable
+            sizes: Iterable of desired sizes
+            
+        Returns:
+            Dictionary of size -> icon path
+        """
+        sizes = list(sizes)
+        for size in sizes:
+            if not 0 < size <= MAX_ICON_SIZE:
+                raise ValueError(f"Icon sizes must be between 1 and {MAX_ICON_SIZE}: {size}")
+        if not exe_path or not os.path.exists(exe_path):
+            return {size: self._get_default_icon(size) for size in sizes}
+        
         result = {}
+        missing = {}
         for size in sizes:
-            result[size] = self.extract_icon(exe_path, size)
-        return result
+            cache_key = self.icon_cache.make_key(exe_path, size)
+            cache_path = self.icon_cache.get_path(cache_key)
+            if cache_path:
+                result[size] = cache_path
+            else:
+                missing[size] = cache_key
+        
+        if missing:
+            extracted = self._extract_from_resources(exe_path, missing)
+            for size, cache_key in missing.items():
+                if size in extracted:
+                    result[size] = extracted[size]
+                else:
+                    result[size] = self._extract_with_system(exe_path, size, cache_key)
+            if extracted and self.metadata_cache is not None:
+                self.metadata_cache.set_icons(exe_path, extracted)
+        
+        return {size: result[size] for size in sizes}
 
 def create_demo_icons():
     """Create demo icons if they don't exist."""
@@ -186,33 +509,182 @@ def create_demo_icons():
     demo_dir = os.path.join("assets", "demo_icons")
     os.makedirs(demo_dir, exist_ok=True)
 
-def main():
-    """Main function for standalone testing."""
-    print("Start Menu Shortcut Creator - Icon Extractor")
-    print("===========================================")
+def _extract_for_batch(exe_path, sizes):
+    """
+    Worker process: render an executable's icons without touching any cache.
     
-    # Create demo icons
-    create_demo_icons()
+    Any error is returned rather than raised: an exception escaping a worker
+    would abort executor.map, and with it the whole batch.
     
-    extractor = IconExtractor()
+    Returns:
+        (exe_path, {size: (content key, PNG bytes)}, error message or None)
+    """
+    try:
+        rendered = render_icons(read_icon_resources(exe_path, sizes))
+    except Exception as e:
+        return exe_path, None, str(e) or type(e).__name__
+    return exe_path, rendered, None
+
+def batch_output_name(exe_path, size):
+    """File name of an icon written by the batch extractor into an output folder."""
+    stem = os.path.splitext(os.path.basename(exe_path))[0]
+    path_hash = hashlib.sha1(os.path.normcase(os.path.abspath(exe_path)).encode("utf-8")).hexdigest()[:8]
+    return f"{stem}-{path_hash}_{size}.png"
+
+def extract_batch(exe_paths, sizes=(16, 32, 48, 256), icon_cache=None, output_dir=None,
+                  max_workers=None, skip_existing=True, progress=None):
+    """
+    Extract icons from many executables with a process pool.
     
-    # Test with some common paths
-    test_paths = [
-        "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
-        "C:\\Program Files\\Microsoft Office\\Office16\\WINWORD.EXE",
-        "C:\\Program Files\\VideoLAN\\VLC\\vlc.exe",
-        "C:\\Windows\\System32\\notepad.exe"
-    ]
+    Workers only parse and render; this process does all writing, so the
+    cache index has a single writer. Cache writes are batched and share
+    icons between executables by content.
     
-    for path in test_paths:
-        print(f"\nExtracting icon from {path}")
-        icon_path = extractor.extract_icon(path)
-        print(f"Icon extracted to: {icon_path}")
+    Args:
+        exe_paths: Iterable of executable paths
+        sizes: Icon sizes to extract
+        icon_cache: IconCache or IconPack to fill (used when output_dir is None)
+        output_dir: Folder to write <name>-<hash>_<size>.png files into instead
+        max_workers: Number of worker processes (default: CPU count)
+        skip_existing: If True, skip executables whose icons are all present
+        progress: Optional callback called with the running stats after each executable
         
-    print("\nExtracting multiple sizes from Chrome")
-    sizes = extractor.get_all_icons(test_paths[0])
-    for size, path in sizes.items():
-        print(f"Size {size}px: {path}")
+    Returns:
+        Stats dictionary with total, processed, skipped, extracted, no_icon,
+        icons_written, failed (list of (path, error)) and seconds
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import time
+    
+    sizes = tuple(sizes)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    stats = {"total": 0, "processed": 0, "skipped": 0, "extracted": 0, "no_icon": 0,
+             "icons_written": 0, "failed": [], "seconds": 0.0}
+    started = time.perf_counter()
+    
+    # Decide up front what needs work; stat calls are cheap next to parsing
+    todo = []
+    cache_keys = {}
+    for exe_path in exe_paths:
+        stats["total"] += 1
+        if output_dir is not None:
+            present = all(os.path.exists(os.path.join(output_dir, batch_output_name(exe_path, size)))
+                          for size in sizes)
+        else:
+            cache_keys[exe_path] = {size: icon_cache.make_key(exe_path, size) for size in sizes}
+            present = all(icon_cache.contains(key) for key in cache_keys[exe_path].values())
+        if skip_existing and present:
+            stats["skipped"] += 1
+            stats["processed"] += 1
+        else:
+            todo.append(exe_path)
+    
+    pending_icons = {}
+    pending_links = {}
+    
+    def flush_cache():
+        new_icons = {key: data for key, data in pending_icons.items() if not icon_cache.contains(key)}
+        if new_icons:
+            icon_cache.put_many(new_icons)
+            stats["icons_written"] += len(new_icons)
+        if pending_links:
+            icon_cache.link_many(pending_links)
+        pending_icons.clear()
+        pending_links.clear()
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for exe_path, rendered, error in executor.map(_extract_for_batch, todo,
+                                                       [sizes] * len(todo), chunksize=8):
+            stats["processed"] += 1
+            if error is not None:
+                stats["failed"].append((exe_path, error))
+            elif not rendered:
+                stats["no_icon"] += 1
+            else:
+                stats["extracted"] += 1
+                for size, (content_key, png_data) in rendered.items():
+                    if output_dir is not None:
+                        with open(os.path.join(output_dir, batch_output_name(exe_path, size)), "wb") as f:
+                            f.write(png_data)
+                        stats["icons_written"] += 1
+                    else:
+                        pending_icons[content_key] = png_data
+                        pending_links[cache_keys[exe_path][size]] = content_key
+                if len(pending_icons) + len(pending_links) >= 512:
+                    flush_cache()
+            stats["seconds"] = time.perf_counter() - started
+            if progress:
+                progress(stats)
+    
+    if pending_icons or pending_links:
+        flush_cache()
+    if icon_cache is not None:
+        icon_cache.flush()
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+def main():
+    """Command line entry point: extract icons from many executables (e.g. to pre-warm a cache)."""
+    import argparse
+    import time
+    from pe_file import iter_executables
+    
+    parser = argparse.ArgumentParser(description="Extract icons from executables in bulk")
+    parser.add_argument("inputs", nargs="*", help="Executables or directories to scan")
+    parser.add_argument("--file-list", help="File with one executable path per line (- for stdin)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 48, 256], help="Icon sizes")
+    parser.add_argument("--output", help="Write PNG files to this folder instead of the icon cache")
+    parser.add_argument("--cache-backend", choices=sorted(CACHE_BACKENDS), default="files",
+                        help="Icon cache storage to fill")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-recursive", action="store_true", help="Do not descend into subdirectories")
+    parser.add_argument("--force", action="store_true", help="Re-extract icons that are already present")
+    args = parser.parse_args()
+    
+    for size in args.sizes:
+        if not 0 < size <= MAX_ICON_SIZE:
+            parser.error(f"icon sizes must be between 1 and {MAX_ICON_SIZE}")
+    
+    exe_paths = []
+    for path in args.inputs:
+        if os.path.isdir(path):
+            exe_paths.extend(iter_executables(path, recursive=not args.no_recursive))
+        else:
+            exe_paths.append(path)
+    if args.file_list:
+        list_file = sys.stdin if args.file_list == "-" else open(args.file_list, encoding="utf-8")
+        with list_file:
+            exe_paths.extend(line.strip() for line in list_file if line.strip())
+    if not exe_paths:
+        parser.error("no executables given")
+    
+    icon_cache = None
+    if args.output is None:
+        icon_cache = IconExtractor(cache_backend=args.cache_backend).icon_cache
+    
+    last_report = [0.0]
+    def show_progress(stats):
+        now = time.perf_counter()
+        if now - last_report[0] < 0.25 and stats["processed"] < stats["total"]:
+            return
+        last_report[0] = now
+        rate = stats["processed"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        print(f"\r{stats['processed']}/{stats['total']} executables, {rate:.0f}/s, "
+              f"{len(stats['failed'])} failed", end="", flush=True)
+    
+    stats = extract_batch(exe_paths, args.sizes, icon_cache, args.output, args.workers,
+                          not args.force, show_progress)
+    
+    print(f"\n{stats['extracted']} extracted, {stats['skipped']} already present, "
+          f"{stats['no_icon']} without icons, {len(stats['failed'])} failed")
+    rate = stats["processed"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+    print(f"{stats['icons_written']} icon file(s) written in {stats['seconds']:.2f}s ({rate:.0f} executables/s)")
+    if stats["failed"]:
+        print("\nFailures:")
+        for exe_path, error in stats["failed"]:
+            print(f"  {exe_path}: {error}")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
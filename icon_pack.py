@@ -0,0 +1,504 @@
+"""
+Start Menu Shortcut Creator - Packed Icon Store
+This module stores cached icons in a single append-only pack file with a
+compact binary index, instead of one small PNG file per icon. Reads go
+through a memory map of the pack; dead entries (replaced or evicted icons)
+are reclaimed by compaction.
+
+Aliases (keys sharing another key's icon, e.g. executables with identical
+icon resources) are kept in a separate append-only alias log.
+
+IconPack has the same interface as IconCache, so IconExtractor can use
+either, except that put and put_many return keys rather than paths: nothing
+is written outside the pack until a caller (such as Qt) asks get_path for a
+file. Keys must be 40-digit hex strings, as built by make_key.
+
+Unlike IconCache, the pack does not persist LRU order: reads never write to
+the index, so a lookup costs no disk write. After a reopen, recency is the
+order in which icons were last written (compaction writes them in LRU order),
+and eviction follows that order. This is intentional; a recently read but
+long ago written icon may be evicted first after a restart, and is simply
+extracted again.
+"""
+import os
+import sys
+import mmap
+import struct
+import argparse
+import tempfile
+import threading
+from collections import OrderedDict
+from icon_cache import DEFAULT_MAX_BYTES, INDEX_NAME, make_icon_key
+
+PACK_NAME = "icons.pack"
+PACK_INDEX_NAME = "icons.idx"
+PACK_ALIAS_NAME = "icons.alias"
+MATERIALIZED_DIR = "files"
+
+PACK_MAGIC = b"ICPK"
+INDEX_MAGIC = b"ICPX"
+ALIAS_MAGIC = b"ICPA"
+FORMAT_VERSION = 1
+
+# Magic, version and pack id shared by the pack and index headers
+HEADER = struct.Struct("<4sH8s")
+
+# Index record: 20-byte key, pack offset, data length, format code.
+# A record with length 0 removes the key.
+RECORD = struct.Struct("<20sQIB")
+
+# Alias record: 20-byte alias key, 20-byte target key
+ALIAS_RECORD = struct.Struct("<20s20s")
+
+# Formats of stored icons and the file extension each is materialized with
+FORMATS = {"png": 0, "ico": 1, "bmp": 2, "svg": 3}
+EXTENSIONS = {code: extension for extension, code in FORMATS.items()}
+
+# Compact automatically once dead data is larger than this and than the live data
+AUTO_COMPACT_BYTES = 4 * 1024 * 1024
+
+
+def _raw_key(key):
+    """Convert a 40-digit hex key to the 20 bytes stored in index and alias records."""
+    try:
+        raw_key = bytes.fromhex(key)
+    except (TypeError, ValueError):
+        raw_key = None
+    if raw_key is None or len(raw_key) != 20:
+        raise ValueError(f"Icon pack keys must be 40-digit hex strings: {key!r}")
+    return raw_key
+
+
+class IconPack:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, use_content_hash=False):
+        """
+        Open (or create) a packed icon store.
+
+        Args:
+            directory: Store directory (default: icon_cache in the temp directory)
+            max_bytes: Byte budget of live icons; least recently used icons
+                are evicted beyond it
+            use_content_hash: If True, keys also include a hash of the executable
+        """
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "icon_cache")
+        self.max_bytes = max_bytes
+        self.use_content_hash = use_content_hash
+        self.pack_path = os.path.join(self.directory, PACK_NAME)
+        self.index_path = os.path.join(self.directory, PACK_INDEX_NAME)
+        self.alias_path = os.path.join(self.directory, PACK_ALIAS_NAME)
+        self.materialized_directory = os.path.join(self.directory, MATERIALIZED_DIR)
+        self.total_bytes = 0
+        self.dead_bytes = 0
+        self._entries = OrderedDict()
+        self._aliases = {}
+        self._lock = threading.Lock()
+        self._map = None
+        self._pack_id = None
+        self._pack_file = None
+        self._index_file = None
+        self._alias_file = None
+
+        os.makedirs(self.materialized_directory, exist_ok=True)
+        self._open()
+
+    def _open(self):
+        """Open the pack and replay its index, starting over if they do not match."""
+        try:
+            with open(self.pack_path, "rb") as f:
+                pack_header = f.read(HEADER.size)
+                pack_size = os.fstat(f.fileno()).st_size
+            with open(self.index_path, "rb") as f:
+                index_data = f.read()
+            magic, version, pack_id = HEADER.unpack_from(pack_header)
+            index_magic, index_version, index_pack_id = HEADER.unpack_from(index_data)
+            if (magic, index_magic) != (PACK_MAGIC, INDEX_MAGIC) or version != FORMAT_VERSION \
+                    or index_version != FORMAT_VERSION or pack_id != index_pack_id:
+                raise ValueError("Pack and index do not match")
+        except (OSError, ValueError, struct.error):
+            self._create_empty()
+            return
+
+        # Replay the index; later records win, torn or out-of-range records are dropped.
+        # Replay order (last write) becomes the LRU order, see the module docstring.
+        for position in range(HEADER.size, len(index_data) - RECORD.size + 1, RECORD.size):
+            raw_key, offset, length, format_code = RECORD.unpack_from(index_data, position)
+            key = raw_key.hex()
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            if length and offset + length <= pack_size:
+                self._entries[key] = (offset, length, format_code)
+                self.total_bytes += length
+        self.dead_bytes = max(pack_size - HEADER.size - self.total_bytes, 0)
+        self._pack_id = pack_id
+        self._load_aliases()
+
+        self._pack_file = open(self.pack_path, "r+b")
+        self._index_file = open(self.index_path, "ab")
+
+    def _load_aliases(self):
+        """Replay the alias log, dropping it if it belongs to another pack."""
+        try:
+            with open(self.alias_path, "rb") as f:
+                alias_data = f.read()
+            magic, version, pack_id = HEADER.unpack_from(alias_data)
+            if magic != ALIAS_MAGIC or version != FORMAT_VERSION or pack_id != self._pack_id:
+                raise ValueError("Alias log does not match the pack")
+        except (OSError, ValueError, struct.error):
+            self._write_aliases()
+            return
+
+        for position in range(HEADER.size, len(alias_data) - ALIAS_RECORD.size + 1, ALIAS_RECORD.size):
+            raw_alias, raw_target = ALIAS_RECORD.unpack_from(alias_data, position)
+            self._aliases[raw_alias.hex()] = raw_target.hex()
+        self._alias_file = open(self.alias_path, "ab")
+
+    def _write_aliases(self, path=None):
+        """Rewrite the alias log with the aliases of live icons only."""
+        if self._alias_file is not None and path is None:
+            self._alias_file.close()
+            self._alias_file = None
+        self._aliases = {alias: target for alias, target in self._aliases.items() if target in self._entries}
+        with open(path or self.alias_path, "wb") as f:
+            f.write(HEADER.pack(ALIAS_MAGIC, FORMAT_VERSION, self._pack_id))
+            f.write(b"".join(ALIAS_RECORD.pack(_raw_key(alias), _raw_key(target))
+                             for alias, target in self._aliases.items()))
+        if path is None:
+            self._alias_file = open(self.alias_path, "ab")
+
+    def _create_empty(self):
+        """Start a new, empty pack and index."""
+        self._close_files()
+        pack_id = os.urandom(8)
+        with open(self.pack_path, "wb") as f:
+            f.write(HEADER.pack(PACK_MAGIC, FORMAT_VERSION, pack_id))
+        with open(self.index_path, "wb") as f:
+            f.write(HEADER.pack(INDEX_MAGIC, FORMAT_VERSION, pack_id))
+        self._entries.clear()
+        self._aliases.clear()
+        self._pack_id = pack_id
+        self.total_bytes = 0
+        self.dead_bytes = 0
+        self._clear_materialized()
+        self._write_aliases()
+        self._pack_file = open(self.pack_path, "r+b")
+        self._index_file = open(self.index_path, "ab")
+
+    def _close_files(self):
+        """Close the memory map and file handles (needed before replacing files on Windows)."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        for handle in (self._pack_file, self._index_file, self._alias_file):
+            if handle is not None:
+                handle.close()
+        self._pack_file = None
+        self._index_file = None
+        self._alias_file = None
+
+    def _clear_materialized(self):
+        """Delete the files written for get_path callers."""
+        try:
+            for file_name in os.listdir(self.materialized_directory):
+                try:
+                    os.remove(os.path.join(self.materialized_directory, file_name))
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+    def close(self):
+        """Close the store."""
+        with self._lock:
+            self._close_files()
+
+    def make_key(self, exe_path, size):
+        """Build the cache key of an executable's icon at one size."""
+        return make_icon_key(exe_path, size, self.use_content_hash)
+
+    def _read(self, entry):
+        """Read an entry's bytes through the memory map. Lock must be held."""
+        offset, length, _ = entry
+        if self._map is None or len(self._map) < offset + length:
+            # The pack has grown since it was mapped
+            if self._map is not None:
+                self._map.close()
+            self._pack_file.flush()
+            self._map = mmap.mmap(self._pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:offset + length]
+
+    def _resolve(self, key):
+        """Follow an alias to the key that owns the icon. Lock must be held."""
+        if key in self._entries:
+            return key
+        return self._aliases.get(key, key)
+
+    def get_bytes(self, key):
+        """
+        Return the stored icon data and mark it as recently used.
+
+        Returns:
+            Encoded image bytes, or None on a miss
+        """
+        if key is None:
+            return None
+        with self._lock:
+            key = self._resolve(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return self._read(entry)
+
+    def get_path(self, key):
+        """
+        Return a file holding the stored icon, writing it on first use.
+
+        Returns:
+            Path to the icon file, or None on a miss
+        """
+        if key is None:
+            return None
+        with self._lock:
+            key = self._resolve(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            path = os.path.join(self.materialized_directory, f"{key}.{EXTENSIONS.get(entry[2], 'png')}")
+            if not os.path.exists(path):
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(self._read(entry))
+                os.replace(temp_path, path)
+            return path
+
+    def keys(self):
+        """Return every stored key, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def contains(self, key):
+        """Check whether a key is stored without touching its LRU position."""
+        with self._lock:
+            return self._resolve(key) in self._entries
+
+    def link(self, key, target_key):
+        """Make key an alias of an icon already stored under target_key."""
+        self.link_many({key: target_key})
+
+    def link_many(self, links):
+        """
+        Make several keys aliases of stored icons with one alias log write.
+
+        Args:
+            links: Dictionary of alias key -> key of a stored icon; links to
+                keys that are not stored are ignored
+
+        Raises:
+            ValueError: If an alias key is not a 40-digit hex string
+        """
+        raw_keys = {key: _raw_key(key) for key in links}
+        with self._lock:
+            records = []
+            for key, target_key in links.items():
+                target_key = self._resolve(target_key)
+                if key != target_key and target_key in self._entries:
+                    self._aliases[key] = target_key
+                    records.append(ALIAS_RECORD.pack(raw_keys[key], _raw_key(target_key)))
+            self._alias_file.write(b"".join(records))
+            self._alias_file.flush()
+
+    def put(self, key, data, extension="png"):
+        """
+        Append icon data to the pack and evict least recently used icons over budget.
+
+        Args:
+            key: Cache key, a 40-digit hex string (see make_key)
+            data: Encoded image bytes
+            extension: Image format ("png", "ico", "bmp" or "svg")
+
+        Returns:
+            The key; use get_path if a file holding the icon is needed
+
+        Raises:
+            ValueError: If key is not a 40-digit hex string
+        """
+        self.put_many({key: data}, extension)
+        return key
+
+    def put_many(self, items, extension="png"):
+        """
+        Append several icons with one pack write and one index write.
+
+        Args:
+            items: Dictionary of cache key (40-digit hex string) -> encoded image bytes
+            extension: Image format of all items
+
+        Returns:
+            List of the stored keys
+
+        Raises:
+            ValueError: If a key is not a 40-digit hex string; nothing is stored then
+        """
+        format_code = FORMATS.get(extension, FORMATS["png"])
+        raw_keys = {key: _raw_key(key) for key in items}
+        with self._lock:
+            self._pack_file.seek(0, os.SEEK_END)
+            offset = self._pack_file.tell()
+            records = []
+            for key, data in items.items():
+                self._pack_file.write(data)
+                records.append(RECORD.pack(raw_keys[key], offset, len(data), format_code))
+                self._aliases.pop(key, None)
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.total_bytes -= previous[1]
+                    self.dead_bytes += previous[1]
+                    self._remove_materialized(key, previous[2])
+                self._entries[key] = (offset, len(data), format_code)
+                self.total_bytes += len(data)
+                offset += len(data)
+            # Data before index records, so a crash never indexes unwritten data
+            self._pack_file.flush()
+            self._index_file.write(b"".join(records))
+            self._index_file.flush()
+            self._evict()
+            if self.dead_bytes > AUTO_COMPACT_BYTES and self.dead_bytes > self.total_bytes:
+                self._compact()
+        return list(items)
+
+    def _remove_materialized(self, key, format_code):
+        """Delete the file written for a key, if any."""
+        try:
+            os.remove(os.path.join(self.materialized_directory, f"{key}.{EXTENSIONS.get(format_code, 'png')}"))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used icons until within budget. Lock must be held."""
+        tombstones = []
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, (_, length, format_code) = self._entries.popitem(last=False)
+            self.total_bytes -= length
+            self.dead_bytes += length
+            self._remove_materialized(key, format_code)
+            tombstones.append(RECORD.pack(_raw_key(key), 0, 0, format_code))
+        if tombstones:
+            self._index_file.write(b"".join(tombstones))
+            self._index_file.flush()
+
+    def compact(self):
+        """
+        Rewrite the pack with only live icons, in least recently used order.
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        with self._lock:
+            return self._compact()
+
+    def _compact(self):
+        """Rewrite the pack and index. Lock must be held."""
+        reclaimed = self.dead_bytes
+        pack_id = os.urandom(8)
+        temp_pack = self.pack_path + ".tmp"
+        temp_index = self.index_path + ".tmp"
+        temp_aliases = self.alias_path + ".tmp"
+        entries = OrderedDict()
+        with open(temp_pack, "wb") as pack, open(temp_index, "wb") as index:
+            pack.write(HEADER.pack(PACK_MAGIC, FORMAT_VERSION, pack_id))
+            index.write(HEADER.pack(INDEX_MAGIC, FORMAT_VERSION, pack_id))
+            offset = HEADER.size
+            for key, entry in self._entries.items():
+                data = self._read(entry)
+                pack.write(data)
+                index.write(RECORD.pack(_raw_key(key), offset, len(data), entry[2]))
+                entries[key] = (offset, len(data), entry[2])
+                offset += len(data)
+
+        self._pack_id = pack_id
+        self._write_aliases(temp_aliases)
+
+        # A pack id mismatch after a crash between the replaces resets the
+        # store (or only the aliases, if the alias log is the one left behind)
+        self._close_files()
+        os.replace(temp_pack, self.pack_path)
+        os.replace(temp_index, self.index_path)
+        os.replace(temp_aliases, self.alias_path)
+        self._entries = entries
+        self.dead_bytes = 0
+        self._pack_file = open(self.pack_path, "r+b")
+        self._index_file = open(self.index_path, "ab")
+        self._alias_file = open(self.alias_path, "ab")
+        return reclaimed
+
+    def flush(self):
+        """Persist pending writes. Index records are written on every put."""
+        with self._lock:
+            if self._index_file is not None:
+                self._index_file.flush()
+
+    def clear(self):
+        """Remove every stored icon."""
+        with self._lock:
+            self._create_empty()
+
+    def stats(self):
+        """
+        Return entry and size statistics.
+
+        Returns:
+            Dictionary with entries, bytes, dead_bytes, pack_bytes and max_bytes
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "dead_bytes": self.dead_bytes,
+                "pack_bytes": HEADER.size + self.total_bytes + self.dead_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def import_icon_cache(self, icon_cache):
+        """
+        Copy every icon of a file-based IconCache into the pack.
+
+        Returns:
+            Number of icons imported
+        """
+        items = {}
+        for key in icon_cache.keys():
+            data = icon_cache.get_bytes(key)
+            if data is not None and not self.contains(key):
+                items[key] = data
+        if items:
+            self.put_many(items)
+        return len(items)
+
+
+def main():
+    """Command line entry point: show statistics, compact or import a file cache."""
+    parser = argparse.ArgumentParser(description="Maintain the packed icon store")
+    parser.add_argument("action", choices=("stats", "compact", "import"),
+                        help="import copies the per-file icon cache of the same directory into the pack")
+    parser.add_argument("--directory", help="Store directory (default: icon_cache in the temp directory)")
+    args = parser.parse_args()
+
+    pack = IconPack(args.directory)
+    if args.action == "compact":
+        print(f"Reclaimed {pack.compact()} bytes")
+    elif args.action == "import":
+        if not os.path.exists(os.path.join(pack.directory, INDEX_NAME)):
+            print("No file-based icon cache found")
+            sys.exit(1)
+        from icon_cache import IconCache
+        print(f"Imported {pack.import_icon_cache(IconCache(pack.directory))} icon(s)")
+    stats = pack.stats()
+    print(f"{stats['entries']} icon(s), {stats['bytes']} live bytes, "
+          f"{stats['dead_bytes']} dead bytes, pack {stats['pack_bytes']} bytes")
+    pack.close()
+
+
+if __name__ == "__main__":
+    main()
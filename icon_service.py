@@ -0,0 +1,143 @@
+"""
+Start Menu Shortcut Creator - Background Icon Service
+This module runs icon extraction on a worker pool so a slow executable (e.g.
+on a network share) never blocks the GUI thread. Results are delivered
+through a Qt signal.
+
+Requests for an executable that is already being extracted share one job,
+and a request for a different executable cancels queued jobs of the previous
+one. Each job extracts every preview size in one pass, so switching sizes
+afterwards is answered from memory.
+
+Views showing many executables at once (the verifier table) create the
+service with supersede=False, so requests do not cancel each other, and call
+cancel_queued with the executables still on screen when they scroll.
+"""
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Number of (executable, size) results remembered in memory
+MAX_REMEMBERED = 256
+
+logger = logging.getLogger(__name__)
+
+
+class IconService(QObject):
+    """Asynchronous front end of an IconExtractor."""
+    # exe_path, size, icon_path (empty if no icon could be produced)
+    iconReady = pyqtSignal(str, int, str)
+
+    # Internal: a worker finished (exe_path, {size: icon_path}); delivered on the GUI thread
+    _jobFinished = pyqtSignal(str, object)
+
+    def __init__(self, icon_extractor, sizes=(16, 32, 48), max_workers=2, parent=None, supersede=True):
+        """
+        Initialize the service.
+
+        Args:
+            icon_extractor: IconExtractor doing the actual work
+            sizes: Sizes extracted together for every executable
+            max_workers: Number of worker threads
+            parent: Parent QObject
+            supersede: If True, a request for a new executable cancels the
+                queued jobs of others (one icon on screen at a time)
+        """
+        super().__init__(parent)
+        self.icon_extractor = icon_extractor
+        self.sizes = tuple(sizes)
+        self.supersede = supersede
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._jobs = {}
+        self._results = OrderedDict()
+        self._generation = 0
+        self._current_exe = None
+        self._jobFinished.connect(self._on_job_finished)
+
+    def request(self, exe_path, size):
+        """
+        Ask for an executable's icon at one size.
+
+        Args:
+            exe_path: Path to the executable
+            size: Desired icon size
+
+        Returns:
+            The icon path if it is already known; otherwise None, and
+            iconReady is emitted once the icon has been extracted
+        """
+        known = self._results.get((exe_path, size))
+        if known is not None:
+            self._results.move_to_end((exe_path, size))
+            return known
+
+        if self.supersede and exe_path != self._current_exe:
+            self._supersede(exe_path)
+
+        job = self._jobs.get(exe_path)
+        if job is not None:
+            # Coalesce with the job already queued or running
+            job["generation"] = self._generation
+            job["sizes"].add(size)
+            return None
+
+        sizes = set(self.sizes)
+        sizes.add(size)
+        future = self._executor.submit(self._extract, exe_path, tuple(sorted(sizes)))
+        self._jobs[exe_path] = {"future": future, "generation": self._generation, "sizes": sizes}
+        return None
+
+    def _supersede(self, exe_path):
+        """Make exe_path the current executable and cancel queued jobs of others."""
+        self._generation += 1
+        self._current_exe = exe_path
+        self.cancel_queued((exe_path,))
+
+    def cancel_queued(self, keep=()):
+        """
+        Cancel jobs that have not started yet.
+
+        Args:
+            keep: Executables whose jobs should stay queued
+        """
+        keep = set(keep)
+        for exe_path, job in list(self._jobs.items()):
+            if exe_path not in keep and job["future"].cancel():
+                del self._jobs[exe_path]
+
+    def _extract(self, exe_path, sizes):
+        """Worker: extract all sizes in one pass and hand the result to the GUI thread."""
+        try:
+            icons = self.icon_extractor.get_all_icons(exe_path, sizes)
+        except Exception:
+            # Reported as an empty icon path; the details go to the log, not stdout
+            logger.warning("Error extracting icon from %s", exe_path, exc_info=True)
+            icons = {}
+        try:
+            self._jobFinished.emit(exe_path, icons)
+        except RuntimeError:
+            # The service was deleted while the job was running
+            pass
+
+    def _on_job_finished(self, exe_path, icons):
+        """Remember a finished job's icons and report them if still wanted."""
+        job = self._jobs.pop(exe_path, None)
+        for size, icon_path in icons.items():
+            self._results[(exe_path, size)] = icon_path
+            self._results.move_to_end((exe_path, size))
+        while len(self._results) > MAX_REMEMBERED:
+            self._results.popitem(last=False)
+
+        if job is None or job["generation"] != self._generation:
+            # Superseded while running; keep the results but do not report them
+            return
+        for size in sorted(job["sizes"]):
+            self.iconReady.emit(exe_path, size, icons.get(size) or "")
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker pool without waiting."""
+        for job in self._jobs.values():
+            job["future"].cancel()
+        self._jobs.clear()
+        self._executor.shutdown(wait=False)
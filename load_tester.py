@@ -0,0 +1,102 @@
+"""
+Start Menu Shortcut Creator - Load Test Harness
+This module drives the demo ShortcutCreator with a configurable latency and
+failure model at a chosen concurrency and reports throughput and tail
+latency, so batch deployments can be capacity-planned without Windows.
+"""
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from shortcut_creator_demo import ShortcutCreator, LatencyModel
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at a fraction (0-1) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def run_load_test(creator, count, concurrency, folder="LoadTest"):
+    """
+    Create count shortcuts through a creator at a fixed concurrency.
+
+    Args:
+        creator: ShortcutCreator (any backend)
+        count: Number of shortcuts to create
+        concurrency: Number of calls in flight at once
+        folder: Start Menu subfolder the shortcuts are created in
+
+    Returns:
+        Dictionary with count, succeeded, failed, seconds, throughput and
+        latency percentiles (p50, p90, p99, max) in seconds
+    """
+    def run(index):
+        exe_path = f"C:\\Program Files\\LoadTest\\app{index}.exe"
+        started = time.perf_counter()
+        success, _ = creator.create_shortcut(exe_path, f"App {index}", False, folder)
+        return success, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(run, range(count)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in outcomes)
+    succeeded = sum(1 for success, _ in outcomes if success)
+    return {
+        "count": count,
+        "concurrency": concurrency,
+        "succeeded": succeeded,
+        "failed": count - succeeded,
+        "seconds": elapsed,
+        "throughput": count / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else 0.0,
+    }
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Load test the simulated shortcut creator")
+    parser.add_argument("--count", type=int, default=1000, help="Number of shortcuts to create")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16],
+                        help="Concurrency levels to test")
+    parser.add_argument("--latency", default="fixed:0.005",
+                        help="Latency model, e.g. fixed:0.01, uniform:0.005,0.02, "
+                             "exponential:0.01 or lognormal:0.01,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a failed call")
+    parser.add_argument("--seed", type=int, help="Random seed")
+    parser.add_argument("--backend", choices=("memory", "native"), default="memory",
+                        help="Keep shortcuts in memory or write them to a temp directory")
+    args = parser.parse_args()
+
+    print(f"Latency model: {args.latency}, error rate: {args.error_rate:.1%}, backend: {args.backend}")
+    print(f"{'workers':>7} {'ok':>7} {'failed':>7} {'seconds':>8} {'per sec':>9} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+
+    for concurrency in args.concurrency:
+        model = LatencyModel.parse(args.latency, args.error_rate, args.seed)
+        creator = ShortcutCreator(backend=args.backend, latency_model=model, verbose=False)
+        temp_dir = None
+        if args.backend == "native":
+            temp_dir = tempfile.mkdtemp(prefix="shortcut_load_test_")
+            creator.user_start_menu = temp_dir
+        try:
+            stats = run_load_test(creator, args.count, concurrency)
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+        print(f"{concurrency:>7} {stats['succeeded']:>7} {stats['failed']:>7} {stats['seconds']:>8.2f} "
+              f"{stats['throughput']:>9.1f} {stats['p50'] * 1000:>8.2f} {stats['p90'] * 1000:>8.2f} "
+              f"{stats['p99'] * 1000:>8.2f} {stats['max'] * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,13 @@ import sys
 import os
 import platform
 from PyQt5.QtWidgets import QApplication, QMainWindow
-from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt
 
 # Use demo implementation for non-Windows environments
 from shortcut_creator_demo import ShortcutCreator
 from ui_components import ShortcutCreatorUI
+from metadata_cache import MetadataCache
+from svg_raster_cache import SvgRasterCache, APP_ICON
 
 def is_admin():
     """Check if the current process has admin privileges."""
@@ -22,16 +23,24 @@ def run_as_admin():
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.shortcut_creator = ShortcutCreator()
-        self.ui = ShortcutCreatorUI(self, self.shortcut_creator)
+        # One metadata cache shared by the creator, icon extractor and UI
+        self.metadata_cache = MetadataCache()
+        # Metadata writes are committed in batches; commit the rest on exit
+        QApplication.instance().aboutToQuit.connect(self.metadata_cache.flush)
+        # Pre-rendered SVG assets, kept on disk between runs; only the first
+        # run on a screen scale actually rasterizes anything
+        self.svg_cache = SvgRasterCache()
+        self.svg_cache.warm(device_pixel_ratios=(self.devicePixelRatioF(),))
+        self.shortcut_creator = ShortcutCreator(metadata_cache=self.metadata_cache)
+        self.ui = ShortcutCreatorUI(self, self.shortcut_creator, self.metadata_cache, self.svg_cache)
         self.init_ui()
         
     def init_ui(self):
         self.setCentralWidget(self.ui)
         self.setWindowTitle("Start Menu Shortcut Creator")
         self.setMinimumSize(800, 600)
-        # Set app icon (will be shown as SVG inline in our app)
-        self.setWindowIcon(QIcon("assets/app_icon.svg"))
+        # Set app icon from pre-rendered sizes of the SVG
+        self.setWindowIcon(self.svg_cache.icon(APP_ICON, device_pixel_ratio=self.devicePixelRatioF()))
         self.center_on_screen()
 
     def center_on_screen(self):
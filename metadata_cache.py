@@ -0,0 +1,274 @@
+"""
+Start Menu Shortcut Creator - Executable Metadata Cache
+This module keeps version info, validation results and icon cache references
+for executables in a persistent SQLite database, shared by ShortcutCreator,
+IconExtractor and the UI.
+
+Entries are keyed by (path, size, mtime) and optionally a content hash, so a
+changed executable is re-examined while repeat lookups of an unchanged one
+only cost a stat call and a dictionary lookup. Files are stat'ed and hashed
+without holding the cache lock, and writes are committed in batches; call
+flush (or close) to commit the rest.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+# Metadata fields stored per executable
+FIELDS = ("exe_info", "valid", "icons")
+
+# Writes are committed once this many are pending, or once the oldest
+# pending write is this many seconds old
+COMMIT_EVERY = 64
+COMMIT_SECONDS = 2.0
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MetadataCache:
+    def __init__(self, db_path=None, use_content_hash=False):
+        """
+        Open (or create) the metadata database.
+
+        Args:
+            db_path: SQLite file (default: icon_cache/metadata.sqlite in the
+                temp directory, next to the icon cache)
+            use_content_hash: If True, an executable whose size or mtime
+                changed keeps its metadata when its content hash is unchanged
+        """
+        if db_path is None:
+            cache_directory = os.path.join(tempfile.gettempdir(), "icon_cache")
+            os.makedirs(cache_directory, exist_ok=True)
+            db_path = os.path.join(cache_directory, "metadata.sqlite")
+
+        self.db_path = db_path
+        self.use_content_hash = use_content_hash
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._pending_writes = 0
+        self._first_pending = 0.0
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS executables ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT, "
+            "exe_info TEXT, valid INTEGER, icons TEXT)"
+        )
+        self._connection.commit()
+
+    def close(self):
+        """Commit pending writes and close the database connection."""
+        with self._lock:
+            self._commit()
+            self._connection.close()
+
+    def flush(self):
+        """Commit pending writes."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        """Commit pending writes. Lock must be held."""
+        if self._pending_writes:
+            self._connection.commit()
+            self._pending_writes = 0
+
+    def _key(self, path):
+        """Normalize a path for use as a cache key."""
+        return os.path.normcase(os.path.abspath(path))
+
+    def _load(self, key):
+        """Load a record from the in-memory layer or the database."""
+        record = self._memory.get(key)
+        if record is not None:
+            return record
+
+        row = self._connection.execute(
+            "SELECT size, mtime_ns, content_hash, exe_info, valid, icons FROM executables WHERE path = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        record = {
+            "size": row[0],
+            "mtime_ns": row[1],
+            "content_hash": row[2],
+            "exe_info": json.loads(row[3]) if row[3] else None,
+            "valid": None if row[4] is None else bool(row[4]),
+            "icons": json.loads(row[5]) if row[5] else {},
+        }
+        self._memory[key] = record
+        return record
+
+    def _store(self, key, record):
+        """Write a record to both layers, committing when enough writes are pending. Lock must be held."""
+        self._memory[key] = record
+        self._connection.execute(
+            "INSERT OR REPLACE INTO executables (path, size, mtime_ns, content_hash, exe_info, valid, icons) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key, record["size"], record["mtime_ns"], record["content_hash"],
+                json.dumps(record["exe_info"]) if record["exe_info"] is not None else None,
+                None if record["valid"] is None else int(record["valid"]),
+                json.dumps(record["icons"]),
+            )
+        )
+        if not self._pending_writes:
+            self._first_pending = time.monotonic()
+        self._pending_writes += 1
+        if self._pending_writes >= COMMIT_EVERY or time.monotonic() - self._first_pending >= COMMIT_SECONDS:
+            self._commit()
+
+    def _content_hash(self, key, path, stat, for_new_record=False):
+        """
+        Hash the file if its record can only be validated (or created) with
+        a content hash. The lock is only held to look at the record.
+
+        Returns:
+            Hex digest, or None if no hash is needed or the file cannot be read
+        """
+        if not self.use_content_hash:
+            return None
+        with self._lock:
+            record = self._load(key)
+            if record is None:
+                needed = for_new_record
+            elif record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+                needed = False
+            else:
+                needed = for_new_record or bool(record["content_hash"])
+        if not needed:
+            return None
+        try:
+            return hash_file(path)
+        except OSError:
+            return None
+
+    def _current_record(self, key, stat, content_hash=None):
+        """
+        Return the record for key if it still describes the file on disk. Lock must be held.
+
+        A record whose size or mtime no longer match is discarded, unless
+        content_hash (see _content_hash) shows the contents are unchanged.
+        """
+        record = self._load(key)
+        if record is None:
+            return None
+        if record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+            return record
+
+        if content_hash is not None and record["content_hash"] == content_hash:
+            record["size"] = stat.st_size
+            record["mtime_ns"] = stat.st_mtime_ns
+            self._store(key, record)
+            return record
+
+        self._memory.pop(key, None)
+        return None
+
+    def get(self, path, field):
+        """
+        Look up one cached field for an executable.
+
+        Args:
+            path: Path to the executable
+            field: One of "exe_info", "valid" or "icons"
+
+        Returns:
+            The cached value, or None if missing or stale
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = self._key(path)
+        content_hash = self._content_hash(key, path, stat)
+        with self._lock:
+            record = self._current_record(key, stat, content_hash)
+            if record is None:
+                return None
+            # Hand out copies so callers cannot modify the cached record
+            value = record[field]
+            return dict(value) if isinstance(value, dict) else value
+
+    def set(self, path, field, value):
+        """
+        Store one field for an executable.
+
+        Args:
+            path: Path to the executable
+            field: One of "exe_info", "valid" or "icons"
+            value: JSON-serializable value to store
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown metadata field: {field}")
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        key = self._key(path)
+        content_hash = self._content_hash(key, path, stat, for_new_record=True)
+        with self._lock:
+            record = self._current_record(key, stat, content_hash)
+            if record is None:
+                record = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "content_hash": content_hash,
+                    "exe_info": None,
+                    "valid": None,
+                    "icons": {},
+                }
+            record[field] = dict(value) if isinstance(value, dict) else value
+            self._store(key, record)
+
+    def get_or_compute(self, path, field, compute):
+        """
+        Return a cached field, computing and storing it on a miss.
+
+        Files that cannot be stat'ed (e.g. simulated paths) are passed
+        straight to compute without caching.
+        """
+        value = self.get(path, field)
+        if value is None:
+            value = compute(path)
+            self.set(path, field, value)
+        return value
+
+    def get_icon(self, path, size):
+        """Return the cached icon file for an executable and size, if it still exists."""
+        icons = self.get(path, "icons") or {}
+        icon_path = icons.get(str(size))
+        if icon_path and os.path.exists(icon_path):
+            return icon_path
+        return None
+
+    def set_icon(self, path, size, icon_path):
+        """Remember the cached icon file for an executable and size."""
+        self.set_icons(path, {size: icon_path})
+
+    def set_icons(self, path, icon_paths):
+        """Remember the cached icon files of several sizes with one write."""
+        icons = dict(self.get(path, "icons") or {})
+        for size, icon_path in icon_paths.items():
+            icons[str(size)] = icon_path
+        self.set(path, "icons", icons)
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._memory.clear()
+            self._connection.execute("DELETE FROM executables")
+            self._connection.commit()
+            self._pending_writes = 0
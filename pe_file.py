@@ -0,0 +1,627 @@
+"""
+Start Menu Shortcut Creator - PE File Reader
+This module reads Windows executables (PE files) in pure Python through a
+read-only memory map, so only the pages that are actually inspected are
+loaded from disk, even for multi-gigabyte executables.
+"""
+import os
+import re
+import mmap
+import struct
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Resource type IDs
+RT_ICON = 3
+RT_GROUP_ICON = 14
+RT_VERSION = 16
+
+# Data directory index of the resource table
+IMAGE_DIRECTORY_ENTRY_RESOURCE = 2
+
+# Optional header magic values
+PE32_MAGIC = 0x10B
+PE32_PLUS_MAGIC = 0x20B
+
+VS_FIXEDFILEINFO_SIGNATURE = 0xFEEF04BD
+
+# COFF characteristics
+IMAGE_FILE_EXECUTABLE_IMAGE = 0x0002
+IMAGE_FILE_DLL = 0x2000
+
+# Machine types accepted as Windows executables
+MACHINE_TYPES = {
+    0x014C: "x86",
+    0x8664: "x64",
+    0xAA64: "arm64",
+    0x01C4: "arm",
+    0x0200: "ia64",
+}
+
+# Subsystems that run as regular applications
+SUBSYSTEMS = {
+    2: "gui",
+    3: "console",
+}
+
+# Size of the single read used to validate headers
+HEADER_READ_SIZE = 4096
+
+# Characters Windows does not allow in file names
+INVALID_FILE_NAME_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+class PEFormatError(Exception):
+    """Raised when a file is not a well-formed PE executable."""
+
+
+def parse_headers(data):
+    """
+    Parse the DOS, COFF and optional headers and the section table.
+
+    Args:
+        data: Bytes-like object starting at the beginning of the file (the
+            whole file or just its first few kilobytes)
+
+    Returns:
+        Dictionary with pe_offset, machine, characteristics, magic,
+        subsystem, data_directories and sections
+    """
+    if data[:2] != b"MZ":
+        raise PEFormatError("Missing MZ signature")
+
+    pe_offset = struct.unpack_from("<I", data, 0x3C)[0]
+    if data[pe_offset:pe_offset + 4] != b"PE\0\0":
+        raise PEFormatError("Missing PE signature")
+
+    coff_offset = pe_offset + 4
+    (machine, number_of_sections, _, _, _,
+     optional_header_size, characteristics) = struct.unpack_from("<HHIIIHH", data, coff_offset)
+
+    optional_offset = coff_offset + 20
+    magic = struct.unpack_from("<H", data, optional_offset)[0]
+    if magic == PE32_MAGIC:
+        directories_offset = optional_offset + 96
+    elif magic == PE32_PLUS_MAGIC:
+        directories_offset = optional_offset + 112
+    else:
+        raise PEFormatError(f"Unknown optional header magic 0x{magic:x}")
+    subsystem = struct.unpack_from("<H", data, optional_offset + 68)[0]
+
+    number_of_directories = struct.unpack_from("<I", data, directories_offset - 4)[0]
+    data_directories = []
+    for index in range(min(number_of_directories, 16)):
+        data_directories.append(struct.unpack_from("<II", data, directories_offset + index * 8))
+
+    sections = []
+    section_offset = optional_offset + optional_header_size
+    for index in range(number_of_sections):
+        (name, virtual_size, virtual_address, raw_size,
+         raw_pointer) = struct.unpack_from("<8sIIII", data, section_offset + index * 40)
+        sections.append({
+            "name": name.rstrip(b"\0").decode("ascii", errors="replace"),
+            "virtual_size": virtual_size,
+            "virtual_address": virtual_address,
+            "raw_size": raw_size,
+            "raw_pointer": raw_pointer,
+        })
+
+    return {
+        "pe_offset": pe_offset,
+        "machine": machine,
+        "characteristics": characteristics,
+        "magic": magic,
+        "subsystem": subsystem,
+        "data_directories": data_directories,
+        "sections": sections,
+        "headers_end": section_offset + number_of_sections * 40,
+    }
+
+
+class PEFile:
+    """
+    Read-only view of a PE file.
+
+    Usage:
+        with PEFile(path) as pe:
+            info = pe.get_version_info()
+    """
+    def __init__(self, path):
+        """
+        Open and memory-map a PE file and parse its headers.
+
+        Args:
+            path: Path to the executable
+        """
+        self.path = path
+        self._map = None
+        self._resources = {}
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < 64:
+                raise PEFormatError("File is too small to be an executable")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self.size = size
+
+        try:
+            self._parse_headers()
+        except struct.error:
+            self.close()
+            raise PEFormatError("Truncated PE headers")
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the memory map and file handle."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _parse_headers(self):
+        """Parse the DOS, COFF and optional headers and the section table."""
+        headers = parse_headers(self._map)
+        self.headers = headers
+        self.pe_offset = headers["pe_offset"]
+        self.machine = headers["machine"]
+        self.number_of_sections = len(headers["sections"])
+        self.characteristics = headers["characteristics"]
+        self.magic = headers["magic"]
+        self.subsystem = headers["subsystem"]
+        self.data_directories = headers["data_directories"]
+        self.sections = headers["sections"]
+
+    def validate(self):
+        """
+        Check the parsed headers like validate_pe, without reading the file again.
+
+        Returns:
+            Dictionary with path, valid, reason, machine, subsystem and is_dll
+        """
+        verdict = {"path": self.path, "valid": False, "reason": "", "machine": None, "subsystem": None,
+                   "is_dll": False}
+        return _check_headers(verdict, self.headers, self.size)
+
+    def rva_to_offset(self, rva):
+        """Translate a relative virtual address to a file offset."""
+        for section in self.sections:
+            start = section["virtual_address"]
+            end = start + max(section["virtual_size"], section["raw_size"])
+            if start <= rva < end:
+                return rva - start + section["raw_pointer"]
+        raise PEFormatError(f"RVA 0x{rva:x} is outside every section")
+
+    def read_rva(self, rva, size):
+        """Return size bytes at a relative virtual address."""
+        offset = self.rva_to_offset(rva)
+        if offset + size > self.size:
+            raise PEFormatError("Resource data extends past the end of the file")
+        return self._map[offset:offset + size]
+
+    def _resource_entries(self, directory_offset, resource_base):
+        """Yield (id_or_name, is_directory, offset) for one resource directory."""
+        data = self._map
+        named, numbered = struct.unpack_from("<HH", data, directory_offset + 12)
+        entry_offset = directory_offset + 16
+        for index in range(named + numbered):
+            name, target = struct.unpack_from("<II", data, entry_offset + index * 8)
+            if name & 0x80000000:
+                name_offset = resource_base + (name & 0x7FFFFFFF)
+                length = struct.unpack_from("<H", data, name_offset)[0]
+                name = bytes(data[name_offset + 2:name_offset + 2 + length * 2]).decode("utf-16-le")
+            yield name, bool(target & 0x80000000), resource_base + (target & 0x7FFFFFFF)
+
+    def find_resources(self, resource_type):
+        """
+        List the resources of one type.
+
+        Args:
+            resource_type: Numeric resource type (e.g. RT_VERSION)
+
+        Returns:
+            List of (resource_id, language, data_rva, size) tuples
+        """
+        if resource_type in self._resources:
+            return self._resources[resource_type]
+        if len(self.data_directories) <= IMAGE_DIRECTORY_ENTRY_RESOURCE:
+            return []
+        resource_rva, resource_size = self.data_directories[IMAGE_DIRECTORY_ENTRY_RESOURCE]
+        if not resource_rva or not resource_size:
+            return []
+
+        try:
+            base = self.rva_to_offset(resource_rva)
+            resources = []
+            for type_id, is_directory, type_offset in self._resource_entries(base, base):
+                if type_id != resource_type or not is_directory:
+                    continue
+                for resource_id, is_directory, name_offset in self._resource_entries(type_offset, base):
+                    if not is_directory:
+                        continue
+                    for language, is_directory, data_entry_offset in self._resource_entries(name_offset, base):
+                        if is_directory:
+                            continue
+                        data_rva, size = struct.unpack_from("<II", self._map, data_entry_offset)
+                        resources.append((resource_id, language, data_rva, size))
+            self._resources[resource_type] = resources
+            return resources
+        except struct.error:
+            raise PEFormatError("Truncated resource directory")
+
+    def get_icon_groups(self):
+        """
+        List the icon groups in resource order.
+
+        The first group is the one Windows shows for the executable
+        (icon index 0).
+
+        Returns:
+            List of (resource_id, language, data_rva, size) tuples
+        """
+        return self.find_resources(RT_GROUP_ICON)
+
+    def read_icon_group(self, group_index=0):
+        """
+        Decode the GRPICONDIR of one icon group.
+
+        Args:
+            group_index: Position of the group in resource order
+
+        Returns:
+            List of entry dicts with width, height, color_count, planes,
+            bit_count, size and icon_id (empty if there is no such group)
+        """
+        groups = self.get_icon_groups()
+        if group_index >= len(groups):
+            return []
+        _, _, data_rva, size = groups[group_index]
+        data = self.read_rva(data_rva, size)
+        try:
+            _, icon_type, count = struct.unpack_from("<HHH", data, 0)
+            if icon_type != 1:
+                raise PEFormatError("Group resource is not an icon group")
+            entries = []
+            for index in range(count):
+                (width, height, color_count, _, planes, bit_count,
+                 bytes_in_res, icon_id) = struct.unpack_from("<BBBBHHIH", data, 6 + index * 14)
+                entries.append({
+                    "width": width or 256,
+                    "height": height or 256,
+                    "color_count": color_count,
+                    "planes": planes,
+                    "bit_count": bit_count,
+                    "size": bytes_in_res,
+                    "icon_id": icon_id,
+                })
+            return entries
+        except struct.error:
+            raise PEFormatError("Truncated icon group")
+
+    def read_icon_image(self, icon_id):
+        """
+        Return the raw RT_ICON data (a DIB or a PNG) of one icon image.
+
+        Args:
+            icon_id: The icon_id of a group entry
+
+        Returns:
+            Bytes of the icon image, or None if it does not exist
+        """
+        for resource_id, _, data_rva, size in self.find_resources(RT_ICON):
+            if resource_id == icon_id:
+                return self.read_rva(data_rva, size)
+        return None
+
+    def get_version_info(self):
+        """
+        Decode the RT_VERSION resource in a single pass.
+
+        Returns:
+            Dictionary with "file_version", "product_version", "translations"
+            (list of (language, codepage)) and "strings" (string table key ->
+            {name: value}), or None if the file has no version resource
+        """
+        resources = self.find_resources(RT_VERSION)
+        if not resources:
+            return None
+        _, _, data_rva, size = resources[0]
+        try:
+            return _parse_version_info(self.read_rva(data_rva, size))
+        except (struct.error, UnicodeDecodeError):
+            raise PEFormatError("Malformed version resource")
+
+
+def _align4(offset):
+    """Round an offset up to the next 32-bit boundary."""
+    return (offset + 3) & ~3
+
+
+def _parse_version_node(data, offset):
+    """
+    Parse one VS_VERSIONINFO-style node header.
+
+    Returns:
+        (length, value_length, value_type, key, value_offset)
+    """
+    if offset + 6 > len(data):
+        raise PEFormatError("Version resource node is truncated")
+    length, value_length, value_type = struct.unpack_from("<HHH", data, offset)
+    key_start = offset + 6
+    key_end = key_start
+    while key_end + 1 < len(data) and data[key_end:key_end + 2] != b"\0\0":
+        key_end += 2
+    if key_end + 1 >= len(data):
+        raise PEFormatError("Version resource key is not terminated")
+    key = data[key_start:key_end].decode("utf-16-le", errors="replace")
+    return length, value_length, value_type, key, _align4(key_end + 2)
+
+
+def _iter_children(data, start, end):
+    """Yield the offsets of the child nodes between start and end."""
+    offset = _align4(start)
+    while offset + 6 <= end:
+        length = struct.unpack_from("<H", data, offset)[0]
+        if length == 0:
+            break
+        yield offset
+        offset = _align4(offset + length)
+
+
+def _format_version(ms, ls):
+    """Format two version DWORDs as a dotted version string."""
+    return f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+
+
+def _parse_version_info(data):
+    """Decode VS_VERSIONINFO, its VS_FIXEDFILEINFO and all child tables."""
+    length, value_length, _, key, value_offset = _parse_version_node(data, 0)
+    if key != "VS_VERSION_INFO":
+        raise PEFormatError("Unexpected version resource key")
+    end = min(length, len(data))
+
+    info = {"file_version": "", "product_version": "", "translations": [], "strings": {}}
+    if value_length >= 52:
+        fixed = struct.unpack_from("<13I", data, value_offset)
+        if fixed[0] == VS_FIXEDFILEINFO_SIGNATURE:
+            info["file_version"] = _format_version(fixed[2], fixed[3])
+            info["product_version"] = _format_version(fixed[4], fixed[5])
+
+    for child in _iter_children(data, value_offset + value_length, end):
+        child_length, _, _, child_key, child_value = _parse_version_node(data, child)
+        child_end = min(child + child_length, end)
+
+        if child_key == "StringFileInfo":
+            for table in _iter_children(data, child_value, child_end):
+                table_length, _, _, table_key, table_value = _parse_version_node(data, table)
+                table_end = min(table + table_length, child_end)
+                strings = {}
+                for entry in _iter_children(data, table_value, table_end):
+                    entry_length, _, _, name, entry_value = _parse_version_node(data, entry)
+                    entry_end = min(entry + entry_length, table_end)
+                    raw = data[entry_value:entry_end] if entry_value < entry_end else b""
+                    if len(raw) % 2:
+                        raw = raw[:-1]
+                    strings[name] = raw.decode("utf-16-le").split("\0", 1)[0]
+                info["strings"][table_key.lower()] = strings
+
+        elif child_key == "VarFileInfo":
+            for var in _iter_children(data, child_value, child_end):
+                var_length, var_value_length, _, var_key, var_value = _parse_version_node(data, var)
+                if var_key == "Translation":
+                    count = var_value_length // 4
+                    pairs = struct.unpack_from(f"<{count * 2}H", data, var_value)
+                    info["translations"] = list(zip(pairs[0::2], pairs[1::2]))
+
+    return info
+
+
+def get_version_strings(version_info):
+    """
+    Pick the string table that matches the first declared translation.
+
+    Args:
+        version_info: Dictionary returned by PEFile.get_version_info
+
+    Returns:
+        {name: value} dictionary (empty if there is no string table)
+    """
+    tables = version_info.get("strings", {}) if version_info else {}
+    for language, codepage in version_info.get("translations", []) if version_info else []:
+        table = tables.get(f"{language:04x}{codepage:04x}")
+        if table is not None:
+            return table
+    return next(iter(tables.values()), {})
+
+
+def sanitize_file_name(name):
+    """
+    Make a string such as a ProductName usable as a file name.
+
+    Drops the characters Windows does not allow in file names and the
+    trailing dots and spaces it strips silently.
+    """
+    return INVALID_FILE_NAME_CHARS.sub("", name).strip().rstrip(". ")
+
+
+def read_exe_info(exe_path, pe=None):
+    """
+    Extract the information shown for an executable in a single pass.
+
+    Args:
+        exe_path: Path to the executable
+        pe: Optional PEFile of exe_path that is already open
+
+    Returns:
+        Dictionary with version, description, product_name, company and
+        suggested_name (same shape as ShortcutCreator.get_exe_info); the
+        suggested name is safe to use as a file name
+    """
+    basename = os.path.splitext(os.path.basename(exe_path))[0]
+    try:
+        if pe is not None:
+            version_info = pe.get_version_info()
+        else:
+            with PEFile(exe_path) as pe:
+                version_info = pe.get_version_info()
+    except (OSError, ValueError, struct.error, PEFormatError):
+        version_info = None
+
+    if not version_info:
+        return {
+            'version': '',
+            'description': '',
+            'product_name': '',
+            'company': '',
+            'suggested_name': basename
+        }
+
+    strings = get_version_strings(version_info)
+    return {
+        'version': version_info['file_version'],
+        'description': strings.get('FileDescription', ''),
+        'product_name': strings.get('ProductName', ''),
+        'company': strings.get('CompanyName', ''),
+        'suggested_name': sanitize_file_name(strings.get('ProductName', '')) or basename
+    }
+
+
+def validate_pe(path, read_size=HEADER_READ_SIZE):
+    """
+    Check the structure of a PE executable from a single small read.
+
+    Follows e_lfanew to the PE signature and checks the machine type,
+    subsystem, image flags and that every section lies within the file, so
+    truncated or corrupt files are rejected before any extraction work.
+
+    Args:
+        path: Path to the executable
+        read_size: Number of bytes read from the start of the file
+
+    Returns:
+        Dictionary with path, valid, reason, machine, subsystem and is_dll
+    """
+    verdict = {"path": path, "valid": False, "reason": "", "machine": None, "subsystem": None, "is_dll": False}
+    try:
+        with open(path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            data = f.read(read_size)
+            # Headers past the first read are rare, but legal
+            if len(data) >= 0x40 and data[:2] == b"MZ":
+                pe_offset = struct.unpack_from("<I", data, 0x3C)[0]
+                if read_size < pe_offset + 0x200 <= file_size:
+                    f.seek(0)
+                    data = f.read(pe_offset + 0x200)
+        headers = parse_headers(data)
+        if headers["headers_end"] > len(data) and headers["headers_end"] <= file_size:
+            with open(path, "rb") as f:
+                data = f.read(headers["headers_end"])
+            headers = parse_headers(data)
+    except OSError as e:
+        verdict["reason"] = f"Unreadable: {e}"
+        return verdict
+    except PEFormatError as e:
+        verdict["reason"] = str(e)
+        return verdict
+    except struct.error:
+        verdict["reason"] = "Truncated PE headers"
+        return verdict
+    return _check_headers(verdict, headers, file_size)
+
+
+def _check_headers(verdict, headers, file_size):
+    """Fill in a verdict from parsed headers and return it."""
+    verdict["machine"] = MACHINE_TYPES.get(headers["machine"])
+    verdict["subsystem"] = SUBSYSTEMS.get(headers["subsystem"])
+    verdict["is_dll"] = bool(headers["characteristics"] & IMAGE_FILE_DLL)
+
+    if verdict["machine"] is None:
+        verdict["reason"] = f"Unsupported machine type 0x{headers['machine']:x}"
+    elif verdict["subsystem"] is None:
+        verdict["reason"] = f"Not a GUI or console application (subsystem {headers['subsystem']})"
+    elif not headers["characteristics"] & IMAGE_FILE_EXECUTABLE_IMAGE:
+        verdict["reason"] = "Image is not marked as executable"
+    elif verdict["is_dll"]:
+        verdict["reason"] = "File is a DLL"
+    elif not headers["sections"]:
+        verdict["reason"] = "No sections"
+    else:
+        for section in headers["sections"]:
+            if section["raw_size"] and section["raw_pointer"] + section["raw_size"] > file_size:
+                verdict["reason"] = f"Section {section['name']} extends past the end of the file (truncated)"
+                break
+        else:
+            verdict["valid"] = True
+    return verdict
+
+
+def iter_executables(directory, recursive=True, extensions=(".exe",)):
+    """Yield the paths of files with the given extensions below a directory."""
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            if file.lower().endswith(extensions):
+                yield os.path.join(root, file)
+        if not recursive:
+            break
+
+
+def validate_directory(directory, recursive=True, max_workers=8):
+    """
+    Validate every executable below a directory in parallel.
+
+    Verdicts are yielded as soon as they are ready, while the directory is
+    still being walked, and at most a few files per worker are in flight.
+
+    Args:
+        directory: Directory to scan
+        recursive: If True, include subdirectories
+        max_workers: Number of worker threads
+
+    Yields:
+        Verdict dictionaries as returned by validate_pe
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for path in iter_executables(directory, recursive):
+            pending.add(executor.submit(validate_pe, path))
+            if len(pending) >= max_workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def main():
+    """Validate every executable below the given directories."""
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python pe_file.py <directory> [<directory> ...]")
+        return
+
+    valid_count = 0
+    invalid_count = 0
+    for directory in sys.argv[1:]:
+        for verdict in validate_directory(directory):
+            if verdict["valid"]:
+                valid_count += 1
+                print(f"OK       {verdict['path']} ({verdict['machine']}, {verdict['subsystem']})")
+            else:
+                invalid_count += 1
+                print(f"INVALID  {verdict['path']} - {verdict['reason']}")
+
+    print(f"\n{valid_count} valid, {invalid_count} invalid")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Start Menu Shortcut Creator - Decoded Icon Cache
+This module keeps recently shown icons as decoded QPixmaps in memory, keyed by
+(icon file, size, device pixel ratio), in front of the on-disk icon cache, so
+size toggles and name edits do not decode the same PNG or re-rasterize the
+same SVG again.
+"""
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QIcon, QPixmap
+
+# Default memory budget of decoded pixmaps
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+def pixmap_bytes(pixmap):
+    """Estimate the memory used by a decoded pixmap."""
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, svg_cache=None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Memory budget; least recently used pixmaps are dropped beyond it
+            svg_cache: Optional SvgRasterCache that SVG files are rendered through
+        """
+        self.max_bytes = max_bytes
+        self.svg_cache = svg_cache
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, icon_key, size, device_pixel_ratio=1.0):
+        """
+        Look up a decoded pixmap.
+
+        Returns:
+            QPixmap, or None on a miss
+        """
+        key = (icon_key, size, device_pixel_ratio)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, icon_key, size, device_pixel_ratio, pixmap):
+        """Store a decoded pixmap, evicting least recently used ones over budget."""
+        key = (icon_key, size, device_pixel_ratio)
+        cost = pixmap_bytes(pixmap)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (pixmap, cost)
+            self.total_bytes += cost
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_cost
+                self.evictions += 1
+
+    def load(self, icon_path, size, device_pixel_ratio=1.0):
+        """
+        Return the pixmap for an icon file, decoding it only on a miss.
+
+        SVG files are rasterized at size times the device pixel ratio;
+        bitmap files are decoded as they are.
+
+        Args:
+            icon_path: Path to a PNG, ICO or SVG file
+            size: Logical icon size in pixels
+            device_pixel_ratio: Screen scale factor
+
+        Returns:
+            QPixmap (null if the file cannot be decoded)
+        """
+        pixmap = self.get(icon_path, size, device_pixel_ratio)
+        if pixmap is not None:
+            return pixmap
+
+        if icon_path.lower().endswith('.svg') and self.svg_cache is not None:
+            pixmap = self.svg_cache.pixmap(icon_path, size, device_pixel_ratio)
+        elif icon_path.lower().endswith('.svg'):
+            physical = int(round(size * device_pixel_ratio))
+            pixmap = QIcon(icon_path).pixmap(QSize(physical, physical))
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+        else:
+            pixmap = QPixmap(icon_path)
+
+        if not pixmap.isNull():
+            self.put(icon_path, size, device_pixel_ratio, pixmap)
+        return pixmap
+
+    def stats(self):
+        """
+        Return hit-rate and memory statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries,
+            bytes and max_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        """Drop every cached pixmap."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
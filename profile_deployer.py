@@ -0,0 +1,193 @@
+"""
+Start Menu Shortcut Creator - Multi-Profile Deployment
+This module writes the same set of shortcuts into the Start Menu of many
+existing user profiles (e.g. on Remote Desktop hosts) using a worker pool.
+
+Each shortcut is encoded once with the native .lnk writer and the same bytes
+are written into every profile. Concurrency is bounded per volume so a single
+disk or file share is not flooded with parallel writes.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from shell_link import build_shortcut
+from shortcut_sync import load_manifest, normalize_spec
+
+# Start Menu Programs folder relative to a profile root
+PROFILE_START_MENU = os.path.join("AppData", "Roaming", "Microsoft", "Windows", "Start Menu", "Programs")
+
+# Folders in the users directory that are not real user profiles
+SKIP_PROFILES = {"public", "default", "default user", "all users", "defaultapppool"}
+
+
+def list_profiles(users_root):
+    """
+    List the user profile folders below a users directory (e.g. C:\\Users).
+
+    Returns:
+        Sorted list of profile paths
+    """
+    profiles = []
+    with os.scandir(users_root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and entry.name.lower() not in SKIP_PROFILES:
+                profiles.append(entry.path)
+    return sorted(profiles)
+
+
+def volume_of(path):
+    """Return an identifier of the volume (drive, share or device) holding a path."""
+    drive, _ = os.path.splitdrive(os.path.abspath(path))
+    if drive:
+        return drive.lower()
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+class ProfileDeployer:
+    def __init__(self, max_workers=16, per_volume_limit=4):
+        """
+        Initialize the deployer.
+
+        Args:
+            max_workers: Total number of worker threads
+            per_volume_limit: Maximum number of profiles written at the same
+                time on one volume
+        """
+        self.max_workers = max_workers
+        self.per_volume_limit = per_volume_limit
+        self._volume_locks = {}
+        self._volume_locks_guard = threading.Lock()
+
+    def _volume_semaphore(self, volume):
+        """Get the semaphore bounding concurrent writes to one volume."""
+        with self._volume_locks_guard:
+            if volume not in self._volume_locks:
+                self._volume_locks[volume] = threading.BoundedSemaphore(self.per_volume_limit)
+            return self._volume_locks[volume]
+
+    def _prepare(self, shortcuts):
+        """Normalize the shortcut set and encode every .lnk once."""
+        prepared = []
+        for entry in shortcuts:
+            spec = normalize_spec(entry)
+            data = build_shortcut(
+                spec["target"],
+                working_dir=spec["working_dir"],
+                arguments=spec["arguments"],
+                icon_location=spec["icon_location"],
+                icon_index=spec["icon_index"],
+                description=spec["description"]
+            )
+            prepared.append((spec["folder"], spec["name"] + ".lnk", data))
+        return prepared
+
+    def _deploy_profile(self, profile, prepared):
+        """Write all prepared shortcuts into one profile and report the result."""
+        start_menu = os.path.join(profile, PROFILE_START_MENU)
+        result = {"profile": profile, "start_menu": start_menu, "success": False,
+                  "written": 0, "failed": 0, "errors": [], "seconds": 0.0}
+
+        with self._volume_semaphore(volume_of(profile)):
+            started = time.perf_counter()
+            if not os.path.isdir(profile):
+                result["errors"].append("Profile folder not found")
+                result["failed"] = len(prepared)
+            else:
+                known_dirs = set()
+                for folder, file_name, data in prepared:
+                    target_dir = os.path.join(start_menu, folder) if folder else start_menu
+                    try:
+                        if target_dir not in known_dirs:
+                            os.makedirs(target_dir, exist_ok=True)
+                            known_dirs.add(target_dir)
+                        with open(os.path.join(target_dir, file_name), "wb") as f:
+                            f.write(data)
+                        result["written"] += 1
+                    except OSError as e:
+                        result["failed"] += 1
+                        result["errors"].append(f"{file_name}: {e}")
+            result["seconds"] = time.perf_counter() - started
+
+        result["success"] = result["failed"] == 0
+        return result
+
+    def deploy(self, profiles, shortcuts, progress=None):
+        """
+        Deploy a shortcut set into many profiles.
+
+        Args:
+            profiles: Iterable of profile root folders
+            shortcuts: Iterable of shortcut entries (manifest format: name,
+                target, optional folder, arguments, working_dir, icon_location,
+                icon_index, description)
+            progress: Optional callback called with each profile result
+
+        Returns:
+            (success_count, failed_count, results, stats) where results holds
+            one dict per profile and stats has totals and throughput
+        """
+        profiles = list(profiles)
+        prepared = self._prepare(shortcuts)
+        started = time.perf_counter()
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._deploy_profile, profile, prepared) for profile in profiles]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if progress:
+                    progress(result)
+
+        elapsed = time.perf_counter() - started
+        written = sum(result["written"] for result in results)
+        success_count = sum(1 for result in results if result["success"])
+        stats = {
+            "profiles": len(profiles),
+            "shortcuts_written": written,
+            "shortcuts_failed": sum(result["failed"] for result in results),
+            "seconds": elapsed,
+            "shortcuts_per_second": written / elapsed if elapsed > 0 else 0.0,
+            "profiles_per_second": len(profiles) / elapsed if elapsed > 0 else 0.0,
+        }
+        results.sort(key=lambda result: result["profile"])
+        return (success_count, len(results) - success_count, results, stats)
+
+
+def main():
+    """Command line entry point: deploy a manifest into every profile."""
+    parser = argparse.ArgumentParser(description="Deploy shortcuts into many user profiles")
+    parser.add_argument("manifest", help="JSON or TOML manifest (see shortcut_sync.py)")
+    parser.add_argument("--users-root", default="C:\\Users" if sys.platform == "win32" else "/home",
+                        help="Folder containing the user profiles")
+    parser.add_argument("--profile", action="append", help="Deploy only to this profile (repeatable)")
+    parser.add_argument("--workers", type=int, default=16, help="Total worker threads")
+    parser.add_argument("--per-volume", type=int, default=4, help="Concurrent profiles per volume")
+    args = parser.parse_args()
+
+    shortcuts = [entry for entry in load_manifest(args.manifest)["shortcuts"]
+                 if entry.get("scope", "user") == "user"]
+    profiles = args.profile or list_profiles(args.users_root)
+
+    def show_progress(result):
+        status = "OK" if result["success"] else "FAILED"
+        print(f"{status:<7} {result['profile']} ({result['written']} written, {result['seconds']:.3f}s)")
+        for error in result["errors"]:
+            print(f"        - {error}")
+
+    deployer = ProfileDeployer(args.workers, args.per_volume)
+    success_count, failed_count, results, stats = deployer.deploy(profiles, shortcuts, show_progress)
+
+    print(f"\n{success_count} profile(s) succeeded, {failed_count} failed")
+    print(f"{stats['shortcuts_written']} shortcut(s) written in {stats['seconds']:.2f}s "
+          f"({stats['shortcuts_per_second']:.0f} shortcuts/s, {stats['profiles_per_second']:.1f} profiles/s)")
+
+
+if __name__ == "__main__":
+    main()
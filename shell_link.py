@@ -0,0 +1,334 @@
+"""
+Start Menu Shortcut Creator - Native Shell Link Writer
+This module reads and writes Windows .lnk files (MS-SHLLINK) in pure Python,
+so shortcuts can be created without COM and on any operating system.
+"""
+import os
+import struct
+
+# ShellLinkHeader constants
+HEADER_SIZE = 0x4C
+LINK_CLSID = bytes.fromhex("0114020000000000C000000000000046")
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x00000001
+COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x00000002
+
+FILE_ATTRIBUTE_ARCHIVE = 0x00000020
+DRIVE_FIXED = 3
+SW_SHOWNORMAL = 1
+
+# Seconds between 1601-01-01 (FILETIME epoch) and 1970-01-01
+_FILETIME_EPOCH_OFFSET = 11644473600
+
+# Header layout: size, CLSID, flags, attributes, three FILETIMEs, file size,
+# icon index, show command, hotkey and three reserved fields
+_HEADER_FORMAT = "<I16sIIQQQIiIHHII"
+
+# Order of the optional StringData fields in the file
+_STRING_FIELDS = (
+    (HAS_NAME, "description"),
+    (HAS_RELATIVE_PATH, "relative_path"),
+    (HAS_WORKING_DIR, "working_dir"),
+    (HAS_ARGUMENTS, "arguments"),
+    (HAS_ICON_LOCATION, "icon_location"),
+)
+
+
+class ShellLinkError(Exception):
+    """Raised when a .lnk file cannot be parsed."""
+
+
+def _to_filetime(timestamp):
+    """Convert a Unix timestamp to a Windows FILETIME value."""
+    return int((timestamp + _FILETIME_EPOCH_OFFSET) * 10_000_000)
+
+
+def _ansi(text):
+    """Encode a string for the ANSI fields of a LinkInfo structure."""
+    return text.encode("cp1252", errors="replace") + b"\0"
+
+
+def _unicode(text):
+    """Encode a string for the Unicode fields of a LinkInfo structure."""
+    return text.encode("utf-16-le") + b"\0\0"
+
+
+def _build_link_info(target):
+    """
+    Build the LinkInfo structure that locates the target.
+
+    Local paths ("C:\\...") are stored as VolumeID plus LocalBasePath, UNC
+    paths ("\\\\server\\share\\...") as a CommonNetworkRelativeLink plus
+    CommonPathSuffix. Both carry Unicode copies of the path.
+    """
+    header_size = 0x24
+    if target.startswith("\\\\"):
+        parts = target.split("\\")
+        net_name = "\\".join(parts[:4])
+        suffix = "\\".join(parts[4:])
+        net_name_bytes = _ansi(net_name)
+        # Size, flags, NetNameOffset, DeviceNameOffset, NetworkProviderType
+        network_link = struct.pack("<IIIII", 0x14 + len(net_name_bytes), 0, 0x14, 0, 0) + net_name_bytes
+
+        network_offset = header_size
+        suffix_offset = network_offset + len(network_link)
+        suffix_bytes = _ansi(suffix)
+        suffix_unicode_offset = suffix_offset + len(suffix_bytes)
+        body = network_link + suffix_bytes + _unicode(suffix)
+        header = struct.pack(
+            "<IIIIIIIII",
+            header_size + len(body), header_size,
+            COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX,
+            0, 0, network_offset, suffix_offset,
+            0, suffix_unicode_offset
+        )
+        return header + body
+
+    # VolumeIDSize, DriveType, DriveSerialNumber, VolumeLabelOffset + empty label
+    volume_id = struct.pack("<IIII", 0x11, DRIVE_FIXED, 0, 0x10) + b"\0"
+    base_path = _ansi(target)
+    suffix = b"\0"
+
+    volume_offset = header_size
+    base_path_offset = volume_offset + len(volume_id)
+    suffix_offset = base_path_offset + len(base_path)
+    base_path_unicode_offset = suffix_offset + len(suffix)
+    base_path_unicode = _unicode(target)
+    suffix_unicode_offset = base_path_unicode_offset + len(base_path_unicode)
+    body = volume_id + base_path + suffix + base_path_unicode + _unicode("")
+    header = struct.pack(
+        "<IIIIIIIII",
+        header_size + len(body), header_size,
+        VOLUME_ID_AND_LOCAL_BASE_PATH,
+        volume_offset, base_path_offset, 0, suffix_offset,
+        base_path_unicode_offset, suffix_unicode_offset
+    )
+    return header + body
+
+
+def build_shortcut(target, working_dir=None, arguments=None, icon_location=None,
+                   icon_index=0, description=None, show_command=SW_SHOWNORMAL):
+    """
+    Build the bytes of a .lnk file.
+
+    Args:
+        target: Absolute Windows path of the shortcut target
+        working_dir: Optional working directory
+        arguments: Optional command line arguments
+        icon_location: Optional path of the icon file
+        icon_index: Index of the icon within icon_location
+        description: Optional comment shown as the shortcut tooltip
+        show_command: Window state used when launching the target
+
+    Returns:
+        The .lnk file contents as bytes
+    """
+    fields = {
+        "description": description,
+        "relative_path": None,
+        "working_dir": working_dir,
+        "arguments": arguments,
+        "icon_location": icon_location,
+    }
+
+    flags = HAS_LINK_INFO | IS_UNICODE
+    string_data = b""
+    for flag, key in _STRING_FIELDS:
+        value = fields[key]
+        if value:
+            flags |= flag
+            encoded = value.encode("utf-16-le")
+            string_data += struct.pack("<H", len(encoded) // 2) + encoded
+
+    # Record the target's size and timestamps when it is reachable from here
+    file_size = 0
+    creation_time = access_time = write_time = 0
+    try:
+        stat = os.stat(target)
+        file_size = stat.st_size & 0xFFFFFFFF
+        creation_time = _to_filetime(stat.st_ctime)
+        access_time = _to_filetime(stat.st_atime)
+        write_time = _to_filetime(stat.st_mtime)
+    except OSError:
+        pass
+
+    header = struct.pack(
+        _HEADER_FORMAT,
+        HEADER_SIZE, LINK_CLSID, flags, FILE_ATTRIBUTE_ARCHIVE,
+        creation_time, access_time, write_time,
+        file_size, icon_index, show_command, 0, 0, 0, 0
+    )
+
+    # A zero TerminalBlock ends the (empty) ExtraData section
+    return header + _build_link_info(target) + string_data + b"\0\0\0\0"
+
+
+def write_shortcut(shortcut_path, target, working_dir=None, arguments=None,
+                   icon_location=None, icon_index=0, description=None,
+                   show_command=SW_SHOWNORMAL):
+    """
+    Write a .lnk file to disk.
+
+    Args:
+        shortcut_path: Where to write the .lnk file
+        target: Absolute Windows path of the shortcut target
+        working_dir: Optional working directory
+        arguments: Optional command line arguments
+        icon_location: Optional path of the icon file
+        icon_index: Index of the icon within icon_location
+        description: Optional comment shown as the shortcut tooltip
+        show_command: Window state used when launching the target
+    """
+    data = build_shortcut(target, working_dir, arguments, icon_location,
+                          icon_index, description, show_command)
+    with open(shortcut_path, "wb") as f:
+        f.write(data)
+
+
+def _read_cstring(data, offset, unicode=False):
+    """Read a NUL-terminated string starting at offset."""
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        if end + 1 >= len(data):
+            raise ShellLinkError("Unterminated string in shell link")
+        return data[offset:end].decode("utf-16-le", errors="replace")
+    end = data.find(b"\0", offset)
+    if end < 0:
+        raise ShellLinkError("Unterminated string in shell link")
+    return data[offset:end].decode("cp1252", errors="replace")
+
+
+def parse_shortcut(data):
+    """
+    Parse the bytes of a .lnk file.
+
+    Args:
+        data: The .lnk file contents
+
+    Returns:
+        Dictionary with target, working_dir, arguments, icon_location,
+        icon_index, description and show_command
+    """
+    if len(data) < HEADER_SIZE:
+        raise ShellLinkError("File is too short to be a shell link")
+
+    header = struct.unpack_from(_HEADER_FORMAT, data)
+    if header[0] != HEADER_SIZE or header[1] != LINK_CLSID:
+        raise ShellLinkError("Not a shell link file")
+    try:
+        return _parse_shortcut_body(data, header)
+    except struct.error:
+        raise ShellLinkError("Shell link is truncated")
+
+
+def _parse_shortcut_body(data, header):
+    """Parse everything after the ShellLinkHeader."""
+    flags = header[2]
+    icon_index = header[8]
+    show_command = header[9]
+
+    offset = HEADER_SIZE
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        id_list_size = struct.unpack_from("<H", data, offset)[0]
+        offset += 2 + id_list_size
+
+    target = None
+    if flags & HAS_LINK_INFO:
+        target = _parse_link_info(data, offset)
+        offset += struct.unpack_from("<I", data, offset)[0]
+
+    result = {
+        "target": target,
+        "description": None,
+        "relative_path": None,
+        "working_dir": None,
+        "arguments": None,
+        "icon_location": None,
+        "icon_index": icon_index,
+        "show_command": show_command,
+    }
+    unicode = bool(flags & IS_UNICODE)
+    for flag, key in _STRING_FIELDS:
+        if flags & flag:
+            count = struct.unpack_from("<H", data, offset)[0]
+            offset += 2
+            if offset + count * (2 if unicode else 1) > len(data):
+                raise ShellLinkError("String data is truncated")
+            if unicode:
+                result[key] = data[offset:offset + count * 2].decode("utf-16-le")
+                offset += count * 2
+            else:
+                result[key] = data[offset:offset + count].decode("cp1252", errors="replace")
+                offset += count
+
+    # Links without LinkInfo can still be resolved through their relative path
+    if result["target"] is None and result["relative_path"] and result["working_dir"]:
+        result["target"] = os.path.normpath(os.path.join(result["working_dir"], result["relative_path"]))
+    return result
+
+
+def _parse_link_info(data, offset):
+    """Return the target path stored in a LinkInfo structure."""
+    (size, header_size, info_flags, volume_offset, base_path_offset,
+     network_offset, suffix_offset) = struct.unpack_from("<IIIIIII", data, offset)
+
+    base_path_unicode_offset = suffix_unicode_offset = 0
+    if header_size >= 0x24:
+        base_path_unicode_offset, suffix_unicode_offset = struct.unpack_from("<II", data, offset + 0x1C)
+
+    if suffix_unicode_offset:
+        suffix = _read_cstring(data, offset + suffix_unicode_offset, unicode=True)
+    else:
+        suffix = _read_cstring(data, offset + suffix_offset)
+
+    if info_flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if base_path_unicode_offset:
+            base_path = _read_cstring(data, offset + base_path_unicode_offset, unicode=True)
+        else:
+            base_path = _read_cstring(data, offset + base_path_offset)
+        return base_path + suffix
+
+    if info_flags & COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX:
+        network_start = offset + network_offset
+        net_name_offset = struct.unpack_from("<I", data, network_start + 8)[0]
+        net_name = _read_cstring(data, network_start + net_name_offset)
+        return f"{net_name}\\{suffix}" if suffix else net_name
+
+    return None
+
+
+def read_shortcut(shortcut_path):
+    """
+    Read a .lnk file from disk.
+
+    Args:
+        shortcut_path: Path to the .lnk file
+
+    Returns:
+        Dictionary as returned by parse_shortcut
+    """
+    with open(shortcut_path, "rb") as f:
+        return parse_shortcut(f.read())
+
+
+def is_shell_link(shortcut_path):
+    """Check whether a file starts with a shell link header."""
+    try:
+        with open(shortcut_path, "rb") as f:
+            header = f.read(20)
+    except OSError:
+        return False
+    return header[:4] == struct.pack("<I", HEADER_SIZE) and header[4:20] == LINK_CLSID
@@ -6,12 +6,30 @@ import pythoncom
 from win32com.client import Dispatch
 import win32com.shell.shell as shell
 import win32com.shell.shellcon as shellcon
-import win32api
 import win32con
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from shell_link import write_shortcut
+from pe_file import read_exe_info, validate_pe
+
+# Available shortcut writing backends
+BACKENDS = ("com", "native")
 
 class ShortcutCreator:
-    def __init__(self):
+    def __init__(self, backend="com", metadata_cache=None):
+        """
+        Initialize the ShortcutCreator.
+        
+        Args:
+            backend: "com" to write shortcuts through WScript.Shell, or
+                "native" to write .lnk files directly without COM
+            metadata_cache: Optional MetadataCache used for exe info and
+                validation results
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown shortcut backend: {backend}")
+        self.backend = backend
+        self.metadata_cache = metadata_cache
         self.common_start_menu = self._get_common_start_menu_path()
         self.user_start_menu = self._get_user_start_menu_path()
     
@@ -40,6 +58,12 @@ class ShortcutCreator:
 
     def is_valid_exe(self, file_path):
         """Verify that the file is a valid Windows executable."""
+        if self.metadata_cache is not None:
+            return self.metadata_cache.get_or_compute(file_path, "valid", self._check_exe)
+        return self._check_exe(file_path)
+    
+    def _check_exe(self, file_path):
+        """Check the file extension and header of an executable."""
         if not os.path.exists(file_path):
             return False
         
@@ -47,58 +71,71 @@ class ShortcutCreator:
         if not file_path.lower().endswith(('.exe', '.bat', '.cmd', '.msi')):
             return False
         
-        # For .exe files, do additional verification
+        # For .exe files, check the PE headers and section bounds
         if file_path.lower().endswith('.exe'):
-            try:
-                # Check if it has a valid PE header
-                with open(file_path, 'rb') as f:
-                    header = f.read(2)
-                    return header == b'MZ'  # Valid PE files start with 'MZ'
-            except Exception:
-                return False
+            return validate_pe(file_path)["valid"]
         
         return True
     
     def get_exe_info(self, exe_path):
-        """Extract version info from an executable."""
-        try:
-            # Get file info
-            info = win32api.GetFileVersionInfo(exe_path, '\\')
-            ms = info['FileVersionMS']
-            ls = info['FileVersionLS']
-            version = f"{win32api.HIWORD(ms)}.{win32api.LOWORD(ms)}.{win32api.HIWORD(ls)}.{win32api.LOWORD(ls)}"
-            
-            # Get string file info
-            string_file_info = {}
-            try:
-                lang, codepage = win32api.GetFileVersionInfo(exe_path, '\\VarFileInfo\\Translation')[0]
-                str_info_path = f'\\StringFileInfo\\{lang:04x}{codepage:04x}\\%s'
-                
-                for info_name in ['FileDescription', 'ProductName', 'CompanyName']:
-                    try:
-                        string_file_info[info_name] = win32api.GetFileVersionInfo(exe_path, str_info_path % info_name)
-                    except:
-                        string_file_info[info_name] = ""
-            except:
-                pass
+        """
+        Extract version info from an executable.
+        
+        The version resource is decoded in one pass from a memory map of the
+        file instead of one GetFileVersionInfo call per field.
+        """
+        if self.metadata_cache is not None:
+            return self.metadata_cache.get_or_compute(exe_path, "exe_info", read_exe_info)
+        return read_exe_info(exe_path)
+    
+    def _get_target_dir(self, for_all_users, folder=None, known_dirs=None):
+        """
+        Resolve (and create if needed) the Start Menu folder for a shortcut.
+        
+        Args:
+            for_all_users: If True, use the All Users Start Menu
+            folder: Optional subfolder within Start Menu Programs
+            known_dirs: Optional set of directories already known to exist,
+                used to skip repeated existence checks during batch creation
             
-            return {
-                'version': version,
-                'description': string_file_info.get('FileDescription', ''),
-                'product_name': string_file_info.get('ProductName', ''),
-                'company': string_file_info.get('CompanyName', ''),
-                'suggested_name': string_file_info.get('ProductName', os.path.splitext(os.path.basename(exe_path))[0])
-            }
-        except Exception as e:
-            # If we can't get version info, just return basic info
-            basename = os.path.splitext(os.path.basename(exe_path))[0]
-            return {
-                'version': '',
-                'description': '',
-                'product_name': '',
-                'company': '',
-                'suggested_name': basename
-            }
+        Returns:
+            Path to the target directory
+        """
+        start_menu_path = self.common_start_menu if for_all_users else self.user_start_menu
+        if not folder:
+            return start_menu_path
+        
+        target_dir = os.path.join(start_menu_path, folder)
+        if known_dirs is not None and target_dir in known_dirs:
+            return target_dir
+        
+        os.makedirs(target_dir, exist_ok=True)
+        if known_dirs is not None:
+            known_dirs.add(target_dir)
+        return target_dir
+    
+    def _save_shortcut(self, shell_object, exe_path, shortcut_path):
+        """
+        Write a single .lnk file.
+        
+        With the COM backend this goes through an existing WScript.Shell
+        object; the native backend ignores shell_object.
+        """
+        if self.backend == "native":
+            write_shortcut(
+                shortcut_path,
+                exe_path,
+                working_dir=os.path.dirname(exe_path),
+                icon_location=exe_path,
+                icon_index=0
+            )
+            return
+        
+        shortcut = shell_object.CreateShortCut(shortcut_path)
+        shortcut.Targetpath = exe_path
+        shortcut.WorkingDirectory = os.path.dirname(exe_path)
+        shortcut.IconLocation = f"{exe_path},0"  # Use first icon from the exe
+        shortcut.save()
     
     def create_shortcut(self, exe_path, shortcut_name, for_all_users=False, folder=None):
         """
@@ -113,25 +150,18 @@ class ShortcutCreator:
         Returns:
             (success, message) tuple
         """
+        uses_com = self.backend == "com"
         try:
             # Initialize COM
-            pythoncom.CoInitialize()
+            if uses_com:
+                pythoncom.CoInitialize()
             
             # Select the appropriate Start Menu path
-            if for_all_users:
-                if not self.is_admin():
-                    return False, "Administrator privileges required to create shortcuts for all users."
-                start_menu_path = self.common_start_menu
-            else:
-                start_menu_path = self.user_start_menu
+            if for_all_users and not self.is_admin():
+                return False, "Administrator privileges required to create shortcuts for all users."
             
             # Create target folder if specified
-            if folder:
-                target_dir = os.path.join(start_menu_path, folder)
-                if not os.path.exists(target_dir):
-                    os.makedirs(target_dir)
-            else:
-                target_dir = start_menu_path
+            target_dir = self._get_target_dir(for_all_users, folder)
             
             # Ensure valid shortcut name
             if not shortcut_name.endswith('.lnk'):
@@ -141,12 +171,8 @@ class ShortcutCreator:
             shortcut_path = os.path.join(target_dir, shortcut_name)
             
             # Create the shortcut
-            shell_object = Dispatch('WScript.Shell')
-            shortcut = shell_object.CreateShortCut(shortcut_path)
-            shortcut.Targetpath = exe_path
-            shortcut.WorkingDirectory = os.path.dirname(exe_path)
-            shortcut.IconLocation = f"{exe_path},0"  # Use first icon from the exe
-            shortcut.save()
+            shell_object = Dispatch('WScript.Shell') if uses_com else None
+            self._save_shortcut(shell_object, exe_path, shortcut_path)
             
             return True, f"Shortcut created successfully at:\n{shortcut_path}"
             
@@ -157,4 +183,79 @@ class ShortcutCreator:
         
         finally:
             # Clean up COM
-            pythoncom.CoUninitialize()
+            if uses_com:
+                pythoncom.CoUninitialize()
+    
+    def create_shortcuts(self, specs, max_workers=1):
+        """
+        Create many shortcuts in one batch.
+        
+        With the COM backend, COM is initialized once per worker thread and
+        each worker reuses a single WScript.Shell object for all of its
+        shortcuts; the native backend needs no COM at all. Directories
+        that have already been created are remembered for the whole batch.
+        
+        Args:
+            specs: Iterable of dicts with the create_shortcut arguments
+                ("exe_path", "shortcut_name", and optionally "for_all_users"
+                and "folder")
+            max_workers: Number of worker threads writing shortcuts
+            
+        Returns:
+            (success_count, failed_count, results) where results holds one
+            dict per spec, in input order
+        """
+        specs = list(specs)
+        results = [None] * len(specs)
+        known_dirs = set()
+        is_admin = None
+        if any(spec.get('for_all_users') for spec in specs):
+            is_admin = self.is_admin()
+        
+        uses_com = self.backend == "com"
+        
+        def run_chunk(indices):
+            if uses_com:
+                pythoncom.CoInitialize()
+            try:
+                shell_object = Dispatch('WScript.Shell') if uses_com else None
+                for index in indices:
+                    results[index] = self._create_from_spec(shell_object, specs[index], known_dirs, is_admin)
+            finally:
+                if uses_com:
+                    pythoncom.CoUninitialize()
+        
+        max_workers = max(1, min(max_workers, len(specs)))
+        chunks = [range(start, len(specs), max_workers) for start in range(max_workers)]
+        if max_workers == 1:
+            run_chunk(chunks[0])
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # list() re-raises any exception from a worker
+                list(executor.map(run_chunk, chunks))
+        
+        success_count = sum(1 for result in results if result["success"])
+        return (success_count, len(results) - success_count, results)
+    
+    def _create_from_spec(self, shell_object, spec, known_dirs, is_admin):
+        """Create one shortcut of a batch and return its result dict."""
+        exe_path = spec["exe_path"]
+        shortcut_name = spec["shortcut_name"]
+        if not shortcut_name.endswith('.lnk'):
+            shortcut_name += '.lnk'
+        result = {"name": shortcut_name, "path": None, "success": False, "message": ""}
+        
+        try:
+            if spec.get("for_all_users") and not is_admin:
+                result["message"] = "Administrator privileges required to create shortcuts for all users."
+                return result
+            
+            target_dir = self._get_target_dir(spec.get("for_all_users", False), spec.get("folder"), known_dirs)
+            shortcut_path = os.path.join(target_dir, shortcut_name)
+            self._save_shortcut(shell_object, exe_path, shortcut_path)
+            
+            result.update(path=shortcut_path, success=True,
+                          message=f"Shortcut created successfully at:\n{shortcut_path}")
+        except Exception as e:
+            result["message"] = f"Error creating shortcut: {e}"
+        return result
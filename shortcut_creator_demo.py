@@ -3,11 +3,101 @@ Start Menu Shortcut Creator - Demo Version
 This module simulates the Windows shortcut creation functionality.
 """
 import os
+import ntpath
 import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from shell_link import write_shortcut, build_shortcut
+from pe_file import read_exe_info, validate_pe
+
+# Available shortcut writing backends
+BACKENDS = ("simulate", "native", "memory")
+
+# Latency distributions and the parameters they take (all in seconds)
+DISTRIBUTIONS = {
+    "fixed": ("delay",),
+    "uniform": ("low", "high"),
+    "exponential": ("mean",),
+    "lognormal": ("median", "sigma"),
+}
+
+class LatencyModel:
+    """Latency and failure model for simulated shortcut creation."""
+    def __init__(self, distribution="fixed", params=(1.0,), error_rate=0.0, seed=None):
+        """
+        Initialize the model.
+        
+        Args:
+            distribution: One of "fixed", "uniform", "exponential" or "lognormal"
+            params: Distribution parameters, see DISTRIBUTIONS
+            error_rate: Probability (0-1) that a call fails
+            seed: Optional random seed for reproducible runs
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        if len(params) != len(DISTRIBUTIONS[distribution]):
+            raise ValueError(f"'{distribution}' takes parameters {DISTRIBUTIONS[distribution]}")
+        self.distribution = distribution
+        self.params = tuple(float(param) for param in params)
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def parse(cls, spec, error_rate=0.0, seed=None):
+        """
+        Build a model from a string such as "fixed:0.01" or "lognormal:0.02,0.5".
+        """
+        distribution, _, params = spec.partition(":")
+        values = [value for value in params.split(",") if value] if params else []
+        return cls(distribution, values, error_rate, seed)
+    
+    def sample(self):
+        """Draw the latency of one call in seconds."""
+        with self._lock:
+            if self.distribution == "fixed":
+                return self.params[0]
+            if self.distribution == "uniform":
+                return self._random.uniform(*self.params)
+            if self.distribution == "exponential":
+                return self._random.expovariate(1.0 / self.params[0]) if self.params[0] > 0 else 0.0
+            median, sigma = self.params
+            return self._random.lognormvariate(0.0, sigma) * median
+    
+    def should_fail(self):
+        """Decide whether one call fails."""
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
 
 class ShortcutCreator:
-    def __init__(self):
-        """Initialize the ShortcutCreator with simulated paths."""
+    def __init__(self, backend="simulate", metadata_cache=None, latency_model=None, verbose=True):
+        """
+        Initialize the ShortcutCreator with simulated paths.
+        
+        Args:
+            backend: "simulate" to only print what would happen, "native"
+                to write real .lnk files under the simulated Start Menu paths,
+                or "memory" to keep the .lnk bytes in memory_fs
+            metadata_cache: Optional MetadataCache used for exe info of
+                files that exist on disk
+            latency_model: Optional LatencyModel applied to every shortcut;
+                the "simulate" backend defaults to a fixed 1 second delay
+            verbose: If False, the simulation does not print its steps
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown shortcut backend: {backend}")
+        self.backend = backend
+        self.metadata_cache = metadata_cache
+        if latency_model is None and backend == "simulate":
+            latency_model = LatencyModel("fixed", (1.0,))
+        self.latency_model = latency_model
+        self.verbose = verbose
+        # In-memory file system of the "memory" backend: path -> .lnk bytes
+        self.memory_fs = {}
+        self._memory_lock = threading.Lock()
         # Simulated paths for demonstration
         self.user_start_menu = os.path.expanduser("~/.start_menu")
         self.common_start_menu = "/usr/local/share/applications"  # Simulation
@@ -30,14 +120,28 @@ class ShortcutCreator:
         
     def is_valid_exe(self, file_path):
         """Verify that the file is a valid Windows executable."""
-        # In a real environment, we would check file headers, etc.
         valid_extensions = ['.exe', '.bat', '.cmd', '.msi']
-        return any(file_path.lower().endswith(ext) for ext in valid_extensions)
+        if not any(file_path.lower().endswith(ext) for ext in valid_extensions):
+            return False
+        
+        # Files that really exist get the full PE header check;
+        # simulated paths are accepted on their extension alone
+        if file_path.lower().endswith('.exe') and os.path.isfile(file_path):
+            return validate_pe(file_path)["valid"]
+        return True
         
     def get_exe_info(self, exe_path):
         """Extract version info from an executable."""
-        # In a real environment, we would use win32api to get file version info
-        # For demo purposes, return simulated info based on the filename
+        # Real executables carry a version resource that can be read on any OS
+        if os.path.isfile(exe_path):
+            if self.metadata_cache is not None:
+                exe_info = self.metadata_cache.get_or_compute(exe_path, "exe_info", read_exe_info)
+            else:
+                exe_info = read_exe_info(exe_path)
+            if exe_info['version']:
+                return exe_info
+        
+        # Otherwise return simulated info based on the filename
         
         # Extract filename without path and extension
         filename = os.path.basename(exe_path)
@@ -118,18 +222,89 @@ class ShortcutCreator:
         else:
             target_dir = base_path
             
+        # Ensure valid shortcut name
+        file_name = shortcut_name
+        if not file_name.endswith('.lnk'):
+            file_name += '.lnk'
+            
         # Simulate shortcut creation
         # In Windows, this would use win32com.client to create a .lnk file
-        shortcut_path = os.path.join(target_dir, f"{shortcut_name}.lnk")
+        shortcut_path = os.path.join(target_dir, file_name)
         
         # Simulate a delay for "processing"
-        print(f"Creating shortcut '{shortcut_name}.lnk'...")
-        time.sleep(1)
+        if self.verbose and self.backend == "simulate":
+            print(f"Creating shortcut '{file_name}'...")
+        if self.latency_model is not None:
+            delay = self.latency_model.sample()
+            if delay > 0:
+                time.sleep(delay)
+            if self.latency_model.should_fail():
+                return False, f"Simulated failure while creating shortcut '{file_name}'."
+        
+        if self.backend == "memory":
+            data = build_shortcut(exe_path, working_dir=ntpath.dirname(exe_path),
+                                  icon_location=exe_path, icon_index=0)
+            with self._memory_lock:
+                self.memory_fs[shortcut_path] = data
+            return True, f"Shortcut created successfully at:\n{shortcut_path}"
+        
+        if self.backend == "native":
+            try:
+                os.makedirs(target_dir, exist_ok=True)
+                write_shortcut(
+                    shortcut_path,
+                    exe_path,
+                    working_dir=ntpath.dirname(exe_path),
+                    icon_location=exe_path,
+                    icon_index=0
+                )
+            except OSError as e:
+                return False, f"Error creating shortcut: {e}"
+            return True, f"Shortcut created successfully at:\n{shortcut_path}"
         
         # In demo mode, we'd normally create directories and files
         # For simulation, just print information
-        print(f"SIMULATION: Would create directory: {target_dir}")
-        print(f"SIMULATION: Would create shortcut: {shortcut_path}")
-        print(f"SIMULATION: Would link to executable: {exe_path}")
+        if self.verbose:
+            print(f"SIMULATION: Would create directory: {target_dir}")
+            print(f"SIMULATION: Would create shortcut: {shortcut_path}")
+            print(f"SIMULATION: Would link to executable: {exe_path}")
+        
+        return True, f"Successfully created shortcut '{shortcut_name}' in the Start Menu."
+    
+    def create_shortcuts(self, specs, max_workers=4):
+        """
+        Simulate creating many shortcuts in one batch.
+        
+        Args:
+            specs: Iterable of dicts with the create_shortcut arguments
+                ("exe_path", "shortcut_name", and optionally "for_all_users"
+                and "folder")
+            max_workers: Number of worker threads used for the simulation
+            
+        Returns:
+            (success_count, failed_count, results) where results holds one
+            dict per spec, in input order
+        """
+        specs = list(specs)
+        
+        def run(spec):
+            shortcut_name = spec["shortcut_name"]
+            if not shortcut_name.endswith('.lnk'):
+                shortcut_name += '.lnk'
+            success, message = self.create_shortcut(
+                spec["exe_path"],
+                spec["shortcut_name"],
+                spec.get("for_all_users", False),
+                spec.get("folder")
+            )
+            return {
+                "name": shortcut_name,
+                "success": success,
+                "message": message
+            }
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(run, specs))
         
-        return True, f"Successfully created shortcut '{shortcut_name}' in the Start Menu."
\ No newline at end of file
+        success_count = sum(1 for result in results if result["success"])
+        return (success_count, len(results) - success_count, results)
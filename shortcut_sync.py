@@ -0,0 +1,352 @@
+"""
+Start Menu Shortcut Creator - Manifest Sync
+This module deploys a declarative list of shortcuts (JSON or TOML manifest)
+and only creates, updates or deletes what differs from the current Start Menu.
+
+Example manifest (JSON):
+
+    {
+        "managed_folders": {"user": ["Tools"]},
+        "shortcuts": [
+            {"name": "Notepad++", "target": "C:\\\\Program Files\\\\Notepad++\\\\notepad++.exe",
+             "scope": "user", "folder": "Tools"}
+        ]
+    }
+
+Shortcuts found in a managed folder that are not listed in the manifest are
+deleted. Only folders listed under "managed_folders" are pruned this way; use
+"" for the Start Menu Programs root itself.
+"""
+import os
+import sys
+import json
+import ntpath
+import hashlib
+import argparse
+from shell_link import write_shortcut, read_shortcut, ShellLinkError
+
+SCOPES = ("user", "common")
+
+# Shortcut fields that make up the desired state of a .lnk file
+SPEC_FIELDS = ("target", "working_dir", "arguments", "icon_location", "icon_index", "description")
+
+
+def load_manifest(manifest_path):
+    """
+    Load a JSON or TOML manifest.
+
+    Args:
+        manifest_path: Path to a .json or .toml file
+
+    Returns:
+        Dictionary with "shortcuts" and "managed_folders" keys
+
+    Raises:
+        ValueError: If the manifest is malformed (see validate_manifest)
+    """
+    if manifest_path.lower().endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise RuntimeError("TOML manifests require Python 3.11 or newer")
+        with open(manifest_path, "rb") as f:
+            manifest = tomllib.load(f)
+    else:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    manifest.setdefault("shortcuts", [])
+    manifest.setdefault("managed_folders", {})
+    validate_manifest(manifest)
+    return manifest
+
+
+def validate_manifest(manifest):
+    """
+    Check the structure of a manifest before anything is planned from it.
+
+    Managed folders are pruned, so a typo must not widen what gets deleted:
+    their scopes must be in SCOPES and each scope must map to a list of
+    folder names relative to that scope's Programs folder.
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    if not isinstance(manifest.get("shortcuts"), list):
+        raise ValueError("Manifest \"shortcuts\" must be a list")
+    managed_folders = manifest.get("managed_folders")
+    if not isinstance(managed_folders, dict):
+        raise ValueError("Manifest \"managed_folders\" must map scopes to lists of folders")
+    for scope, folders in managed_folders.items():
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope '{scope}' in managed_folders (expected one of {', '.join(SCOPES)})")
+        if not isinstance(folders, list) or not all(isinstance(folder, str) for folder in folders):
+            raise ValueError(f"managed_folders['{scope}'] must be a list of folder names")
+        for folder in folders:
+            if ntpath.isabs(folder) or os.path.isabs(folder) or ".." in folder.replace("\\", "/").split("/"):
+                raise ValueError(f"Managed folder '{folder}' must be relative to the Programs folder")
+
+
+def normalize_spec(spec):
+    """
+    Fill in defaults for a manifest shortcut entry.
+
+    The defaults match what ShortcutCreator.create_shortcut writes: the
+    working directory is the target's folder and the icon is the target's
+    first icon.
+    """
+    if not spec.get("name") or not spec.get("target"):
+        raise ValueError(f"Manifest entry needs a name and a target: {spec}")
+    scope = spec.get("scope", "user")
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope '{scope}' for shortcut {spec['name']}")
+
+    name = spec["name"]
+    if name.lower().endswith(".lnk"):
+        name = name[:-4]
+    target = spec["target"]
+    return {
+        "name": name,
+        "scope": scope,
+        "folder": spec.get("folder") or "",
+        "target": target,
+        "working_dir": spec.get("working_dir", ntpath.dirname(target)) or None,
+        "arguments": spec.get("arguments") or None,
+        "icon_location": spec.get("icon_location", target) or None,
+        "icon_index": int(spec.get("icon_index", 0)),
+        "description": spec.get("description") or None,
+    }
+
+
+def spec_fingerprint(spec):
+    """Return a stable hash of the fields written into the .lnk file."""
+    payload = json.dumps([spec[field] for field in SPEC_FIELDS])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ShortcutSync:
+    def __init__(self, shortcut_creator, state_path=None):
+        """
+        Initialize the sync engine.
+
+        Args:
+            shortcut_creator: ShortcutCreator (real or demo) providing the
+                Start Menu paths and the admin check
+            state_path: JSON file remembering what the last apply wrote
+        """
+        self.shortcut_creator = shortcut_creator
+        self.state_path = state_path or os.path.expanduser("~/.shortcut_sync_state.json")
+        self.state = self._load_state()
+
+    def _load_state(self):
+        """Load the size/mtime/fingerprint records of previously synced shortcuts."""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        """Persist the sync state atomically."""
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.state_path)
+
+    def _scope_root(self, scope):
+        """Get the Start Menu Programs folder for a scope."""
+        if scope == "common":
+            return self.shortcut_creator.common_start_menu
+        if scope == "user":
+            return self.shortcut_creator.user_start_menu
+        raise ValueError(f"Unknown scope '{scope}'")
+
+    def _scan(self, directory):
+        """Return {normalized path: (path, size, mtime_ns)} for the .lnk files in a folder."""
+        found = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith(".lnk") and entry.is_file():
+                        stat = entry.stat()
+                        found[os.path.normcase(entry.path)] = (entry.path, stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return found
+
+    def _is_current(self, path, size, mtime_ns, spec, fingerprint):
+        """
+        Check whether an existing shortcut already matches its spec.
+
+        The state file answers this from size and mtime alone; the .lnk is
+        only opened and parsed when the state has no matching record.
+        """
+        key = os.path.normcase(path)
+        record = self.state.get(key)
+        if record and record == [size, mtime_ns, fingerprint]:
+            return True
+
+        try:
+            current = read_shortcut(path)
+        except (OSError, ShellLinkError, ValueError):
+            return False
+
+        for field in SPEC_FIELDS:
+            if current.get(field) != spec[field]:
+                return False
+        self.state[key] = [size, mtime_ns, fingerprint]
+        return True
+
+    def plan(self, manifest):
+        """
+        Compare a manifest with the Start Menu.
+
+        Args:
+            manifest: Dictionary as returned by load_manifest
+
+        Returns:
+            List of action dicts with "action" ("create", "update" or
+            "delete"), "path" and "spec" (None for deletions)
+
+        Raises:
+            ValueError: If the manifest is malformed
+        """
+        validate_manifest(manifest)
+        desired = {}
+        folders = {}
+        for entry in manifest["shortcuts"]:
+            spec = normalize_spec(entry)
+            directory = os.path.join(self._scope_root(spec["scope"]), spec["folder"]) \
+                if spec["folder"] else self._scope_root(spec["scope"])
+            path = os.path.join(directory, spec["name"] + ".lnk")
+            desired[os.path.normcase(path)] = (path, spec)
+            # Only folders listed in managed_folders are pruned
+            folders.setdefault(directory, False)
+
+        for scope, managed in manifest["managed_folders"].items():
+            for folder in managed:
+                directory = os.path.join(self._scope_root(scope), folder) if folder else self._scope_root(scope)
+                folders[directory] = True
+
+        existing = {}
+        managed_existing = set()
+        for directory, managed in folders.items():
+            found = self._scan(directory)
+            existing.update(found)
+            if managed:
+                managed_existing.update(found)
+
+        actions = []
+        for key, (path, spec) in desired.items():
+            if key not in existing:
+                actions.append({"action": "create", "path": path, "spec": spec})
+                continue
+            _, size, mtime_ns = existing[key]
+            if not self._is_current(path, size, mtime_ns, spec, spec_fingerprint(spec)):
+                actions.append({"action": "update", "path": path, "spec": spec})
+
+        for key in sorted(managed_existing - set(desired)):
+            actions.append({"action": "delete", "path": existing[key][0], "spec": None})
+
+        return actions
+
+    def apply(self, actions):
+        """
+        Execute the actions returned by plan.
+
+        Args:
+            actions: List of action dicts
+
+        Returns:
+            (success_count, failed_count, results)
+        """
+        success_count = 0
+        failed_count = 0
+        results = []
+        is_admin = None
+        known_dirs = set()
+
+        for action in actions:
+            path = action["path"]
+            spec = action["spec"]
+            result = {"name": os.path.basename(path), "path": path, "action": action["action"],
+                      "success": False, "message": ""}
+
+            try:
+                scope_is_common = os.path.normcase(path).startswith(os.path.normcase(self._scope_root("common")))
+                if scope_is_common:
+                    if is_admin is None:
+                        is_admin = self.shortcut_creator.is_admin()
+                    if not is_admin:
+                        raise PermissionError("Administrator privileges required to change shortcuts for all users.")
+
+                if action["action"] == "delete":
+                    os.remove(path)
+                    self.state.pop(os.path.normcase(path), None)
+                    result["message"] = "Deleted"
+                else:
+                    directory = os.path.dirname(path)
+                    if directory not in known_dirs:
+                        os.makedirs(directory, exist_ok=True)
+                        known_dirs.add(directory)
+                    write_shortcut(
+                        path,
+                        spec["target"],
+                        working_dir=spec["working_dir"],
+                        arguments=spec["arguments"],
+                        icon_location=spec["icon_location"],
+                        icon_index=spec["icon_index"],
+                        description=spec["description"]
+                    )
+                    stat = os.stat(path)
+                    self.state[os.path.normcase(path)] = [stat.st_size, stat.st_mtime_ns, spec_fingerprint(spec)]
+                    result["message"] = "Created" if action["action"] == "create" else "Updated"
+
+                result["success"] = True
+                success_count += 1
+            except Exception as e:
+                result["message"] = f"Error: {e}"
+                failed_count += 1
+
+            results.append(result)
+
+        self._save_state()
+        return (success_count, failed_count, results)
+
+
+def main():
+    """Command line entry point: plan (and optionally apply) a manifest."""
+    parser = argparse.ArgumentParser(description="Sync Start Menu shortcuts with a manifest")
+    parser.add_argument("manifest", help="JSON or TOML manifest of desired shortcuts")
+    parser.add_argument("--apply", action="store_true", help="Apply the changes instead of only listing them")
+    parser.add_argument("--state", help="Path of the sync state file")
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        from shortcut_creator import ShortcutCreator
+    else:
+        from shortcut_creator_demo import ShortcutCreator
+
+    sync = ShortcutSync(ShortcutCreator(), args.state)
+    actions = sync.plan(load_manifest(args.manifest))
+    # Planning records shortcuts it verified as current; keep that even if nothing changes
+    sync._save_state()
+
+    if not actions:
+        print("Start Menu already matches the manifest.")
+        return
+    for action in actions:
+        print(f"{action['action']:>6}  {action['path']}")
+
+    if args.apply:
+        success_count, failed_count, results = sync.apply(actions)
+        print(f"\nApplied: {success_count} succeeded, {failed_count} failed")
+        for result in results:
+            if not result["success"]:
+                print(f"- {result['name']} - {result['message']}")
+    else:
+        print(f"\n{len(actions)} change(s) planned. Re-run with --apply to make them.")
+
+
+if __name__ == "__main__":
+    main()
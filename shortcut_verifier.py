@@ -6,6 +6,7 @@ import os
 import sys
 import time
 from pathlib import Path
+from shell_link import is_shell_link, read_shortcut
 
 class ShortcutVerifier:
     def __init__(self):
@@ -65,8 +66,16 @@ class ShortcutVerifier:
         Returns:
             List of shortcut paths
         """
-        shortcuts = []
+        return list(self.iter_shortcuts(location, subfolder))
+
+    def iter_shortcuts(self, location="both", subfolder=None):
+        """
+        Yield shortcut paths in the Start Menu as the folders are walked.
         
+        Args:
+            location: "user", "common", or "both"
+            subfolder: Optional subfolder within the Start Menu
+        """
         locations = []
         if location in ["user", "both"]:
             locations.append(self.user_start_menu)
@@ -85,21 +94,13 @@ class ShortcutVerifier:
                 continue
                 
             # In demo mode, we might not have actual shortcuts
-            if sys.platform == "win32":
-                # On real Windows, find .lnk files
-                for root, dirs, files in os.walk(search_path):
-                    for file in files:
-                        if file.lower().endswith(".lnk"):
-                            shortcuts.append(os.path.join(root, file))
-            else:
+            if sys.platform != "win32":
                 # In demo mode, create some simulated shortcuts
                 self._create_demo_shortcuts(search_path)
-                for root, dirs, files in os.walk(search_path):
-                    for file in files:
-                        if file.lower().endswith(".lnk"):
-                            shortcuts.append(os.path.join(root, file))
-                
-        return shortcuts
+            for root, dirs, files in os.walk(search_path):
+                for file in files:
+                    if file.lower().endswith(".lnk"):
+                        yield os.path.join(root, file)
 
     def _create_demo_shortcuts(self, path):
         """Create simulated shortcuts for demo purposes."""
@@ -144,6 +145,13 @@ class ShortcutVerifier:
             except Exception as e:
                 print(f"Error reading shortcut: {e}")
                 return None
+        elif is_shell_link(shortcut_path):
+            # Real .lnk files (e.g. from the native backend) can be parsed anywhere
+            try:
+                return read_shortcut(shortcut_path)["target"]
+            except Exception as e:
+                print(f"Error reading shortcut: {e}")
+                return None
         else:
             # In demo mode, read from our simulated shortcut file
             try:
@@ -176,9 +184,9 @@ class ShortcutVerifier:
             # In demo mode, check for "BROKEN=True" in our simulated data
             return not "NonExistent" in target_path and not "Missing" in target_path
 
-    def verify_shortcut(self, shortcut_path):
+    def check_shortcut(self, shortcut_path):
         """
-        Verify if a shortcut is valid (target exists).
+        Check if a shortcut is valid without recording the result.
         
         Args:
             shortcut_path: Path to the shortcut
@@ -191,14 +199,51 @@ class ShortcutVerifier:
         if not target_path:
             return (False, None, "Unable to read shortcut target")
             
-        is_valid = self.is_target_valid(target_path)
+        if self.is_target_valid(target_path):
+            return (True, target_path, None)
+        return (False, target_path, "Target file does not exist")
+
+    def verify_shortcut(self, shortcut_path):
+        """
+        Verify if a shortcut is valid (target exists).
+        
+        Args:
+            shortcut_path: Path to the shortcut
+            
+        Returns:
+            (is_valid, target_path, error_message)
+        """
+        is_valid, target_path, error_message = self.check_shortcut(shortcut_path)
         
         if is_valid:
             self.verified_shortcuts.append((shortcut_path, target_path))
-            return (True, target_path, None)
-        else:
+        elif target_path:
             self.broken_shortcuts.append((shortcut_path, target_path))
-            return (False, target_path, "Target file does not exist")
+        return (is_valid, target_path, error_message)
+
+    def iter_verify_shortcuts(self, location="both", subfolder=None, record=True):
+        """
+        Verify shortcuts one at a time while the Start Menu is being walked.
+        
+        Args:
+            location: "user", "common", or "both"
+            subfolder: Optional subfolder within the Start Menu
+            record: If False, results are not kept in verified_shortcuts and
+                broken_shortcuts (for callers that store them themselves)
+            
+        Yields:
+            Dictionary with name, path, target, valid and error
+        """
+        verify = self.verify_shortcut if record else self.check_shortcut
+        for shortcut_path in self.iter_shortcuts(location, subfolder):
+            is_valid, target_path, error_message = verify(shortcut_path)
+            yield {
+                "name": os.path.basename(shortcut_path),
+                "path": shortcut_path,
+                "target": target_path,
+                "valid": is_valid,
+                "error": error_message
+            }
 
     def verify_all_shortcuts(self, location="both", subfolder=None):
         """
@@ -211,24 +256,14 @@ class ShortcutVerifier:
         Returns:
             (valid_count, broken_count, shortcuts_info)
         """
-        shortcuts = self.find_shortcuts(location, subfolder)
         valid_count = 0
         broken_count = 0
         shortcuts_info = []
         
-        for shortcut_path in shortcuts:
-            is_valid, target_path, error_message = self.verify_shortcut(shortcut_path)
-            shortcut_name = os.path.basename(shortcut_path)
-            
-            shortcuts_info.append({
-                "name": shortcut_name,
-                "path": shortcut_path,
-                "target": target_path,
-                "valid": is_valid,
-                "error": error_message
-            })
+        for info in self.iter_verify_shortcuts(location, subfolder):
+            shortcuts_info.append(info)
             
-            if is_valid:
+            if info["valid"]:
                 valid_count += 1
             else:
                 broken_count += 1
@@ -0,0 +1,179 @@
+"""
+Start Menu Shortcut Creator - SVG Rasterization Cache
+This module renders SVG assets (the application icon, the drop area artwork
+and the demo icons) to PNG once per file hash and physical size (logical size
+times device pixel ratio) and keeps the results on disk between runs, so SVGs
+are not parsed and rasterized again every time they are shown.
+
+The cache can be warmed at startup (MainWindow does) or at build time:
+
+    python svg_raster_cache.py --sizes 16 32 48 64 --dpr 1 2
+"""
+import os
+import sys
+import argparse
+import tempfile
+import threading
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QIcon, QImage, QPainter, QPixmap
+from PyQt5.QtSvg import QSvgRenderer
+from metadata_cache import hash_file
+
+# SVG assets shown by the application
+APP_ICON = "assets/app_icon.svg"
+DROP_AREA_ICON = "assets/drag_drop.svg"
+DEMO_ICON_DIR = os.path.join("assets", "demo_icons")
+
+# Sizes the window icon is provided in
+WINDOW_ICON_SIZES = (16, 24, 32, 48, 64, 256)
+
+
+def default_assets():
+    """List the SVG assets the application shows."""
+    assets = [APP_ICON, DROP_AREA_ICON]
+    try:
+        assets.extend(os.path.join(DEMO_ICON_DIR, name) for name in sorted(os.listdir(DEMO_ICON_DIR))
+                      if name.lower().endswith(".svg"))
+    except OSError:
+        pass
+    return [path for path in assets if os.path.exists(path)]
+
+
+class SvgRasterCache:
+    def __init__(self, directory=None):
+        """
+        Open (or create) the rasterization cache.
+
+        Args:
+            directory: Cache directory (default: icon_cache/svg in the temp directory)
+        """
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "icon_cache", "svg")
+        self._hashes = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _file_hash(self, svg_path):
+        """Return the content hash of an SVG, rehashing only when size or mtime change."""
+        stat = os.stat(svg_path)
+        key = os.path.normcase(os.path.abspath(svg_path))
+        with self._lock:
+            cached = self._hashes.get(key)
+            if cached and cached[0] == (stat.st_size, stat.st_mtime_ns):
+                return cached[1]
+        digest = hash_file(svg_path)
+        with self._lock:
+            self._hashes[key] = ((stat.st_size, stat.st_mtime_ns), digest)
+        return digest
+
+    def render(self, svg_path, size, device_pixel_ratio=1.0):
+        """
+        Return a PNG of an SVG rendered at size times the device pixel ratio.
+
+        Args:
+            svg_path: Path to the SVG file
+            size: Logical size in pixels
+            device_pixel_ratio: Screen scale factor
+
+        Returns:
+            Path to the PNG, or None if the SVG cannot be read or rendered
+        """
+        try:
+            file_hash = self._file_hash(svg_path)
+        except OSError:
+            return None
+
+        physical = int(round(size * device_pixel_ratio))
+        png_path = os.path.join(self.directory, f"{file_hash[:32]}-{physical}px.png")
+        if os.path.exists(png_path):
+            return png_path
+
+        renderer = QSvgRenderer(svg_path)
+        if not renderer.isValid():
+            return None
+        image = QImage(physical, physical, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        renderer.render(painter)
+        painter.end()
+
+        temp_path = f"{png_path}.{threading.get_ident()}.tmp"
+        if not image.save(temp_path, "PNG"):
+            return None
+        os.replace(temp_path, png_path)
+        return png_path
+
+    def pixmap(self, svg_path, size, device_pixel_ratio=1.0):
+        """
+        Return an SVG as a pixmap of the given logical size.
+
+        Returns:
+            QPixmap (null if the SVG cannot be rendered)
+        """
+        png_path = self.render(svg_path, size, device_pixel_ratio)
+        if png_path is None:
+            return QPixmap()
+        pixmap = QPixmap(png_path)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        return pixmap
+
+    def icon(self, svg_path, sizes=WINDOW_ICON_SIZES, device_pixel_ratio=1.0):
+        """Return a QIcon holding pre-rendered sizes of an SVG."""
+        icon = QIcon()
+        for size in sizes:
+            png_path = self.render(svg_path, size, device_pixel_ratio)
+            if png_path:
+                icon.addFile(png_path, QSize(size, size))
+        return icon
+
+    def warm(self, svg_paths=None, sizes=(16, 32, 48, 64), device_pixel_ratios=(1.0,)):
+        """
+        Render every combination of assets, sizes and pixel ratios not yet cached.
+
+        Args:
+            svg_paths: SVG files (default: the application's assets)
+            sizes: Logical sizes
+            device_pixel_ratios: Screen scale factors
+
+        Returns:
+            Number of (asset, size, ratio) combinations available in the cache
+        """
+        if svg_paths is None:
+            svg_paths = default_assets()
+        available = 0
+        for svg_path in svg_paths:
+            for size in sizes:
+                for device_pixel_ratio in device_pixel_ratios:
+                    if self.render(svg_path, size, device_pixel_ratio):
+                        available += 1
+        return available
+
+    def clear(self):
+        """Remove every rendered PNG."""
+        with self._lock:
+            self._hashes.clear()
+        for file_name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+
+
+def main():
+    """Command line entry point: pre-render SVG assets (e.g. at build time)."""
+    parser = argparse.ArgumentParser(description="Pre-render SVG assets to the rasterization cache")
+    parser.add_argument("svgs", nargs="*", help="SVG files (default: the application's assets)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 48, 64], help="Logical sizes")
+    parser.add_argument("--dpr", type=float, nargs="+", default=[1.0, 2.0], help="Device pixel ratios")
+    parser.add_argument("--directory", help="Cache directory")
+    args = parser.parse_args()
+
+    from PyQt5.QtGui import QGuiApplication
+    # Rendering needs a Qt application; keep a reference so it is not destroyed right away
+    app = QGuiApplication(sys.argv[:1])  # noqa: F841
+    cache = SvgRasterCache(args.directory)
+    available = cache.warm(args.svgs or None, args.sizes, args.dpr)
+    print(f"{available} rendering(s) available in {cache.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Build minimal PE executables in memory for the tests."""
+import struct
+
+from pe_file import IMAGE_DIRECTORY_ENTRY_RESOURCE, IMAGE_FILE_DLL, IMAGE_FILE_EXECUTABLE_IMAGE, PE32_MAGIC, \
+    PE32_PLUS_MAGIC, RT_GROUP_ICON, RT_ICON
+
+PE_OFFSET = 0x40
+FILE_ALIGNMENT = 0x200
+SECTION_RVA = 0x1000
+RESOURCE_LANGUAGE = 0x409
+
+MACHINE_X64 = 0x8664
+MACHINE_X86 = 0x014C
+SUBSYSTEM_GUI = 2
+SUBSYSTEM_CONSOLE = 3
+
+# COFF characteristics of a DLL
+DLL_CHARACTERISTICS = IMAGE_FILE_EXECUTABLE_IMAGE | IMAGE_FILE_DLL
+
+
+def _align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def build_resource_section(resources, section_rva=SECTION_RVA):
+    """
+    Lay out a resource directory tree (type -> id -> one language).
+
+    Args:
+        resources: {type id: {resource id: bytes}}
+        section_rva: RVA the section is loaded at
+
+    Returns:
+        Section bytes
+    """
+    def directory_size(count):
+        return 16 + 8 * count
+
+    items = [(type_id, resource_id) for type_id in sorted(resources) for resource_id in sorted(resources[type_id])]
+    offset = directory_size(len(resources))
+    type_offsets = {}
+    for type_id in sorted(resources):
+        type_offsets[type_id] = offset
+        offset += directory_size(len(resources[type_id]))
+    name_offsets = {}
+    for item in items:
+        name_offsets[item] = offset
+        offset += directory_size(1)
+    entry_offsets = {}
+    for item in items:
+        entry_offsets[item] = offset
+        offset += 16
+    data_offsets = {}
+    for type_id, resource_id in items:
+        offset = _align(offset, 4)
+        data_offsets[type_id, resource_id] = offset
+        offset += len(resources[type_id][resource_id])
+
+    section = bytearray(offset)
+
+    def write_directory(at, entries):
+        struct.pack_into("<IIHHHH", section, at, 0, 0, 0, 0, 0, len(entries))
+        for index, (name, target) in enumerate(entries):
+            struct.pack_into("<II", section, at + 16 + index * 8, name, target)
+
+    write_directory(0, [(type_id, 0x80000000 | type_offsets[type_id]) for type_id in sorted(resources)])
+    for type_id in sorted(resources):
+        write_directory(type_offsets[type_id], [(resource_id, 0x80000000 | name_offsets[type_id, resource_id])
+                                                for resource_id in sorted(resources[type_id])])
+    for type_id, resource_id in items:
+        item = (type_id, resource_id)
+        write_directory(name_offsets[item], [(RESOURCE_LANGUAGE, entry_offsets[item])])
+        data = resources[type_id][resource_id]
+        struct.pack_into("<IIII", section, entry_offsets[item], section_rva + data_offsets[item], len(data), 0, 0)
+        section[data_offsets[item]:data_offsets[item] + len(data)] = data
+    return bytes(section)
+
+
+def build_pe(resources=None, machine=MACHINE_X64, subsystem=SUBSYSTEM_GUI,
+             characteristics=IMAGE_FILE_EXECUTABLE_IMAGE | 0x0020, pe32_plus=True, sections=1):
+    """
+    Build a PE executable with one .rsrc section.
+
+    Args:
+        resources: Optional {type id: {resource id: bytes}} for the section
+        machine: COFF machine type
+        subsystem: Optional header subsystem
+        characteristics: COFF characteristics
+        pe32_plus: PE32+ (64-bit) optional header if True, PE32 otherwise
+        sections: Number of section headers (0 for a file without sections)
+
+    Returns:
+        File bytes
+    """
+    section_data = build_resource_section(resources or {})
+    raw_size = _align(max(len(section_data), 1), FILE_ALIGNMENT)
+    optional_size = 240 if pe32_plus else 224
+    directories_offset = 112 if pe32_plus else 96
+
+    optional = bytearray(optional_size)
+    struct.pack_into("<H", optional, 0, PE32_PLUS_MAGIC if pe32_plus else PE32_MAGIC)
+    struct.pack_into("<II", optional, 32, SECTION_RVA, FILE_ALIGNMENT)
+    struct.pack_into("<II", optional, 56, SECTION_RVA + _align(len(section_data), SECTION_RVA), FILE_ALIGNMENT)
+    struct.pack_into("<H", optional, 68, subsystem)
+    struct.pack_into("<I", optional, directories_offset - 4, 16)
+    if resources:
+        struct.pack_into("<II", optional, directories_offset + IMAGE_DIRECTORY_ENTRY_RESOURCE * 8,
+                         SECTION_RVA, len(section_data))
+
+    dos_header = bytearray(PE_OFFSET)
+    dos_header[:2] = b"MZ"
+    struct.pack_into("<I", dos_header, 0x3C, PE_OFFSET)
+    coff = struct.pack("<HHIIIHH", machine, sections, 0, 0, 0, optional_size, characteristics)
+    section_headers = b"".join(struct.pack("<8sIIIIIIHHI", b".rsrc", len(section_data), SECTION_RVA, raw_size,
+                                           FILE_ALIGNMENT, 0, 0, 0, 0, 0x40000040) for _ in range(sections))
+    headers = bytes(dos_header) + b"PE\0\0" + coff + bytes(optional) + section_headers
+    assert len(headers) <= FILE_ALIGNMENT
+    return headers.ljust(FILE_ALIGNMENT, b"\0") + section_data.ljust(raw_size, b"\0")
+
+
+def write_pe(path, *args, **kwargs):
+    """Write build_pe(...) to path and return it as a string."""
+    with open(str(path), "wb") as f:
+        f.write(build_pe(*args, **kwargs))
+    return str(path)
+
+
+def section_table_offset(pe32_plus=True):
+    """File offset of the first section header."""
+    return PE_OFFSET + 4 + 20 + (240 if pe32_plus else 224)
+
+
+def _pad4(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def version_node(key, value=b"", value_type=0, children=(), value_length=None):
+    """Encode one VS_VERSIONINFO-style node (header, key, value and child nodes)."""
+    data = struct.pack("<HHH", 0, len(value) if value_length is None else value_length, value_type)
+    data = _pad4(data + (key + "\0").encode("utf-16-le")) + value
+    for child in children:
+        data = _pad4(data) + child
+    return struct.pack("<H", len(data)) + data[2:]
+
+
+def string_node(name, text):
+    """Encode one String node of a StringTable."""
+    return version_node(name, (text + "\0").encode("utf-16-le"), 1, value_length=len(text) + 1)
+
+
+def build_version_resource(file_version=(1, 2, 3, 4), product_version=None, strings=None,
+                           table="040904b0", translation=(0x0409, 1200)):
+    """
+    Build RT_VERSION data: VS_FIXEDFILEINFO, one StringFileInfo table and a translation.
+
+    Args:
+        file_version: Four version numbers
+        product_version: Four version numbers (default: file_version)
+        strings: {name: value} of the string table
+        table: String table key (language and codepage in hex)
+        translation: (language, codepage) declared in VarFileInfo, or None
+    """
+    product_version = product_version or file_version
+    fixed = struct.pack("<13I", 0xFEEF04BD, 0x10000,
+                        file_version[0] << 16 | file_version[1], file_version[2] << 16 | file_version[3],
+                        product_version[0] << 16 | product_version[1], product_version[2] << 16 | product_version[3],
+                        0x3F, 0, 0x40004, 1, 0, 0, 0)
+    children = [version_node("StringFileInfo", children=[
+        version_node(table, children=[string_node(name, text) for name, text in (strings or {}).items()])])]
+    if translation is not None:
+        children.append(version_node("VarFileInfo", children=[
+            version_node("Translation", struct.pack("<HH", *translation))]))
+    return version_node("VS_VERSION_INFO", fixed, children=children)
+
+
+def build_icon_resources(images, group_id=1):
+    """
+    Build an RT_GROUP_ICON and its RT_ICON images.
+
+    Args:
+        images: List of (width, height, bit_count, data); data is a DIB or a PNG
+        group_id: Resource id of the icon group
+
+    Returns:
+        {type id: {resource id: bytes}} for build_pe
+    """
+    group = struct.pack("<HHH", 0, 1, len(images))
+    icons = {}
+    for icon_id, (width, height, bit_count, data) in enumerate(images, 1):
+        group += struct.pack("<BBBBHHIH", width % 256, height % 256, 0, 0, 1, bit_count, len(data), icon_id)
+        icons[icon_id] = data
+    return {RT_ICON: icons, RT_GROUP_ICON: {group_id: group}}
@@ -0,0 +1,64 @@
+import pytest
+
+from dib_decoder import BITMAP_INFO_HEADER, SUPPORTED_BIT_COUNTS, DIBFormatError, _row_stride, decode_dib, \
+    decode_dib_reference, make_test_dib, parse_dib
+
+pytest.importorskip("numpy")
+
+# Odd widths exercise the padding of pixel and AND mask rows to 4 bytes
+SIZES = [(16, 16), (32, 32), (1, 1), (3, 5), (7, 2), (13, 9), (33, 17), (48, 48)]
+
+
+def assert_same_decoding(data):
+    width, height, expected = decode_dib_reference(data)
+    decoded = decode_dib(data)
+    assert decoded.shape == (height, width, 4)
+    assert decoded.tobytes() == expected
+
+
+@pytest.mark.parametrize("bit_count", SUPPORTED_BIT_COUNTS)
+@pytest.mark.parametrize("width,height", SIZES)
+def test_matches_reference(width, height, bit_count):
+    assert_same_decoding(make_test_dib(width, height, bit_count, seed=width * height))
+
+
+@pytest.mark.parametrize("width,height", SIZES)
+def test_32bpp_without_alpha_uses_and_mask(width, height):
+    data = bytearray(make_test_dib(width, height, 32, seed=width))
+    info = parse_dib(bytes(data))
+    for y in range(height):
+        row = info["xor_offset"] + y * info["xor_stride"]
+        data[row + 3:row + width * 4:4] = bytes(width)
+    assert_same_decoding(bytes(data))
+    assert set(decode_dib(bytes(data))[..., 3].flat) <= {0, 255}
+
+
+@pytest.mark.parametrize("bit_count", SUPPORTED_BIT_COUNTS)
+def test_missing_and_mask_is_opaque(bit_count):
+    data = make_test_dib(13, 9, bit_count)
+    data = data[:len(data) - _row_stride(13, 1) * 9]
+    assert parse_dib(data)["and_offset"] is None
+    assert_same_decoding(data)
+    if bit_count < 32:
+        assert (decode_dib(data)[..., 3] == 255).all()
+
+
+def test_short_palette_clamps_indices():
+    data = bytearray(make_test_dib(9, 4, 8))
+    # Declare 4 palette colors; the remaining palette bytes become pixel data
+    header = BITMAP_INFO_HEADER.unpack_from(data)
+    BITMAP_INFO_HEADER.pack_into(data, 0, *header[:9], 4, header[10])
+    assert_same_decoding(bytes(data))
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    make_test_dib(16, 16, 8)[:BITMAP_INFO_HEADER.size + 100],
+    BITMAP_INFO_HEADER.pack(40, 16, 32, 1, 16, 0, 0, 0, 0, 0, 0),
+    BITMAP_INFO_HEADER.pack(40, 16, 31, 1, 32, 0, 0, 0, 0, 0, 0),
+])
+def test_malformed_dib(data):
+    with pytest.raises(DIBFormatError):
+        decode_dib(data)
+    with pytest.raises(DIBFormatError):
+        decode_dib_reference(data)
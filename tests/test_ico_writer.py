@@ -0,0 +1,100 @@
+import io
+import struct
+
+import pytest
+from PIL import Image
+
+import ico_writer
+from ico_writer import ICON_DIR, ICON_DIR_ENTRY, write_ico
+
+SIZES = (16, 32, 48, 64, 128, 256)
+
+
+def read_directory(ico_data):
+    """Return {size: (format, bit count, colors)} from an ICO directory."""
+    _, icon_type, count = ICON_DIR.unpack_from(ico_data)
+    assert icon_type == 1
+    entries = {}
+    for index in range(count):
+        width, _, colors, _, _, bit_count, length, offset = ICON_DIR_ENTRY.unpack_from(
+            ico_data, ICON_DIR.size + index * ICON_DIR_ENTRY.size)
+        data = ico_data[offset:offset + length]
+        is_png = data[:8] == b"\x89PNG\r\n\x1a\n"
+        if not is_png:
+            assert struct.unpack_from("<I", data)[0] == 40
+            assert struct.unpack_from("<H", data, 14)[0] == bit_count
+        entries[width or 256] = ("png" if is_png else "bmp", bit_count, colors)
+    return entries
+
+
+def smooth_image(size):
+    """Anti-aliased image: partial alpha and many colors, so never palettizable."""
+    img = Image.new("RGBA", (size, size))
+    img.putdata([(x * 255 // size, y * 255 // size, 128, (x + y) * 255 // (2 * size))
+                 for y in range(size) for x in range(size)])
+    return img
+
+
+def flat_image(size, colors=3):
+    """Pixel-art image: a few opaque colors on a transparent background."""
+    palette = [(255, 0, 0, 255), (0, 128, 255, 255), (255, 255, 255, 255), (10, 20, 30, 255)][:colors]
+    img = Image.new("RGBA", (size, size))
+    img.putdata([(0, 0, 0, 0) if (x + y) % 5 == 0 else palette[(x // 3 + y) % colors]
+                 for y in range(size) for x in range(size)])
+    return img
+
+
+def decoded_entries(ico_data):
+    """Decode every entry with Pillow."""
+    ico = Image.open(io.BytesIO(ico_data))
+    return {size: ico.ico.getimage(size).convert("RGBA") for size in ico.info["sizes"]}
+
+
+def visible_pixels(data):
+    """RGBA bytes with the color of fully transparent pixels cleared."""
+    return bytes(value if data[i - i % 4 + 3] else 0 for i, value in enumerate(data))
+
+
+def test_only_png_sizes_are_png():
+    ico_data, report = write_ico([smooth_image(size) for size in SIZES])
+    entries = read_directory(ico_data)
+    assert entries[256][0] == "png"
+    for size in SIZES[:-1]:
+        assert entries[size] == ("bmp", 32, 0)
+    assert [entry["format"] for entry in report] == ["bmp32"] * 5 + ["png"]
+
+
+def test_png_128():
+    entries = read_directory(write_ico([smooth_image(size) for size in SIZES], png_sizes=(128, 256))[0])
+    assert [entries[size][0] for size in SIZES] == ["bmp"] * 4 + ["png"] * 2
+
+
+@pytest.mark.parametrize("colors, bit_count", [(1, 1), (3, 4)])
+def test_flat_images_are_palettized(colors, bit_count):
+    ico_data, _ = write_ico([flat_image(size, colors) for size in (16, 32, 256)])
+    entries = read_directory(ico_data)
+    assert entries[16][:2] == ("bmp", bit_count)
+    assert entries[32][:2] == ("bmp", bit_count)
+    assert entries[256][0] == "png"
+
+
+@pytest.mark.parametrize("make_image", [smooth_image, flat_image])
+def test_entries_are_lossless(make_image):
+    images = [make_image(size) for size in (16, 17, 32, 256)]
+    decoded = decoded_entries(write_ico(images)[0])
+    for img in images:
+        assert visible_pixels(decoded[img.size].tobytes()) == visible_pixels(img.tobytes())
+
+
+@pytest.mark.parametrize("size", [16, 17, 33])
+def test_numpy_matches_python_encoder(size, monkeypatch):
+    img = flat_image(size, 4)
+    palette_bmp = ico_writer.encode_palette_bmp(img)
+    bmp32 = ico_writer.encode_bmp32(img)
+    monkeypatch.setattr(ico_writer, "np", None)
+    assert ico_writer.encode_palette_bmp(img) == palette_bmp
+    assert ico_writer.encode_bmp32(img) == bmp32
+
+
+def test_partial_alpha_is_not_palettized():
+    assert ico_writer.encode_palette_bmp(smooth_image(16)) is None
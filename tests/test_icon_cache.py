@@ -0,0 +1,65 @@
+import hashlib
+import os
+
+import icon_cache
+from icon_cache import INDEX_NAME, IconCache
+
+
+def key(number):
+    return hashlib.sha1(str(number).encode("ascii")).hexdigest()
+
+
+def test_put_and_get(tmp_path):
+    cache = IconCache(str(tmp_path))
+    path = cache.put(key(1), b"icon data")
+
+    assert cache.get_path(key(1)) == path
+    assert cache.get_bytes(key(1)) == b"icon data"
+    assert cache.get_path(key(2)) is None
+
+
+def test_index_is_saved_in_batches(tmp_path, monkeypatch):
+    cache = IconCache(str(tmp_path))
+    saves = []
+    save_index = cache._save_index
+    monkeypatch.setattr(cache, "_save_index", lambda: saves.append(1) or save_index())
+
+    for number in range(icon_cache.FLUSH_EVERY - 1):
+        cache.put(key(number), b"icon data")
+    assert saves == []
+    cache.put(key(icon_cache.FLUSH_EVERY), b"icon data")
+    assert len(saves) == 1
+
+
+def test_flush_persists_inserts(tmp_path):
+    cache = IconCache(str(tmp_path))
+    cache.put(key(1), b"icon data")
+    cache.link(key(2), key(1))
+    cache.put(key(3), b"more icon data")
+    cache.flush()
+
+    reopened = IconCache(str(tmp_path))
+    assert reopened.get_bytes(key(3)) == b"more icon data"
+    assert reopened.get_bytes(key(2)) == b"icon data"
+
+
+def test_lost_index_is_rebuilt_from_files(tmp_path):
+    cache = IconCache(str(tmp_path))
+    cache.put(key(1), b"icon data")
+    cache.put(key(2), b"more icon data")
+    (tmp_path / "default_32.png").write_bytes(b"not a cached icon")
+    os.remove(os.path.join(str(tmp_path), INDEX_NAME))
+
+    reopened = IconCache(str(tmp_path))
+    assert sorted(reopened.keys()) == sorted([key(1), key(2)])
+    assert reopened.get_bytes(key(2)) == b"more icon data"
+    assert reopened.total_bytes == len(b"icon data") + len(b"more icon data")
+    assert (tmp_path / "default_32.png").exists()
+
+
+def test_corrupt_index_is_rebuilt_from_files(tmp_path):
+    cache = IconCache(str(tmp_path))
+    cache.put(key(1), b"icon data")
+    (tmp_path / INDEX_NAME).write_text("{not json")
+
+    assert IconCache(str(tmp_path)).get_bytes(key(1)) == b"icon data"
@@ -0,0 +1,41 @@
+import os
+
+import icon_converter
+from icon_converter import build_icons
+
+SVG = (b'<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16">'
+       b'<rect x="2" y="2" width="12" height="12" fill="#0078d4"/></svg>')
+
+
+def make_jobs(tmp_path, count):
+    jobs = []
+    for index in range(count):
+        svg_path = tmp_path / f"icon{index}.svg"
+        svg_path.write_bytes(SVG)
+        jobs.append((str(svg_path), str(tmp_path / f"icon{index}.ico")))
+    return jobs
+
+
+def crash_on_first(svg_path, ico_path, sizes, png_sizes, max_workers=1):
+    if svg_path.endswith("icon0.svg"):
+        os._exit(1)
+    return svg_path, ico_path, None, []
+
+
+def test_batch_builds_every_icon(tmp_path):
+    jobs = make_jobs(tmp_path, 3)
+    report = build_icons(jobs, sizes=(16, 32), max_workers=2)
+    assert sorted(report["rebuilt"]) == sorted(jobs)
+    assert report["failed"] == []
+    for _, ico_path in jobs:
+        with open(ico_path, "rb") as f:
+            assert f.read(4) == b"\0\0\1\0"
+
+
+def test_crashed_worker_is_reported_per_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(icon_converter, "_convert_for_batch", crash_on_first)
+    jobs = make_jobs(tmp_path, 3)
+    report = build_icons(jobs, sizes=(16,), max_workers=1)
+    # Every file is accounted for, and the crashed one is among the failures
+    assert len(report["rebuilt"]) + len(report["failed"]) == len(jobs)
+    assert jobs[0] in [(svg_path, ico_path) for svg_path, ico_path, _ in report["failed"]]
@@ -0,0 +1,95 @@
+import io
+
+import pytest
+from PIL import Image
+
+from ico_writer import encode_bmp32, encode_png
+from icon_extractor import extract_icons_png, read_icon_resources, render_icons, select_icon_entry
+from pe_builder import build_icon_resources, write_pe
+from pe_file import PEFile, PEFormatError
+
+
+def make_image(size):
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    img.putdata([(x * 8 % 256, y * 8 % 256, 200, 255) if (x + y) % 3 else (0, 0, 0, 0)
+                 for y in range(size) for x in range(size)])
+    return img
+
+
+@pytest.fixture
+def icon_exe(tmp_path):
+    small = make_image(32)
+    large = make_image(256)
+    dib = encode_bmp32(small)
+    png = encode_png(large)
+    path = write_pe(tmp_path / "app.exe", build_icon_resources([(32, 32, 32, dib), (256, 256, 32, png)]))
+    return path, small, dib, png
+
+
+def entry(width, bit_count=32, icon_id=1):
+    return {"width": width, "height": width, "bit_count": bit_count, "icon_id": icon_id}
+
+
+def test_select_icon_entry():
+    entries = [entry(16, 8, 1), entry(32, 8, 2), entry(32, 32, 3), entry(256, 32, 4)]
+    # Exact size, highest color depth
+    assert select_icon_entry(entries, 32)["icon_id"] == 3
+    assert select_icon_entry(entries, 16)["icon_id"] == 1
+    # Smallest larger image, scaled down
+    assert select_icon_entry(entries, 20)["icon_id"] == 3
+    assert select_icon_entry(entries, 48)["icon_id"] == 4
+    # Largest image, scaled up
+    assert select_icon_entry(entries[:3], 48)["icon_id"] == 3
+    assert select_icon_entry([], 32) is None
+
+
+def test_read_icon_group(icon_exe):
+    path, _, dib, png = icon_exe
+    with PEFile(path) as pe:
+        assert len(pe.get_icon_groups()) == 1
+        entries = pe.read_icon_group()
+        assert [(e["width"], e["height"], e["bit_count"], e["size"]) for e in entries] == [
+            (32, 32, 32, len(dib)), (256, 256, 32, len(png))]
+        assert pe.read_icon_image(entries[0]["icon_id"]) == dib
+        assert pe.read_icon_image(entries[1]["icon_id"]) == png
+        assert pe.read_icon_image(99) is None
+        assert pe.read_icon_group(1) == []
+
+
+def test_read_icon_resources_picks_entry_per_size(icon_exe):
+    path, _, dib, png = icon_exe
+    resources = read_icon_resources(path, (16, 32, 48, 256))
+    assert {size: entry["width"] for size, (entry, _) in resources.items()} == {16: 32, 32: 32, 48: 256, 256: 256}
+    assert resources[16][1] == dib
+    assert resources[48][1] == png
+
+
+def test_png_entry_is_passed_through(icon_exe):
+    path, small, _, png = icon_exe
+    icons = extract_icons_png(path, (32, 256))
+    # The embedded 256 px PNG is stored byte for byte
+    assert icons[256] == png
+    # The DIB is decoded to the same pixels
+    assert Image.open(io.BytesIO(icons[32])).convert("RGBA").tobytes() == small.tobytes()
+
+
+def test_render_icons_skips_known_images(icon_exe):
+    path, _, _, _ = icon_exe
+    resources = read_icon_resources(path, (32, 256))
+    rendered = render_icons(resources, is_known=lambda key: True)
+    assert all(data is None for _, data in rendered.values())
+
+
+def test_executable_without_icons(tmp_path):
+    path = write_pe(tmp_path / "plain.exe")
+    assert read_icon_resources(path, (32,)) == {}
+    assert extract_icons_png(path, (32,)) == {}
+
+
+def test_truncated_icon_group(tmp_path):
+    resources = build_icon_resources([(32, 32, 32, encode_bmp32(make_image(32)))])
+    resources[14][1] = resources[14][1][:10]
+    path = write_pe(tmp_path / "broken.exe", resources)
+    with PEFile(path) as pe:
+        with pytest.raises(PEFormatError):
+            pe.read_icon_group()
@@ -0,0 +1,97 @@
+import hashlib
+import os
+
+from icon_pack import PACK_INDEX_NAME, RECORD, IconPack
+
+
+def key(number):
+    return hashlib.sha1(str(number).encode("ascii")).hexdigest()
+
+
+def test_round_trip_after_reopen(tmp_path):
+    pack = IconPack(str(tmp_path))
+    assert pack.put(key(1), b"icon one") == key(1)
+    pack.put_many({key(2): b"icon two", key(3): b"<svg/>"}, extension="svg")
+    pack.link(key(4), key(1))
+    pack.close()
+
+    pack = IconPack(str(tmp_path))
+    assert pack.get_bytes(key(1)) == b"icon one"
+    assert pack.get_bytes(key(4)) == b"icon one"
+    assert pack.get_bytes(key(5)) is None
+    path = pack.get_path(key(3))
+    assert path.endswith(".svg")
+    with open(path, "rb") as f:
+        assert f.read() == b"<svg/>"
+    assert pack.get_path(key(4)) == pack.get_path(key(1))
+    assert pack.stats()["entries"] == 3
+    pack.close()
+
+
+def test_compaction_after_deletions(tmp_path):
+    pack = IconPack(str(tmp_path), max_bytes=3000)
+    for number in range(5):
+        pack.put(key(number), bytes([number]) * 1000)
+    pack.put(key(4), b"replaced")
+    pack.link(key(10), key(4))
+    before = pack.stats()
+    assert before["entries"] == 3
+    assert before["dead_bytes"] == 3000
+
+    assert pack.compact() == 3000
+    assert pack.stats()["dead_bytes"] == 0
+    assert os.path.getsize(pack.pack_path) == pack.stats()["pack_bytes"]
+    pack.close()
+
+    pack = IconPack(str(tmp_path), max_bytes=3000)
+    assert pack.keys() == [key(2), key(3), key(4)]
+    assert pack.get_bytes(key(2)) == bytes([2]) * 1000
+    assert pack.get_bytes(key(10)) == b"replaced"
+    assert pack.get_bytes(key(0)) is None
+    assert pack.stats()["dead_bytes"] == 0
+    pack.close()
+
+
+def test_truncated_index_record_is_dropped(tmp_path):
+    pack = IconPack(str(tmp_path))
+    pack.put(key(1), b"icon one")
+    pack.put(key(2), b"icon two")
+    pack.close()
+
+    index_path = os.path.join(str(tmp_path), PACK_INDEX_NAME)
+    with open(index_path, "r+b") as f:
+        f.truncate(os.path.getsize(index_path) - RECORD.size // 2)
+
+    pack = IconPack(str(tmp_path))
+    assert pack.keys() == [key(1)]
+    assert pack.get_bytes(key(1)) == b"icon one"
+    assert pack.get_bytes(key(2)) is None
+    pack.close()
+
+
+def test_lru_order_after_reopen_is_write_order(tmp_path):
+    # Reads are not persisted (see the module docstring)
+    pack = IconPack(str(tmp_path), max_bytes=2000)
+    pack.put(key(1), b"1" * 1000)
+    pack.put(key(2), b"2" * 1000)
+    pack.get_bytes(key(1))
+    pack.close()
+
+    pack = IconPack(str(tmp_path), max_bytes=2000)
+    pack.put(key(3), b"3" * 1000)
+    assert pack.keys() == [key(2), key(3)]
+    pack.close()
+
+
+def test_compaction_keeps_lru_order(tmp_path):
+    pack = IconPack(str(tmp_path), max_bytes=2000)
+    pack.put(key(1), b"1" * 1000)
+    pack.put(key(2), b"2" * 1000)
+    pack.get_bytes(key(1))
+    pack.compact()
+    pack.close()
+
+    pack = IconPack(str(tmp_path), max_bytes=2000)
+    pack.put(key(3), b"3" * 1000)
+    assert pack.keys() == [key(1), key(3)]
+    pack.close()
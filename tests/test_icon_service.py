@@ -0,0 +1,59 @@
+import logging
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication
+
+from icon_service import IconService
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class FakeExtractor:
+    def get_all_icons(self, exe_path, sizes):
+        if exe_path.endswith("broken.exe"):
+            raise OSError("unreadable")
+        return {size: f"{exe_path}.{size}.png" for size in sizes}
+
+
+def wait_for(results, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+
+
+def test_icon_is_reported_and_remembered(app):
+    service = IconService(FakeExtractor(), sizes=(16, 32))
+    results = []
+    service.iconReady.connect(lambda *args: results.append(args))
+
+    assert service.request("C:\\Apps\\app.exe", 48) is None
+    wait_for(results, 3)
+    # Every size extracted in the job is reported
+    assert [size for _, size, _ in results] == [16, 32, 48]
+    assert results[2] == ("C:\\Apps\\app.exe", 48, "C:\\Apps\\app.exe.48.png")
+    assert service.request("C:\\Apps\\app.exe", 16) == "C:\\Apps\\app.exe.16.png"
+    service.shutdown()
+
+
+def test_failed_extraction_is_logged_and_reported_empty(app, caplog, capsys):
+    service = IconService(FakeExtractor(), sizes=(16,))
+    results = []
+    service.iconReady.connect(lambda *args: results.append(args))
+
+    with caplog.at_level(logging.WARNING, logger="icon_service"):
+        service.request("C:\\Apps\\broken.exe", 16)
+        wait_for(results, 1)
+    assert results == [("C:\\Apps\\broken.exe", 16, "")]
+    assert "C:\\Apps\\broken.exe" in caplog.text
+    assert "unreadable" in caplog.text
+    assert capsys.readouterr().out == ""
+    service.shutdown()
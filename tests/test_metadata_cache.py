@@ -0,0 +1,73 @@
+import os
+import sqlite3
+
+import metadata_cache
+from metadata_cache import MetadataCache
+
+
+def make_exe(tmp_path, data=b"MZ example"):
+    path = tmp_path / "example.exe"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_set_and_get(tmp_path):
+    exe_path = make_exe(tmp_path)
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite"))
+    cache.set(exe_path, "exe_info", {"product_name": "Example"})
+    cache.set(exe_path, "valid", True)
+
+    assert cache.get(exe_path, "exe_info") == {"product_name": "Example"}
+    assert cache.get(exe_path, "valid") is True
+    cache.close()
+
+
+def test_changed_file_is_stale(tmp_path):
+    exe_path = make_exe(tmp_path)
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite"))
+    cache.set(exe_path, "valid", True)
+    with open(exe_path, "ab") as f:
+        f.write(b" changed")
+
+    assert cache.get(exe_path, "valid") is None
+    cache.close()
+
+
+def test_content_hash_is_computed_without_the_lock(tmp_path, monkeypatch):
+    exe_path = make_exe(tmp_path)
+    cache = MetadataCache(str(tmp_path / "metadata.sqlite"), use_content_hash=True)
+    lock_states = []
+    real_hash_file = metadata_cache.hash_file
+
+    def hash_file(path):
+        lock_states.append(cache._lock.locked())
+        return real_hash_file(path)
+
+    monkeypatch.setattr(metadata_cache, "hash_file", hash_file)
+    cache.set(exe_path, "valid", True)
+    # Same contents, new mtime: the record survives through its content hash
+    stat = os.stat(exe_path)
+    os.utime(exe_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert cache.get(exe_path, "valid") is True
+    assert lock_states == [False, False]
+    cache.close()
+
+
+def test_writes_are_committed_in_batches(tmp_path):
+    exe_path = make_exe(tmp_path)
+    db_path = str(tmp_path / "metadata.sqlite")
+    cache = MetadataCache(db_path)
+    cache.set(exe_path, "valid", True)
+
+    def committed_rows():
+        connection = sqlite3.connect(db_path)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM executables").fetchone()[0]
+        finally:
+            connection.close()
+
+    assert committed_rows() == 0
+    cache.flush()
+    assert committed_rows() == 1
+    cache.close()
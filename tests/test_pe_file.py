@@ -0,0 +1,183 @@
+import struct
+
+import pytest
+
+from pe_builder import (DLL_CHARACTERISTICS, FILE_ALIGNMENT, MACHINE_X86, PE_OFFSET, SUBSYSTEM_CONSOLE, build_pe,
+                        build_version_resource, section_table_offset, write_pe)
+from pe_file import (RT_VERSION, PEFile, PEFormatError, get_version_strings, read_exe_info, sanitize_file_name,
+                     validate_directory, validate_pe)
+from shortcut_creator_demo import ShortcutCreator
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Example", "Example"),
+    ("Example: Pro Edition", "Example Pro Edition"),
+    ("A/B\\C", "ABC"),
+    ("What? <Really> \"Yes\" | * ", "What Really Yes"),
+    ("Trailing dots...", "Trailing dots"),
+    (":?*", ""),
+])
+def test_sanitize_file_name(name, expected):
+    assert sanitize_file_name(name) == expected
+
+
+def test_not_an_executable(tmp_path):
+    path = tmp_path / "notes.exe"
+    path.write_bytes(b"just some text, long enough to be mapped" * 4)
+
+    assert not validate_pe(str(path))["valid"]
+    with pytest.raises(PEFormatError):
+        PEFile(str(path))
+    assert read_exe_info(str(path))["suggested_name"] == "notes"
+
+
+def test_valid_executable(tmp_path):
+    path = write_pe(tmp_path / "app.exe")
+    verdict = validate_pe(path)
+    assert verdict["valid"], verdict["reason"]
+    assert (verdict["machine"], verdict["subsystem"], verdict["is_dll"]) == ("x64", "gui", False)
+    with PEFile(path) as pe:
+        assert pe.validate() == verdict
+    assert ShortcutCreator(verbose=False).is_valid_exe(path)
+
+
+def test_valid_32_bit_console_executable(tmp_path):
+    verdict = validate_pe(write_pe(tmp_path / "tool.exe", machine=MACHINE_X86, subsystem=SUBSYSTEM_CONSOLE,
+                                   pe32_plus=False))
+    assert verdict["valid"], verdict["reason"]
+    assert (verdict["machine"], verdict["subsystem"]) == ("x86", "console")
+
+
+@pytest.mark.parametrize("options, reason", [
+    ({"machine": 0x1234}, "Unsupported machine type 0x1234"),
+    ({"subsystem": 1}, "Not a GUI or console application"),
+    ({"characteristics": 0}, "Image is not marked as executable"),
+    ({"characteristics": DLL_CHARACTERISTICS}, "File is a DLL"),
+    ({"sections": 0}, "No sections"),
+])
+def test_rejected_headers(tmp_path, options, reason):
+    path = write_pe(tmp_path / "app.exe", **options)
+    verdict = validate_pe(path)
+    assert not verdict["valid"]
+    assert verdict["reason"].startswith(reason)
+    with PEFile(path) as pe:
+        assert pe.validate()["reason"].startswith(reason)
+
+
+def test_missing_pe_signature(tmp_path):
+    data = bytearray(build_pe())
+    data[PE_OFFSET:PE_OFFSET + 4] = b"NE\0\0"
+    path = tmp_path / "old.exe"
+    path.write_bytes(bytes(data))
+    assert validate_pe(str(path))["reason"] == "Missing PE signature"
+
+
+def test_truncated_optional_header(tmp_path):
+    path = tmp_path / "truncated.exe"
+    path.write_bytes(build_pe()[:PE_OFFSET + 4 + 20 + 60])
+    verdict = validate_pe(str(path))
+    assert not verdict["valid"]
+    assert verdict["reason"] == "Truncated PE headers"
+    with pytest.raises(PEFormatError):
+        PEFile(str(path))
+
+
+def test_section_past_end_of_file(tmp_path):
+    data = bytearray(build_pe())
+    # Raw size of the first section header
+    struct.pack_into("<I", data, section_table_offset() + 16, 0x10000)
+    path = tmp_path / "cut.exe"
+    path.write_bytes(bytes(data))
+    verdict = validate_pe(str(path))
+    assert not verdict["valid"]
+    assert "extends past the end of the file" in verdict["reason"]
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "download.exe"
+    path.write_bytes(build_pe({RT_VERSION: {1: b"x" * 2000}})[:FILE_ALIGNMENT + 100])
+    assert "truncated" in validate_pe(str(path))["reason"]
+
+
+def test_validate_directory(tmp_path):
+    (tmp_path / "sub").mkdir()
+    good = {write_pe(tmp_path / "a.exe"), write_pe(tmp_path / "sub" / "b.exe")}
+    bad = {write_pe(tmp_path / "c.exe", machine=0x1234), write_pe(tmp_path / "sub" / "d.exe", sections=0)}
+    (tmp_path / "notes.txt").write_text("not an executable")
+
+    verdicts = list(validate_directory(str(tmp_path), max_workers=2))
+    assert {verdict["path"] for verdict in verdicts} == good | bad
+    assert {verdict["path"] for verdict in verdicts if verdict["valid"]} == good
+
+    top_level = list(validate_directory(str(tmp_path), recursive=False))
+    assert {verdict["path"] for verdict in top_level} == {str(tmp_path / "a.exe"), str(tmp_path / "c.exe")}
+
+
+STRINGS = {
+    "CompanyName": "Example Corp",
+    "FileDescription": "Example Editor",
+    "FileVersion": "1.2.3.4",
+    "ProductName": "Example: Editor",
+}
+
+
+def test_version_resource(tmp_path):
+    path = write_pe(tmp_path / "editor.exe", {RT_VERSION: {1: build_version_resource((1, 2, 3, 4), (5, 6, 7, 8),
+                                                                                     STRINGS)}})
+    with PEFile(path) as pe:
+        info = pe.get_version_info()
+    assert info["file_version"] == "1.2.3.4"
+    assert info["product_version"] == "5.6.7.8"
+    assert info["translations"] == [(0x0409, 1200)]
+    assert get_version_strings(info) == STRINGS
+
+    exe_info = read_exe_info(path)
+    assert exe_info == {
+        "version": "1.2.3.4",
+        "description": "Example Editor",
+        "product_name": "Example: Editor",
+        "company": "Example Corp",
+        "suggested_name": "Example Editor",
+    }
+
+
+def test_string_table_without_matching_translation(tmp_path):
+    # German strings, English translation declared: the only table is used
+    resource = build_version_resource(strings={"FileDescription": "Beispiel"}, table="040704b0")
+    exe_info = read_exe_info(write_pe(tmp_path / "beispiel.exe", {RT_VERSION: {1: resource}}))
+    assert exe_info["description"] == "Beispiel"
+    # Without a ProductName the file name is suggested
+    assert exe_info["product_name"] == ""
+    assert exe_info["suggested_name"] == "beispiel"
+
+
+def test_no_version_resource(tmp_path):
+    path = write_pe(tmp_path / "plain.exe")
+    with PEFile(path) as pe:
+        assert pe.get_version_info() is None
+    assert read_exe_info(path) == {"version": "", "description": "", "product_name": "", "company": "",
+                                   "suggested_name": "plain"}
+
+
+def test_truncated_version_resource(tmp_path):
+    resource = build_version_resource(strings=STRINGS)
+    # Every cut, even and odd lengths alike, is decoded or rejected with PEFormatError
+    for length in range(0, len(resource), 3):
+        path = write_pe(tmp_path / "cut.exe", {RT_VERSION: {1: resource[:length]}})
+        with PEFile(path) as pe:
+            try:
+                info = pe.get_version_info()
+            except PEFormatError:
+                info = None
+        assert info is None or isinstance(info["strings"], dict)
+        assert read_exe_info(path)["suggested_name"]
+
+
+def test_unterminated_version_key(tmp_path):
+    # Header and an odd number of key bytes with no terminator
+    resource = struct.pack("<HHH", 200, 0, 0) + "VS_VERSION".encode("utf-16-le") + b"V"
+    path = write_pe(tmp_path / "odd.exe", {RT_VERSION: {1: resource}})
+    with PEFile(path) as pe:
+        with pytest.raises(PEFormatError):
+            pe.get_version_info()
+    assert read_exe_info(path)["version"] == ""
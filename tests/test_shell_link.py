@@ -0,0 +1,69 @@
+import pytest
+
+from shell_link import (
+    ShellLinkError, build_shortcut, parse_shortcut, read_shortcut, write_shortcut, is_shell_link
+)
+
+TARGET = "C:\\Program Files\\Example\\example.exe"
+
+
+def test_round_trip_all_fields(tmp_path):
+    path = tmp_path / "Example.lnk"
+    write_shortcut(str(path), TARGET, working_dir="C:\\Program Files\\Example",
+                   arguments="--flag \"quoted value\"", icon_location=TARGET, icon_index=2,
+                   description="Example application", show_command=7)
+
+    assert is_shell_link(str(path))
+    info = read_shortcut(str(path))
+    assert info["target"] == TARGET
+    assert info["working_dir"] == "C:\\Program Files\\Example"
+    assert info["arguments"] == "--flag \"quoted value\""
+    assert info["icon_location"] == TARGET
+    assert info["icon_index"] == 2
+    assert info["description"] == "Example application"
+    assert info["show_command"] == 7
+
+
+def test_round_trip_minimal_and_non_ascii():
+    target = "D:\\Spiele\\Überflieger\\spiel.exe"
+    info = parse_shortcut(build_shortcut(target))
+    assert info["target"] == target
+    assert info["arguments"] is None
+    assert info["description"] is None
+
+
+def test_round_trip_network_target():
+    target = "\\\\server\\share\\tools\\tool.exe"
+    assert parse_shortcut(build_shortcut(target))["target"] == target
+
+
+def test_rejects_non_shell_link():
+    with pytest.raises(ShellLinkError):
+        parse_shortcut(b"TARGET=C:\\app.exe\nBROKEN=False\n" + b"\0" * 100)
+
+
+def test_every_truncation_raises_or_parses():
+    data = build_shortcut(TARGET, working_dir="C:\\Program Files\\Example", arguments="-x",
+                          icon_location=TARGET, description="Example application")
+    for length in range(len(data)):
+        try:
+            parse_shortcut(data[:length])
+        except ShellLinkError:
+            pass
+
+
+def test_unterminated_unicode_string_raises():
+    data = bytearray(build_shortcut(TARGET))
+    # Overwrite everything after the header with non-NUL bytes so no string ends
+    data[0x4C + 40:] = b"A" * (len(data) - 0x4C - 40)
+    with pytest.raises(ShellLinkError):
+        parse_shortcut(bytes(data))
+
+
+def test_truncated_file_on_disk_raises(tmp_path):
+    path = tmp_path / "Damaged.lnk"
+    data = build_shortcut(TARGET, description="Example application")
+    path.write_bytes(data[:len(data) // 2])
+    assert is_shell_link(str(path))
+    with pytest.raises(ShellLinkError):
+        read_shortcut(str(path))
@@ -0,0 +1,114 @@
+import json
+import os
+
+import pytest
+
+from shell_link import read_shortcut, write_shortcut
+from shortcut_sync import ShortcutSync, load_manifest, validate_manifest
+
+NOTEPAD = "C:\\Program Files\\Notepad++\\notepad++.exe"
+EDITOR = "C:\\Program Files\\Editor\\editor.exe"
+
+
+class FakeCreator:
+    def __init__(self, root):
+        self.user_start_menu = str(root / "user")
+        self.common_start_menu = str(root / "common")
+
+    def is_admin(self):
+        return False
+
+
+@pytest.fixture
+def sync(tmp_path):
+    return ShortcutSync(FakeCreator(tmp_path), str(tmp_path / "state.json"))
+
+
+def manifest(shortcuts, managed_folders=None):
+    return {"shortcuts": shortcuts, "managed_folders": managed_folders or {}}
+
+
+def actions_by_name(actions):
+    return {os.path.basename(action["path"]): action["action"] for action in actions}
+
+
+def test_create_then_unchanged(sync):
+    desired = manifest([{"name": "Notepad++", "target": NOTEPAD, "folder": "Tools"}])
+    actions = sync.plan(desired)
+    assert actions_by_name(actions) == {"Notepad++.lnk": "create"}
+
+    success_count, failed_count, _ = sync.apply(actions)
+    assert (success_count, failed_count) == (1, 0)
+    path = os.path.join(sync.shortcut_creator.user_start_menu, "Tools", "Notepad++.lnk")
+    assert read_shortcut(path)["target"] == NOTEPAD
+    assert sync.plan(desired) == []
+
+
+def test_unchanged_shortcut_not_written_by_sync(sync):
+    directory = os.path.join(sync.shortcut_creator.user_start_menu, "Tools")
+    os.makedirs(directory)
+    write_shortcut(os.path.join(directory, "Notepad++.lnk"), NOTEPAD,
+                   working_dir="C:\\Program Files\\Notepad++", icon_location=NOTEPAD, icon_index=0)
+
+    assert sync.plan(manifest([{"name": "Notepad++", "target": NOTEPAD, "folder": "Tools"}])) == []
+
+
+def test_update_changed_shortcut(sync):
+    sync.apply(sync.plan(manifest([{"name": "Notepad++", "target": NOTEPAD}])))
+
+    changed = manifest([{"name": "Notepad++", "target": NOTEPAD, "arguments": "-multiInst"}])
+    actions = sync.plan(changed)
+    assert actions_by_name(actions) == {"Notepad++.lnk": "update"}
+    sync.apply(actions)
+    path = os.path.join(sync.shortcut_creator.user_start_menu, "Notepad++.lnk")
+    assert read_shortcut(path)["arguments"] == "-multiInst"
+
+
+def test_prune_only_in_managed_folders(sync):
+    root = sync.shortcut_creator.user_start_menu
+    for folder in ("Tools", "Games"):
+        os.makedirs(os.path.join(root, folder))
+        write_shortcut(os.path.join(root, folder, "Old.lnk"), EDITOR)
+    write_shortcut(os.path.join(root, "Root.lnk"), EDITOR)
+
+    desired = manifest([{"name": "Notepad++", "target": NOTEPAD, "folder": "Tools"}], {"user": ["Tools"]})
+    actions = sync.plan(desired)
+    assert sorted((action["action"], os.path.relpath(action["path"], root)) for action in actions) == [
+        ("create", os.path.join("Tools", "Notepad++.lnk")),
+        ("delete", os.path.join("Tools", "Old.lnk")),
+    ]
+
+    sync.apply(actions)
+    assert sorted(os.listdir(os.path.join(root, "Tools"))) == ["Notepad++.lnk"]
+    assert os.listdir(os.path.join(root, "Games")) == ["Old.lnk"]
+    assert os.path.exists(os.path.join(root, "Root.lnk"))
+
+
+@pytest.mark.parametrize("managed_folders", [
+    {"Common": [""]},
+    {"user": "Tools"},
+    {"user": [1]},
+    {"user": ["..\\Other"]},
+    {"user": ["C:\\Windows"]},
+    ["Tools"],
+])
+def test_invalid_managed_folders(sync, managed_folders):
+    with pytest.raises(ValueError):
+        validate_manifest(manifest([], managed_folders))
+    with pytest.raises(ValueError):
+        sync.plan(manifest([], managed_folders))
+
+
+def test_load_manifest_validates(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"managed_folders": {"Common": [""]}}))
+    with pytest.raises(ValueError):
+        load_manifest(str(path))
+
+    path.write_text(json.dumps({"shortcuts": [{"name": "Editor", "target": EDITOR}]}))
+    assert load_manifest(str(path))["managed_folders"] == {}
+
+
+def test_unknown_scope_root(sync):
+    with pytest.raises(ValueError):
+        sync._scope_root("Common")
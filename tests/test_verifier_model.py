@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+from verifier_model import NAME_COLUMN, VerificationFilterModel, VerificationTableModel
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QGuiApplication.instance() or QGuiApplication([])
+
+
+class FakeIconService(QObject):
+    iconReady = pyqtSignal(str, int, str)
+
+    def request(self, exe_path, size):
+        return None
+
+
+class CountingFilterModel(VerificationFilterModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.calls = 0
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        self.calls += 1
+        return super().filterAcceptsRow(source_row, source_parent)
+
+
+def make_rows(count, targets=10):
+    return [(f"App {i}", f"C:\\Start Menu\\App {i}.lnk", f"C:\\Apps\\app{i % targets}.exe", i % 7 != 0, "")
+            for i in range(count)]
+
+
+def make_models(rows):
+    service = FakeIconService()
+    model = VerificationTableModel(service, icon_size=16)
+    proxy = CountingFilterModel()
+    proxy.setSourceModel(model)
+    model.append_rows(rows)
+    return service, model, proxy
+
+
+def test_icon_arrival_does_not_refilter(app):
+    service, model, proxy = make_models(make_rows(1000))
+    proxy.set_text_filter("app 1")
+    visible = proxy.rowCount()
+    proxy.calls = 0
+
+    service.iconReady.emit("C:\\Apps\\app3.exe", 16, "icon.png")
+    assert proxy.calls == 0
+    assert proxy.rowCount() == visible
+
+
+def test_icon_arrival_repaints_only_matching_rows(app):
+    service, model, proxy = make_models(make_rows(100))
+    model.sort(NAME_COLUMN, Qt.DescendingOrder)
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.extend(range(first.row(), last.row() + 1)))
+
+    service.iconReady.emit("C:\\Apps\\app3.exe", 16, "icon.png")
+    assert len(changed) == 10
+    assert all(model.row(row)[2] == "C:\\Apps\\app3.exe" for row in changed)
+
+
+def test_contiguous_rows_are_one_range(app):
+    service, model, proxy = make_models(make_rows(50, targets=1))
+    ranges = []
+    model.dataChanged.connect(lambda first, last, roles: ranges.append((first.row(), last.row())))
+
+    service.iconReady.emit("C:\\Apps\\app0.exe", 16, "icon.png")
+    assert ranges == [(0, 49)]
+
+
+def test_filters_apply_to_streamed_and_sorted_rows(app):
+    service, model, proxy = make_models(make_rows(70))
+    proxy.set_status_filter(VerificationFilterModel.STATUS_BROKEN)
+    assert proxy.rowCount() == 10
+
+    model.append_rows(make_rows(7))
+    assert proxy.rowCount() == 11
+    model.sort(NAME_COLUMN)
+    assert proxy.rowCount() == 11
+    proxy.set_status_filter(VerificationFilterModel.STATUS_ALL)
+    assert proxy.rowCount() == 77
@@ -5,13 +5,20 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
     QFileDialog, QComboBox, QCheckBox, QFrame, QMessageBox, QGroupBox,
     QFormLayout, QRadioButton, QButtonGroup, QSizePolicy, QSpacerItem,
-    QApplication
+    QApplication, QTabWidget, QTableView, QHeaderView, QAbstractItemView, QListView
 )
-from PyQt5.QtCore import Qt, QMimeData, QUrl, pyqtSignal, QSize
-from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QIcon, QPalette, QColor, QFont, QFontMetrics, QPixmap
-from PyQt5.QtSvg import QSvgWidget
+from PyQt5.QtCore import Qt, QMimeData, QUrl, pyqtSignal, QSize, QTimer
+from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QPalette, QColor, QFont, QFontMetrics
 from styles import StyleSheet
 from icon_extractor import IconExtractor
+from pixmap_cache import PixmapCache
+from icon_service import IconService
+from svg_raster_cache import SvgRasterCache, DROP_AREA_ICON
+from batch_queue import BatchQueueModel
+from verifier_model import (
+    VerificationStream, VerificationTableModel, VerificationFilterModel,
+    NAME_COLUMN, STATUS_COLUMN, TARGET_COLUMN, ROW_TARGET
+)
 
 # Check if running on Windows
 IS_WINDOWS = platform.system() == "Windows"
@@ -19,9 +26,12 @@ IS_WINDOWS = platform.system() == "Windows"
 class DropArea(QLabel):
     """Custom widget for drag and drop file selection."""
     fileDropped = pyqtSignal(str)
+    # Several files and/or folders, for the batch queue
+    filesDropped = pyqtSignal(list)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, svg_cache=None):
         super().__init__(parent)
+        self.svg_cache = svg_cache or SvgRasterCache()
         self.setAcceptDrops(True)
         self.setAlignment(Qt.AlignCenter)
         self.setFixedHeight(200)
@@ -31,13 +41,14 @@ class DropArea(QLabel):
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignCenter)
         
-        # Add SVG icon
-        self.svg_widget = QSvgWidget("assets/drag_drop.svg")
-        self.svg_widget.setFixedSize(64, 64)
-        layout.addWidget(self.svg_widget, alignment=Qt.AlignCenter)
+        # Add the drop icon, pre-rendered for the screen's pixel ratio
+        self.drop_icon = QLabel()
+        self.drop_icon.setFixedSize(64, 64)
+        self.drop_icon.setPixmap(self.svg_cache.pixmap(DROP_AREA_ICON, 64, self.devicePixelRatioF()))
+        layout.addWidget(self.drop_icon, alignment=Qt.AlignCenter)
         
         # Add text labels
-        self.title_label = QLabel("Drag and drop .exe file here")
+        self.title_label = QLabel("Drag and drop .exe files or folders here")
         self.title_label.setStyleSheet(StyleSheet.DROP_AREA_TITLE)
         layout.addWidget(self.title_label, alignment=Qt.AlignCenter)
         
@@ -61,32 +72,48 @@ class DropArea(QLabel):
         
     def dropEvent(self, event: QDropEvent):
         """Handle drop events."""
-        urls = event.mimeData().urls()
-        if urls and len(urls) > 0:
-            file_path = urls[0].toLocalFile()
-            if file_path.lower().endswith('.exe'):
-                self.fileDropped.emit(file_path)
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if len(paths) == 1 and not os.path.isdir(paths[0]):
+            if paths[0].lower().endswith('.exe'):
+                self.fileDropped.emit(paths[0])
             else:
                 QMessageBox.warning(self, "Invalid File", "Please select a valid .exe file.")
+        elif paths:
+            # Several files or a folder go to the batch queue
+            self.filesDropped.emit(paths)
         
         self.setStyleSheet(StyleSheet.DROP_AREA)
         
     def mousePressEvent(self, event):
         """Handle mouse click events."""
         file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getOpenFileName(
-            self, "Select Executable", "", "Executable Files (*.exe);;All Files (*)"
+        file_paths, _ = file_dialog.getOpenFileNames(
+            self, "Select Executables", "", "Executable Files (*.exe);;All Files (*)"
         )
         
-        if file_path:
-            self.fileDropped.emit(file_path)
+        if len(file_paths) == 1:
+            self.fileDropped.emit(file_paths[0])
+        elif file_paths:
+            self.filesDropped.emit(file_paths)
 
 class PreviewWidget(QWidget):
     """Widget to preview shortcut information before creation."""
-    def __init__(self, parent=None):
+    ICON_SIZES = (16, 32, 48, 64, 128, 256)
+    
+    def __init__(self, parent=None, metadata_cache=None, svg_cache=None):
         super().__init__(parent)
         self.setStyleSheet(StyleSheet.PREVIEW_WIDGET)
-        self.icon_extractor = IconExtractor()
+        svg_cache = svg_cache or SvgRasterCache()
+        self.icon_extractor = IconExtractor(metadata_cache, svg_cache=svg_cache)
+        # Decoded icons, so size toggles and name edits skip PNG/SVG decoding
+        self.pixmap_cache = PixmapCache(svg_cache=svg_cache)
+        # Extraction runs on worker threads; results arrive through iconReady
+        self.icon_service = IconService(self.icon_extractor, self.ICON_SIZES, parent=self)
+        self.icon_service.iconReady.connect(self.on_icon_ready)
+        if QApplication.instance() is not None:
+            QApplication.instance().aboutToQuit.connect(self.icon_service.shutdown)
+            # The icon index is written in batches; save the rest on exit
+            QApplication.instance().aboutToQuit.connect(self.icon_extractor.icon_cache.flush)
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -102,8 +129,7 @@ class PreviewWidget(QWidget):
         # Icon preview
         self.icon_preview = QLabel()
         self.icon_preview.setAlignment(Qt.AlignCenter)
-        self.icon_preview.setMinimumSize(64, 64)
-        self.icon_preview.setMaximumSize(64, 64)
+        self.icon_preview.setFixedSize(64, 64)
         icon_info_layout.addWidget(self.icon_preview, alignment=Qt.AlignTop)
         
         # Preview content frame
@@ -138,28 +164,15 @@ class PreviewWidget(QWidget):
         icon_size_layout.addWidget(icon_size_label)
         
         # Icon size options
-        self.size_16_btn = QPushButton("16×16")
-        self.size_16_btn.setFixedSize(50, 30)
-        self.size_16_btn.setStyleSheet(StyleSheet.ICON_SIZE_BUTTON)
-        self.size_16_btn.setCheckable(True)
-        self.size_16_btn.clicked.connect(lambda: self.change_icon_size(16))
-        
-        self.size_32_btn = QPushButton("32×32")
-        self.size_32_btn.setFixedSize(50, 30)
-        self.size_32_btn.setStyleSheet(StyleSheet.ICON_SIZE_BUTTON_SELECTED)
-        self.size_32_btn.setCheckable(True)
-        self.size_32_btn.setChecked(True)  # Default
-        self.size_32_btn.clicked.connect(lambda: self.change_icon_size(32))
-        
-        self.size_48_btn = QPushButton("48×48")
-        self.size_48_btn.setFixedSize(50, 30)
-        self.size_48_btn.setStyleSheet(StyleSheet.ICON_SIZE_BUTTON)
-        self.size_48_btn.setCheckable(True)
-        self.size_48_btn.clicked.connect(lambda: self.change_icon_size(48))
-        
-        icon_size_layout.addWidget(self.size_16_btn)
-        icon_size_layout.addWidget(self.size_32_btn)
-        icon_size_layout.addWidget(self.size_48_btn)
+        self.size_buttons = {}
+        for size in self.ICON_SIZES:
+            button = QPushButton(f"{size}×{size}")
+            button.setFixedSize(50 if size < 100 else 64, 30)
+            button.setStyleSheet(StyleSheet.ICON_SIZE_BUTTON)
+            button.setCheckable(True)
+            button.clicked.connect(lambda checked, size=size: self.change_icon_size(size))
+            icon_size_layout.addWidget(button)
+            self.size_buttons[size] = button
         icon_size_layout.addStretch()
         
         layout.addLayout(icon_size_layout)
@@ -167,26 +180,22 @@ class PreviewWidget(QWidget):
         self.setLayout(layout)
         self.current_exe_path = None
         self.current_icon_size = 32
+        self.change_icon_size(32)  # Default
         
     def change_icon_size(self, size):
         """Change the icon preview size."""
         self.current_icon_size = size
         
         # Update button states and styles
-        self.size_16_btn.setChecked(size == 16)
-        self.size_16_btn.setStyleSheet(
-            StyleSheet.ICON_SIZE_BUTTON_SELECTED if size == 16 else StyleSheet.ICON_SIZE_BUTTON
-        )
-        
-        self.size_32_btn.setChecked(size == 32)
-        self.size_32_btn.setStyleSheet(
-            StyleSheet.ICON_SIZE_BUTTON_SELECTED if size == 32 else StyleSheet.ICON_SIZE_BUTTON
-        )
+        for button_size, button in self.size_buttons.items():
+            button.setChecked(size == button_size)
+            button.setStyleSheet(
+                StyleSheet.ICON_SIZE_BUTTON_SELECTED if size == button_size else StyleSheet.ICON_SIZE_BUTTON
+            )
         
-        self.size_48_btn.setChecked(size == 48)
-        self.size_48_btn.setStyleSheet(
-            StyleSheet.ICON_SIZE_BUTTON_SELECTED if size == 48 else StyleSheet.ICON_SIZE_BUTTON
-        )
+        # Grow the preview for the large sizes
+        preview_size = max(64, size)
+        self.icon_preview.setFixedSize(preview_size, preview_size)
         
         # Update icon if we have a path
         if self.current_exe_path:
@@ -200,19 +209,31 @@ class PreviewWidget(QWidget):
             
         self.current_exe_path = exe_path
         
-        # Get icon from the executable
-        icon_path = self.icon_extractor.extract_icon(exe_path, self.current_icon_size)
+        # Known icons are shown at once; otherwise show a placeholder until
+        # the service has extracted all preview sizes in the background
+        icon_path = self.icon_service.request(exe_path, self.current_icon_size)
+        if icon_path is None:
+            self.icon_preview.clear()
+            self.icon_preview.setText("…")
+            return
+        self.show_icon(icon_path)
         
-        if icon_path and os.path.exists(icon_path):
-            # If SVG, use QSvgWidget
-            if icon_path.lower().endswith('.svg'):
-                pixmap = QIcon(icon_path).pixmap(QSize(self.current_icon_size, self.current_icon_size))
-            else:
-                pixmap = QPixmap(icon_path)
-                
-            self.icon_preview.setPixmap(pixmap)
-        else:
+    def on_icon_ready(self, exe_path, size, icon_path):
+        """Show an icon delivered by the icon service if it is still the one wanted."""
+        if exe_path == self.current_exe_path and size == self.current_icon_size:
+            self.show_icon(icon_path)
+        
+    def show_icon(self, icon_path):
+        """Display an icon file in the preview."""
+        if not icon_path:
             self.icon_preview.clear()
+            return
+        
+        pixmap = self.pixmap_cache.load(icon_path, self.current_icon_size, self.devicePixelRatioF())
+        if pixmap.isNull():
+            self.icon_preview.clear()
+        else:
+            self.icon_preview.setPixmap(pixmap)
         
     def update_preview(self, exe_info, shortcut_name, destination):
         """Update the preview with executable and shortcut information."""
@@ -226,11 +247,149 @@ class PreviewWidget(QWidget):
         # Update icon
         self.update_icon(exe_info.get('path'))
 
+class VerifierWidget(QWidget):
+    """Browse Start Menu verification results as they stream in."""
+    ICON_SIZE = 16
+    
+    def __init__(self, parent=None, icon_extractor=None, pixmap_cache=None):
+        super().__init__(parent)
+        # Icons for many rows at once: requests must not cancel each other
+        self.icon_service = IconService(icon_extractor, (self.ICON_SIZE,), parent=self, supersede=False)
+        self.model = VerificationTableModel(self.icon_service, pixmap_cache, self.ICON_SIZE, self)
+        self.proxy_model = VerificationFilterModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.stream = VerificationStream(parent=self)
+        self.stream.rowsReady.connect(self.on_rows_ready)
+        self.stream.finished.connect(self.on_verification_finished)
+        if QApplication.instance() is not None:
+            QApplication.instance().aboutToQuit.connect(self.stream.stop)
+            QApplication.instance().aboutToQuit.connect(self.icon_service.shutdown)
+        
+        layout = QVBoxLayout(self)
+        
+        # Verification controls
+        controls_layout = QHBoxLayout()
+        self.location_combo = QComboBox()
+        self.location_combo.addItem("Current User and All Users", "both")
+        self.location_combo.addItem("Current User", "user")
+        self.location_combo.addItem("All Users", "common")
+        controls_layout.addWidget(self.location_combo)
+        
+        self.verify_button = QPushButton("Verify Shortcuts")
+        self.verify_button.setStyleSheet(StyleSheet.PRIMARY_BUTTON)
+        self.verify_button.clicked.connect(self.start_verification)
+        controls_layout.addWidget(self.verify_button)
+        
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setStyleSheet(StyleSheet.SECONDARY_BUTTON)
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_verification)
+        controls_layout.addWidget(self.stop_button)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+        
+        # Filters
+        filter_layout = QHBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by name, target or location")
+        filter_layout.addWidget(self.filter_input)
+        
+        self.status_combo = QComboBox()
+        self.status_combo.addItem("All", VerificationFilterModel.STATUS_ALL)
+        self.status_combo.addItem("Valid", VerificationFilterModel.STATUS_VALID)
+        self.status_combo.addItem("Broken", VerificationFilterModel.STATUS_BROKEN)
+        self.status_combo.currentIndexChanged.connect(
+            lambda: self.proxy_model.set_status_filter(self.status_combo.currentData()))
+        filter_layout.addWidget(self.status_combo)
+        layout.addLayout(filter_layout)
+        
+        # Refilter once typing pauses rather than on every key
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(lambda: self.proxy_model.set_text_filter(self.filter_input.text()))
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        
+        # Results; fixed row heights and no resizing to contents keep the
+        # view from touching rows that are not on screen
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.sortByColumn(-1, Qt.AscendingOrder)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setWordWrap(False)
+        self.table_view.setIconSize(QSize(self.ICON_SIZE, self.ICON_SIZE))
+        self.table_view.verticalHeader().hide()
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(self.ICON_SIZE + 8)
+        header = self.table_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        header.resizeSection(NAME_COLUMN, 220)
+        header.resizeSection(STATUS_COLUMN, 70)
+        header.resizeSection(TARGET_COLUMN, 300)
+        layout.addWidget(self.table_view)
+        
+        # Drop queued icon jobs of rows scrolled out of view
+        self.scroll_timer = QTimer(self)
+        self.scroll_timer.setSingleShot(True)
+        self.scroll_timer.setInterval(100)
+        self.scroll_timer.timeout.connect(self.cancel_offscreen_icons)
+        self.table_view.verticalScrollBar().valueChanged.connect(self.scroll_timer.start)
+        
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        
+        self.setLayout(layout)
+        
+    def start_verification(self):
+        """Clear the results and verify the selected Start Menu location."""
+        self.model.clear()
+        self.model.device_pixel_ratio = self.devicePixelRatioF()
+        self.verify_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.summary_label.setText("Verifying…")
+        self.stream.start(self.location_combo.currentData())
+        
+    def stop_verification(self):
+        """Stop verifying; the rows found so far stay in the table."""
+        self.stream.stop()
+        self.on_verification_finished(self.model.rowCount(), stopped=True)
+        
+    def on_rows_ready(self, rows):
+        """Add a batch of streamed results."""
+        self.model.append_rows(rows)
+        self.summary_label.setText(f"Verifying… {self.model.rowCount()} shortcuts, "
+                                   f"{self.model.broken_count} broken")
+        
+    def on_verification_finished(self, count, stopped=False):
+        """Show the totals once verification has ended."""
+        self.verify_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.summary_label.setText(f"{'Stopped after' if stopped else 'Verified'} {count} shortcuts, "
+                                   f"{self.model.broken_count} broken")
+        
+    def cancel_offscreen_icons(self):
+        """Cancel icon jobs for targets no longer on screen."""
+        first = self.table_view.rowAt(0)
+        if first < 0:
+            return
+        last = self.table_view.rowAt(self.table_view.viewport().height() - 1)
+        if last < 0:
+            last = self.proxy_model.rowCount() - 1
+        visible = set()
+        for row in range(first, last + 1):
+            source_row = self.proxy_model.mapToSource(self.proxy_model.index(row, NAME_COLUMN)).row()
+            visible.add(self.model.row(source_row)[ROW_TARGET])
+        self.icon_service.cancel_queued(visible)
+
 class ShortcutCreatorUI(QWidget):
     """Main UI for the shortcut creator application."""
-    def __init__(self, parent=None, shortcut_creator=None):
+    def __init__(self, parent=None, shortcut_creator=None, metadata_cache=None, svg_cache=None):
         super().__init__(parent)
         self.shortcut_creator = shortcut_creator
+        self.metadata_cache = metadata_cache
+        self.svg_cache = svg_cache or SvgRasterCache()
         self.current_exe_path = None
         self.exe_info = {}
         self.init_ui()
@@ -259,20 +418,53 @@ class ShortcutCreatorUI(QWidget):
         separator.setStyleSheet(StyleSheet.SEPARATOR)
         main_layout.addWidget(separator)
         
+        # Tabs: create a shortcut, verify existing ones
+        self.tab_widget = QTabWidget()
+        main_layout.addWidget(self.tab_widget)
+        create_tab = QWidget()
+        create_layout = QVBoxLayout(create_tab)
+        self.tab_widget.addTab(create_tab, "Create Shortcut")
+        
         # File selection section
         file_section_label = QLabel("1. Select Application")
         file_section_label.setStyleSheet(StyleSheet.SECTION_TITLE)
-        main_layout.addWidget(file_section_label)
+        create_layout.addWidget(file_section_label)
         
         # Drop area
-        self.drop_area = DropArea()
+        self.drop_area = DropArea(svg_cache=self.svg_cache)
         self.drop_area.fileDropped.connect(self.handle_file_selection)
-        main_layout.addWidget(self.drop_area)
+        self.drop_area.filesDropped.connect(self.handle_batch_selection)
+        create_layout.addWidget(self.drop_area)
+        
+        # Batch queue of multi-file and folder drops; shown once something is queued
+        self.batch_group = QGroupBox("Batch Queue")
+        self.batch_group.setStyleSheet(StyleSheet.SETTINGS_GROUP)
+        batch_layout = QVBoxLayout(self.batch_group)
+        self.batch_view = QListView()
+        self.batch_view.setUniformItemSizes(True)
+        self.batch_view.setIconSize(QSize(32, 32))
+        batch_layout.addWidget(self.batch_view)
+        batch_buttons = QHBoxLayout()
+        self.batch_progress = QLabel("")
+        batch_buttons.addWidget(self.batch_progress)
+        batch_buttons.addStretch()
+        self.batch_clear_button = QPushButton("Clear Queue")
+        self.batch_clear_button.setStyleSheet(StyleSheet.SECONDARY_BUTTON)
+        self.batch_clear_button.clicked.connect(self.clear_batch)
+        batch_buttons.addWidget(self.batch_clear_button)
+        self.batch_create_button = QPushButton("Create All")
+        self.batch_create_button.setStyleSheet(StyleSheet.PRIMARY_BUTTON)
+        self.batch_create_button.setEnabled(False)
+        self.batch_create_button.clicked.connect(self.create_batch)
+        batch_buttons.addWidget(self.batch_create_button)
+        batch_layout.addLayout(batch_buttons)
+        self.batch_group.hide()
+        create_layout.addWidget(self.batch_group)
         
         # Shortcut settings section
         settings_section_label = QLabel("2. Configure Shortcut")
         settings_section_label.setStyleSheet(StyleSheet.SECTION_TITLE)
-        main_layout.addWidget(settings_section_label)
+        create_layout.addWidget(settings_section_label)
         
         # Settings content
         settings_group = QGroupBox()
@@ -315,15 +507,28 @@ class ShortcutCreatorUI(QWidget):
         self.subfolder_input.textChanged.connect(self.update_preview)
         settings_layout.addRow("Subfolder:", self.subfolder_input)
         
-        main_layout.addWidget(settings_group)
+        create_layout.addWidget(settings_group)
         
         # Preview section
         preview_section_label = QLabel("3. Preview")
         preview_section_label.setStyleSheet(StyleSheet.SECTION_TITLE)
-        main_layout.addWidget(preview_section_label)
+        create_layout.addWidget(preview_section_label)
+        
+        self.preview_widget = PreviewWidget(metadata_cache=self.metadata_cache, svg_cache=self.svg_cache)
+        create_layout.addWidget(self.preview_widget)
         
-        self.preview_widget = PreviewWidget()
-        main_layout.addWidget(self.preview_widget)
+        # Validation, metadata and icons of queued files run on a worker pool
+        self.batch_queue = BatchQueueModel(
+            self.shortcut_creator,
+            self.preview_widget.icon_extractor,
+            self.preview_widget.pixmap_cache,
+            parent=self
+        )
+        self.batch_queue.progressChanged.connect(self.on_batch_progress)
+        self.batch_queue.batchFinished.connect(self.on_batch_finished)
+        self.batch_view.setModel(self.batch_queue)
+        if QApplication.instance() is not None:
+            QApplication.instance().aboutToQuit.connect(self.batch_queue.shutdown)
         
         # Action buttons
         button_layout = QHBoxLayout()
@@ -340,10 +545,17 @@ class ShortcutCreatorUI(QWidget):
         button_layout.addWidget(self.cancel_button)
         button_layout.addWidget(self.create_button)
         
-        main_layout.addLayout(button_layout)
+        create_layout.addLayout(button_layout)
         
         # Add stretch to push everything to the top
-        main_layout.addStretch()
+        create_layout.addStretch()
+        
+        # Verifier tab, sharing the preview's icon extractor and pixmap cache
+        self.verifier_widget = VerifierWidget(
+            icon_extractor=self.preview_widget.icon_extractor,
+            pixmap_cache=self.preview_widget.pixmap_cache
+        )
+        self.tab_widget.addTab(self.verifier_widget, "Verify Shortcuts")
         
         self.setLayout(main_layout)
     
@@ -418,6 +630,33 @@ class ShortcutCreatorUI(QWidget):
             QMessageBox.warning(self, "Missing Information", "Please enter a name for the shortcut.")
             return
         
+        for_all_users = self.confirm_destination()
+        if for_all_users is None:
+            return
+        
+        # Create the shortcut
+        subfolder = self.subfolder_input.text() if self.subfolder_input.text() else None
+        success, message = self.shortcut_creator.create_shortcut(
+            self.current_exe_path,
+            shortcut_name,
+            for_all_users,
+            subfolder
+        )
+        
+        # Show result message
+        if success:
+            QMessageBox.information(self, "Success", message)
+            self.reset_form()
+        else:
+            QMessageBox.critical(self, "Error", message)
+    
+    def confirm_destination(self):
+        """
+        Check the chosen destination, offering elevation for All Users.
+        
+        Returns:
+            for_all_users flag to use, or None if the application is restarting
+        """
         for_all_users = self.all_users_radio.isChecked()
         
         # Check if we need admin rights and prompt if necessary
@@ -451,27 +690,54 @@ class ShortcutCreatorUI(QWidget):
                         "This would attempt to restart the application with admin rights on a real Windows system."
                     )
                 QApplication.quit()
-                return
+                return None
             else:
                 # User declined admin elevation, switch to current user
                 self.current_user_radio.setChecked(True)
                 for_all_users = False
         
-        # Create the shortcut
+        return for_all_users
+    
+    def handle_batch_selection(self, paths):
+        """Queue several dropped files and folders."""
+        self.batch_queue.device_pixel_ratio = self.devicePixelRatioF()
+        self.batch_queue.add_paths(paths)
+        self.batch_group.show()
+        # Destination settings apply to the whole batch
+        self.subfolder_input.setEnabled(True)
+    
+    def on_batch_progress(self, checked, total, ready):
+        """Show how far the queue has been checked."""
+        self.batch_progress.setText(f"Checked {checked} of {total}, {ready} ready")
+        self.batch_create_button.setEnabled(ready > 0)
+    
+    def create_batch(self):
+        """Create shortcuts for every ready item of the queue in one batch."""
+        for_all_users = self.confirm_destination()
+        if for_all_users is None:
+            return
         subfolder = self.subfolder_input.text() if self.subfolder_input.text() else None
-        success, message = self.shortcut_creator.create_shortcut(
-            self.current_exe_path,
-            shortcut_name,
-            for_all_users,
-            subfolder
-        )
-        
-        # Show result message
-        if success:
-            QMessageBox.information(self, "Success", message)
-            self.reset_form()
+        count = self.batch_queue.create_all(for_all_users, subfolder)
+        if count:
+            self.batch_create_button.setEnabled(False)
+            self.batch_progress.setText(f"Creating {count} shortcuts…")
+    
+    def on_batch_finished(self, success_count, failed_count):
+        """Report the result of a batch."""
+        message = f"Created {success_count} shortcuts."
+        if failed_count:
+            message += f" {failed_count} failed; see the queue for details."
+            QMessageBox.warning(self, "Batch Finished", message)
         else:
-            QMessageBox.critical(self, "Error", message)
+            QMessageBox.information(self, "Batch Finished", message)
+        self.batch_progress.setText(message)
+    
+    def clear_batch(self):
+        """Empty the batch queue."""
+        self.batch_queue.clear()
+        self.batch_group.hide()
+        if not self.current_exe_path:
+            self.subfolder_input.setEnabled(False)
     
     def reset_form(self):
         """Reset the form to initial state."""
@@ -0,0 +1,343 @@
+"""
+Start Menu Shortcut Creator - Verification Results Model
+This module feeds shortcut verification results into a Qt table model while
+the Start Menu is still being walked, so tens of thousands of shortcuts can
+be browsed in a virtualized QTableView:
+
+- VerificationStream verifies on a background thread and hands rows to the
+  GUI thread in batches.
+- VerificationTableModel keeps one small tuple per row and asks for icons
+  only when the view paints a row, through the icon service and pixmap
+  cache, so decoded icons scale with the rows on screen.
+- VerificationFilterModel filters by status and text. Sorting is delegated
+  to the source model, which sorts its rows with one key function in Python
+  instead of one lessThan call per comparison.
+"""
+import time
+import threading
+from PyQt5.QtCore import (
+    Qt, QObject, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer, pyqtSignal
+)
+from PyQt5.QtGui import QColor
+from shortcut_verifier import ShortcutVerifier
+
+# Columns of the results table
+COLUMNS = ("Name", "Status", "Target", "Shortcut")
+NAME_COLUMN, STATUS_COLUMN, TARGET_COLUMN, PATH_COLUMN = range(len(COLUMNS))
+
+# Row tuple fields
+ROW_NAME, ROW_PATH, ROW_TARGET, ROW_VALID, ROW_ERROR = range(5)
+
+# Rows are delivered to the GUI thread in batches of at most BATCH_ROWS,
+# or whatever was found within BATCH_SECONDS
+BATCH_ROWS = 500
+BATCH_SECONDS = 0.1
+
+# While rows stream in, a sorted model re-sorts at most this often
+RESORT_INTERVAL_MS = 1000
+
+BROKEN_COLOR = QColor("#D83B01")
+
+
+class VerificationStream(QObject):
+    """Runs a ShortcutVerifier on a background thread and streams its results."""
+    # List of row tuples (name, path, target, valid, error)
+    rowsReady = pyqtSignal(object)
+    # Number of shortcuts verified; emitted when a run completes or is stopped
+    finished = pyqtSignal(int)
+
+    # Internal: (run id, rows or None when done, count); delivered on the GUI thread
+    _batch = pyqtSignal(int, object, int)
+
+    def __init__(self, verifier=None, parent=None):
+        """
+        Initialize the stream.
+
+        Args:
+            verifier: ShortcutVerifier to run (default: a new one)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.verifier = verifier or ShortcutVerifier()
+        self._run_id = 0
+        self._stop_event = None
+        self._batch.connect(self._on_batch)
+
+    def start(self, location="both", subfolder=None):
+        """Stop any running verification and start a new one."""
+        self.stop()
+        self._run_id += 1
+        self._stop_event = threading.Event()
+        thread = threading.Thread(target=self._run, args=(self._run_id, self._stop_event, location, subfolder),
+                                  daemon=True)
+        thread.start()
+
+    def stop(self):
+        """Stop the running verification; rows it has not delivered yet are dropped."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+            self._run_id += 1
+
+    def is_running(self):
+        """Check whether a verification is in progress."""
+        return self._stop_event is not None
+
+    def _run(self, run_id, stop_event, location, subfolder):
+        """Worker: verify shortcuts and emit them in batches."""
+        rows = []
+        count = 0
+        deadline = time.monotonic() + BATCH_SECONDS
+        try:
+            for info in self.verifier.iter_verify_shortcuts(location, subfolder, record=False):
+                if stop_event.is_set():
+                    return
+                rows.append((info["name"], info["path"], info["target"], info["valid"], info["error"]))
+                count += 1
+                if len(rows) >= BATCH_ROWS or time.monotonic() >= deadline:
+                    self._batch.emit(run_id, rows, count)
+                    rows = []
+                    deadline = time.monotonic() + BATCH_SECONDS
+        except Exception as e:
+            print(f"Error verifying shortcuts: {e}")
+        try:
+            if rows:
+                self._batch.emit(run_id, rows, count)
+            self._batch.emit(run_id, None, count)
+        except RuntimeError:
+            # The stream was deleted while verifying
+            pass
+
+    def _on_batch(self, run_id, rows, count):
+        """Pass on a batch if it belongs to the current run."""
+        if run_id != self._run_id:
+            return
+        if rows is not None:
+            self.rowsReady.emit(rows)
+        else:
+            self._stop_event = None
+            self.finished.emit(count)
+
+
+class VerificationTableModel(QAbstractTableModel):
+    """Table of verification results with icons loaded for painted rows only."""
+
+    def __init__(self, icon_service=None, pixmap_cache=None, icon_size=16, parent=None):
+        """
+        Initialize an empty model.
+
+        Args:
+            icon_service: IconService created with supersede=False (no icons if None)
+            pixmap_cache: PixmapCache decoding the icon files
+            icon_size: Icon size shown in the name column
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.icon_service = icon_service
+        self.pixmap_cache = pixmap_cache
+        self.icon_size = icon_size
+        self.device_pixel_ratio = 1.0
+        self.broken_count = 0
+        self._rows = []
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._sorted = True
+        self._resort_timer = QTimer(self)
+        self._resort_timer.setSingleShot(True)
+        self._resort_timer.setInterval(RESORT_INTERVAL_MS)
+        self._resort_timer.timeout.connect(lambda: self.sort(self._sort_column, self._sort_order))
+        # Targets the service could not produce an icon for; not asked again
+        self._no_icon = set()
+        # Target -> rows showing its icon, so an arriving icon repaints only those
+        self._target_rows = {}
+        if icon_service is not None:
+            icon_service.iconReady.connect(self._on_icon_ready)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == NAME_COLUMN:
+                return row[ROW_NAME]
+            if column == STATUS_COLUMN:
+                return "OK" if row[ROW_VALID] else "Broken"
+            if column == TARGET_COLUMN:
+                return row[ROW_TARGET] or ""
+            return row[ROW_PATH]
+        if role == Qt.DecorationRole and column == NAME_COLUMN:
+            return self._icon(row)
+        if role == Qt.ForegroundRole and column == STATUS_COLUMN and not row[ROW_VALID]:
+            return BROKEN_COLOR
+        if role == Qt.ToolTipRole:
+            return row[ROW_ERROR] or row[ROW_PATH]
+        return None
+
+    def row(self, source_row):
+        """Return the (name, path, target, valid, error) tuple of a row."""
+        return self._rows[source_row]
+
+    def _icon(self, row):
+        """Return the icon of a row's target, requesting it if it is not known yet."""
+        target = row[ROW_TARGET]
+        if self.icon_service is None or not row[ROW_VALID] or not target or target in self._no_icon:
+            return None
+        icon_path = self.icon_service.request(target, self.icon_size)
+        if not icon_path:
+            # Requested; the row is repainted when the icon arrives
+            return None
+        pixmap = self.pixmap_cache.load(icon_path, self.icon_size, self.device_pixel_ratio)
+        return None if pixmap.isNull() else pixmap
+
+    def _on_icon_ready(self, exe_path, size, icon_path):
+        """Repaint the name cells of the rows whose target's icon has been extracted."""
+        if size != self.icon_size:
+            return
+        if not icon_path:
+            self._no_icon.add(exe_path)
+        rows = sorted(self._target_rows.get(exe_path, ()))
+        # One dataChanged per run of contiguous rows
+        start = 0
+        for position in range(1, len(rows) + 1):
+            if position == len(rows) or rows[position] != rows[position - 1] + 1:
+                self.dataChanged.emit(self.index(rows[start], NAME_COLUMN),
+                                      self.index(rows[position - 1], NAME_COLUMN), [Qt.DecorationRole])
+                start = position
+
+    def _index_targets(self, first=0):
+        """Add the rows from first on to the target -> rows map."""
+        for row_number in range(first, len(self._rows)):
+            target = self._rows[row_number][ROW_TARGET]
+            if target:
+                self._target_rows.setdefault(target, []).append(row_number)
+
+    def append_rows(self, rows):
+        """Add a batch of streamed rows, keeping the current sort order."""
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self._index_targets(first)
+        self.broken_count += sum(1 for row in rows if not row[ROW_VALID])
+        self.endInsertRows()
+        if self._sort_column >= 0:
+            # New rows wait at the end until the next (throttled) re-sort
+            self._sorted = False
+            if not self._resort_timer.isActive():
+                self._resort_timer.start()
+
+    def clear(self):
+        """Remove every row."""
+        self.beginResetModel()
+        self._rows = []
+        self._target_rows = {}
+        self._sorted = True
+        self._resort_timer.stop()
+        self.broken_count = 0
+        self._no_icon.clear()
+        self.endResetModel()
+
+    def _sort_key(self, column):
+        """Return the key function sorting rows by a column."""
+        if column == NAME_COLUMN:
+            return lambda row: row[ROW_NAME].lower()
+        if column == STATUS_COLUMN:
+            return lambda row: (row[ROW_VALID], row[ROW_NAME].lower())
+        if column == TARGET_COLUMN:
+            return lambda row: (row[ROW_TARGET] or "").lower()
+        return lambda row: row[ROW_PATH].lower()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the rows by a column, keeping persistent indexes (selection) on their rows."""
+        if self._sorted and (column, order) == (self._sort_column, self._sort_order):
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self._sorted = True
+        self._resort_timer.stop()
+        if column < 0 or not self._rows:
+            return
+        self.layoutAboutToBeChanged.emit()
+        key = self._sort_key(column)
+        permutation = sorted(range(len(self._rows)), key=lambda i: key(self._rows[i]),
+                             reverse=order == Qt.DescendingOrder)
+        self._rows = [self._rows[i] for i in permutation]
+        self._target_rows = {}
+        self._index_targets()
+
+        old_indexes = self.persistentIndexList()
+        if old_indexes:
+            new_position = [0] * len(permutation)
+            for new_row, old_row in enumerate(permutation):
+                new_position[old_row] = new_row
+            self.changePersistentIndexList(
+                old_indexes, [self.index(new_position[index.row()], index.column()) for index in old_indexes])
+        self.layoutChanged.emit()
+
+
+class VerificationFilterModel(QSortFilterProxyModel):
+    """Filters verification results by status and text; sorting happens in the source model."""
+    STATUS_ALL = "all"
+    STATUS_VALID = "valid"
+    STATUS_BROKEN = "broken"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._status = self.STATUS_ALL
+        self._text = ""
+        # Rows are filtered when inserted and when a filter changes (refilter);
+        # icon updates (dataChanged) must not filter every row again
+        self.setDynamicSortFilter(False)
+
+    def set_status_filter(self, status):
+        """Show all rows, only valid ones or only broken ones."""
+        if status != self._status:
+            self._status = status
+            self.refilter()
+
+    def set_text_filter(self, text):
+        """Show only rows whose name, target or shortcut path contain text (case-insensitive)."""
+        text = text.strip().lower()
+        if text != self._text:
+            self._text = text
+            self.refilter()
+
+    def refilter(self):
+        """
+        Apply changed filters.
+
+        invalidateFilter() removes and inserts every contiguous run of rows
+        separately, which is slow when a filter hides thousands of scattered
+        rows; rebuilding the whole mapping in one layout change is not.
+        """
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._status == self.STATUS_ALL and not self._text:
+            return True
+        row = self.sourceModel().row(source_row)
+        if self._status == self.STATUS_VALID and not row[ROW_VALID]:
+            return False
+        if self._status == self.STATUS_BROKEN and row[ROW_VALID]:
+            return False
+        if self._text:
+            return (self._text in row[ROW_NAME].lower() or self._text in (row[ROW_TARGET] or "").lower()
+                    or self._text in row[ROW_PATH].lower())
+        return True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Keep the proxy unsorted (source order) and let the source sort itself
+        self.sourceModel().sort(column, order)